@@ -0,0 +1,44 @@
+"""store budget amount_spent
+
+Revision ID: 05a62e62796c
+Revises: 9de9668f9df1
+Create Date: 2026-10-17 03:41:09.562817
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "05a62e62796c"
+down_revision: Union[str, None] = "9de9668f9df1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "budgets", sa.Column("amount_spent", sa.Numeric(precision=12, scale=2), server_default="0", nullable=False)
+    )
+
+    op.execute(
+        """
+        UPDATE budgets
+        SET amount_spent = spent.total
+        FROM (
+            SELECT budget_uid, COALESCE(SUM(amount_spent), 0) AS total
+            FROM expenses
+            GROUP BY budget_uid
+        ) AS spent
+        WHERE budgets.uid = spent.budget_uid
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("budgets", "amount_spent")
@@ -0,0 +1,57 @@
+"""add department budget rollups
+
+Revision ID: 3b7d2f0a91c4
+Revises: c92af9c018e5
+Create Date: 2026-10-17 06:12:48.205913
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7d2f0a91c4"
+down_revision: Union[str, None] = "c92af9c018e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "department_budget_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("department_uid", sa.Uuid(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("budget_total", sa.Numeric(precision=14, scale=2), server_default="0", nullable=False),
+        sa.Column("expense_total", sa.Numeric(precision=14, scale=2), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["department_uid"], ["departments.uid"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("department_uid", "month", name="uq_department_budget_rollups_department_month"),
+    )
+
+    op.execute(
+        """
+        INSERT INTO department_budget_rollups (department_uid, month, budget_total, expense_total, updated_at)
+        SELECT department_uid, month, COALESCE(SUM(budget_total), 0), COALESCE(SUM(expense_total), 0), now()
+        FROM (
+            SELECT department_uid, CAST(date_trunc('month', timezone('UTC', created_at)) AS DATE) AS month,
+                   gross_amount AS budget_total, 0 AS expense_total
+            FROM budgets
+            UNION ALL
+            SELECT budgets.department_uid, CAST(date_trunc('month', timezone('UTC', budgets.created_at)) AS DATE),
+                   0, expenses.amount_spent
+            FROM expenses JOIN budgets ON budgets.uid = expenses.budget_uid
+        ) AS amounts
+        GROUP BY department_uid, month
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("department_budget_rollups")
@@ -0,0 +1,36 @@
+"""add payment invoice_uid and income analytics indexes
+
+Revision ID: 7a41c9e2d5b8
+Revises: 3b7d2f0a91c4
+Create Date: 2026-10-17 07:02:31.118406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a41c9e2d5b8"
+down_revision: Union[str, None] = "3b7d2f0a91c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_payments_invoice_uid", "payments", ["invoice_uid"], unique=False)
+    op.create_index(
+        "ix_payments_created_at_income",
+        "payments",
+        ["created_at"],
+        unique=False,
+        postgresql_include=["invoice_uid", "payment_method", "amount_received"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_payments_created_at_income", table_name="payments")
+    op.drop_index("ix_payments_invoice_uid", table_name="payments")
@@ -0,0 +1,52 @@
+"""generate serial numbers on insert
+
+Revision ID: 8ce90cf9d1c1
+Revises: 05a62e62796c
+Create Date: 2026-10-17 04:12:37.204981
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8ce90cf9d1c1"
+down_revision: Union[str, None] = "05a62e62796c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SERIAL_NO_PREFIXES = {"budgets": "BUD", "expenses": "EXP", "invoices": "INV", "payments": "PAY"}
+
+
+def serial_no_default(prefix: str, sequence_name: str) -> sa.TextClause:
+    return sa.text(
+        f"('{prefix}-' || to_char(now() AT TIME ZONE 'UTC', 'YYYY') || '-' || "
+        f"regexp_replace('000' || nextval('{sequence_name}')::text, '^0+(?=[0-9]{{4}})', ''))"
+    )
+
+
+def create_sequence_after_max_id(sequence_name: str, table: str):
+    # Continue numbering where the old id-based serial numbers stopped.
+    op.execute(sa.schema.CreateSequence(sa.Sequence(sequence_name)))
+    op.execute(f"SELECT setval('{sequence_name}', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, prefix in SERIAL_NO_PREFIXES.items():
+        sequence_name = f"{table}_serial_no_seq"
+        create_sequence_after_max_id(sequence_name, table)
+        op.alter_column(table, "serial_no", server_default=serial_no_default(prefix, sequence_name))
+
+    create_sequence_after_max_id("users_staff_no_seq", "users")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence("users_staff_no_seq")))
+
+    for table in SERIAL_NO_PREFIXES:
+        op.alter_column(table, "serial_no", server_default=None)
+        op.execute(sa.schema.DropSequence(sa.Sequence(f"{table}_serial_no_seq")))
@@ -0,0 +1,77 @@
+"""store invoice amount_paid and status
+
+Revision ID: 9de9668f9df1
+Revises: de31f11ef09a
+Create Date: 2026-10-17 03:05:41.118302
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9de9668f9df1"
+down_revision: Union[str, None] = "de31f11ef09a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "invoices", sa.Column("amount_paid", sa.Numeric(precision=12, scale=2), server_default="0", nullable=False)
+    )
+    op.add_column(
+        "invoices",
+        sa.Column("status", sa.String(), server_default="UNPAID", nullable=False),
+    )
+
+    op.execute(
+        """
+        UPDATE invoices
+        SET amount_paid = paid.total
+        FROM (
+            SELECT invoice_uid, COALESCE(SUM(amount_received), 0) AS total
+            FROM payments
+            GROUP BY invoice_uid
+        ) AS paid
+        WHERE invoices.uid = paid.invoice_uid
+        """
+    )
+    op.execute(
+        """
+        UPDATE invoices
+        SET status = CASE
+            WHEN due.net_amount_due < 0 THEN 'OVER_PAID'
+            WHEN due.net_amount_due = 0 THEN 'PAID'
+            WHEN invoices.amount_paid = 0 THEN 'UNPAID'
+            ELSE 'PARTIALLY_PAID'
+        END
+        FROM (
+            SELECT
+                uid,
+                gross_amount
+                + gross_amount * (COALESCE(tax_percent, 0) / 100)
+                - gross_amount * (COALESCE(tax_percent, 0) / 100) * (COALESCE(discount_percent, 0) / 100)
+                - amount_paid AS net_amount_due
+            FROM invoices
+        ) AS due
+        WHERE invoices.uid = due.uid
+        """
+    )
+
+    op.create_index(op.f("ix_invoices_status"), "invoices", ["status"], unique=False)
+    op.create_index("ix_invoices_user_uid_status", "invoices", ["user_uid", "status"], unique=False)
+    op.create_index("ix_invoices_patient_uid_status", "invoices", ["patient_uid", "status"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_invoices_patient_uid_status", table_name="invoices")
+    op.drop_index("ix_invoices_user_uid_status", table_name="invoices")
+    op.drop_index(op.f("ix_invoices_status"), table_name="invoices")
+    op.drop_column("invoices", "status")
+    op.drop_column("invoices", "amount_paid")
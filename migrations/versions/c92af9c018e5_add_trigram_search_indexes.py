@@ -0,0 +1,50 @@
+"""add trigram search indexes
+
+Revision ID: c92af9c018e5
+Revises: 8ce90cf9d1c1
+Create Date: 2026-10-17 04:48:52.771036
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c92af9c018e5"
+down_revision: Union[str, None] = "8ce90cf9d1c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = {
+    "budgets": ("title", "short_description", "serial_no"),
+    "expenses": ("title", "short_description", "serial_no", "note"),
+    "invoices": ("title", "serial_no"),
+    "payments": ("note", "serial_no", "reference_number"),
+    "patients": ("first_name", "last_name", "other_name", "hospital_id"),
+    "users": ("first_name", "last_name", "email", "staff_no"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            op.create_index(
+                f"ix_{table}_{column}_trgm",
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in SEARCH_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
@@ -0,0 +1,32 @@
+"""add (created_at, id) keyset pagination indexes
+
+Revision ID: de31f11ef09a
+Revises: e5f9b9246bef
+Create Date: 2026-10-17 02:13:12.434751
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "de31f11ef09a"
+down_revision: Union[str, None] = "e5f9b9246bef"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("budgets", "expenses", "invoices", "payments", "patients", "users")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.create_index(f"ix_{table}_created_at_id", table, ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.drop_index(f"ix_{table}_created_at_id", table_name=table)
@@ -2,8 +2,9 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from src.db.main import init_db
+from src.db.main import init_db, replica_set
 from src.db.redis import init_redis
+from src.features.auth.hashing import password_hasher
 from src.features.auth.routers import auth_router
 from src.features.budgets.routers import budget_router
 from src.features.dashboard.admin.routers import admin_router
@@ -13,12 +14,15 @@ from src.features.expenses_category.routers import category_router
 from src.features.invoices.routers import invoice_router
 from src.features.patients.routers import patients_router
 from src.features.payments.routers import payment_router
+from src.features.roles.registry import role_registry
 from src.features.roles.routers import role_router
 from src.features.services.routers import service_router
 from src.features.users.routers import user_router
 from src.utils.exceptions import register_exceptions
 from src.utils.logger import setup_logger
+from src.utils.metrics import close_broker, metrics_endpoint
 from src.utils.middlewares import register_middlewares
+from src.utils.responses import JSONResponse
 
 logger = setup_logger(__name__)
 
@@ -28,7 +32,13 @@ async def life_span(app: FastAPI):
     logger.info("🚀 Server starting...")
     await init_db()
     await init_redis()
+    await replica_set.start()
+    await role_registry.start()
     yield
+    await role_registry.stop()
+    await replica_set.stop()
+    password_hasher.shutdown()
+    await close_broker()
     logger.info("👋 Server stopped...")
 
 
@@ -49,11 +59,14 @@ app = FastAPI(
     docs_url=f"{api_version}/docs",
     openapi_url=f"/api/{version}/openapi.json",
     lifespan=life_span,
+    default_response_class=JSONResponse,
 )
 
 register_exceptions(app)
 register_middlewares(app)
 
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 app.include_router(auth_router, prefix=f"{api_version}/auth", tags=["auth"])
 app.include_router(admin_router, prefix=f"{api_version}/admin", tags=["admin"])
 app.include_router(user_router, prefix=f"{api_version}/users", tags=["user"])
@@ -1,8 +1,21 @@
+from typing import List, Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER_MODE: bool = False
+
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5
+    REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5
     JWT_SECRET: str
     JWT_ALGORITHM: str
 
@@ -16,14 +29,62 @@ class Settings(BaseSettings):
     MAIL_PORT: int
     MAIL_SERVER: str
     MAIL_FROM_NAME: str
+    MAIL_POOL_SIZE: int = 2
+    MAIL_CONNECTION_MAX_IDLE_SECONDS: int = 30
+    MAIL_BULK_CONCURRENCY: int = 2
+    MAIL_SEND_RATE_PER_SECOND: float = 10
 
     EMAIL_SALT: str
 
+    TOKEN_CLAIMS_CACHE_SIZE: int = 10000
+    ROLE_REGISTRY_TTL_SECONDS: int = 300
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+
     DEFAULT_PAGE_MIN_LIMIT: int = 1
     DEFAULT_PAGE_MAX_LIMIT: int = 100
     DEFAULT_PAGE_LIMIT: int = 30
     DEFAULT_PAGE_OFFSET: int = 0
 
+    INVOICE_BATCH_MAX_SIZE: int = 1000
+    INVOICE_BATCH_INSERT_CHUNK: int = 500
+    PAYMENT_IMPORT_BATCH_SIZE: int = 500
+    EXPORT_BATCH_SIZE: int = 1000
+
+    COUNT_CACHE_SIZE: int = 5000
+    COUNT_CACHE_TTL_SECONDS: int = 30
+
+    TOTALS_RECONCILE_INTERVAL_SECONDS: int = 3600
+
+    ANALYTICS_CACHE_TTL_SECONDS: int = 60
+    ANALYTICS_CACHE_STALE_SECONDS: int = 600
+    ANALYTICS_CACHE_LOCK_SECONDS: int = 30
+
+    OUTBOX_POLL_INTERVAL_SECONDS: int = 5
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: int = 10
+    OUTBOX_RETENTION_DAYS: int = 7
+
+    # Development/CI only: keep each request's SQL, report it in X-DB-* headers
+    # and log repeated statements; strict mode fails endpoints over their budget.
+    SQL_INSTRUMENTATION: bool = False
+    SQL_REPEAT_WARN_THRESHOLD: int = 3
+    QUERY_BUDGET_STRICT: bool = False
+
+    # Celery workers serve their metrics on this port when non-zero; prefork
+    # pools also need PROMETHEUS_MULTIPROC_DIR set so child processes report.
+    CELERY_METRICS_PORT: int = 0
+    CELERY_METRICS_QUEUES: List[str] = ["celery"]
+
+    # "json" for one structured object per line, "text" for the human-readable format.
+    LOG_FORMAT: Literal["json", "text"] = "json"
+    LOG_LEVEL: str = "INFO"
+    # At most this many warnings per call site are logged per window.
+    LOG_WARNING_SAMPLE_BURST: int = 10
+    LOG_WARNING_SAMPLE_SECONDS: int = 60
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
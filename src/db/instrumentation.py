@@ -0,0 +1,154 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config import Config
+from src.db.pool import pool_stats
+from src.utils.exceptions import QueryBudgetExceeded
+from src.utils.logger import setup_logger
+from src.utils.metrics import DB_QUERY_DURATION
+
+logger = setup_logger(__name__)
+
+
+class QueryStats:
+    """SQL statements run on behalf of one request.
+
+    Statement texts are only kept when `keep_statements` is set, which the
+    middleware does in SQL instrumentation mode.
+    """
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.budget: Optional[int] = None
+        self.statements: Optional[List[Tuple[str, float]]] = [] if keep_statements else None
+
+    def record(self, duration: float, statement: Optional[str] = None):
+        self.count += 1
+        self.duration += duration
+
+        if self.statements is not None and statement is not None:
+            self.statements.append((statement, duration))
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def repeated_statements(self, threshold: int) -> Dict[str, int]:
+        """Statements run at least `threshold` times, the usual sign of a lazy load inside a loop."""
+        counts = Counter(statement for statement, _ in self.statements or ())
+        return {statement: count for statement, count in counts.items() if count >= threshold}
+
+
+# Set by the metrics middleware for the duration of each request.
+request_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def instrument_engine(engine: AsyncEngine, name: str):
+    """Time every statement `engine` runs and charge it to the current request, if any."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def observe_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._query_started_at
+        DB_QUERY_DURATION.labels(name).observe(duration)
+
+        stats = request_query_stats.get()
+        if stats is not None:
+            stats.record(duration, statement)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """Count the statements run inside the block, keeping their SQL; for tests and ad hoc profiling."""
+    stats = QueryStats(keep_statements=True)
+    token = request_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        request_query_stats.reset(token)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """Declare the most SQL statements an endpoint may run, auth dependencies included.
+
+    Going over is logged for the request; with `QUERY_BUDGET_STRICT` it fails
+    the request instead, so CI catches an endpoint that quietly grows queries.
+    Apply it below the route decorator.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        @wraps(endpoint)
+        async def with_budget(*args, **kwargs):
+            stats = request_query_stats.get()
+            if stats is not None:
+                stats.budget = max_queries
+
+            response = await endpoint(*args, **kwargs)
+
+            if stats is not None and stats.over_budget and Config.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(
+                    f"{endpoint.__name__} ran {stats.count} SQL statements, over its budget of {max_queries}"
+                )
+
+            return response
+
+        return with_budget
+
+    return decorator
+
+
+def report_queries(stats: QueryStats, method: str, route: str):
+    """Log a request's statements, repeated statements and any budget overrun."""
+    request = f"{method} {route}"
+
+    if stats.statements:
+        logger.debug(
+            f"{request} ran {stats.count} statements in {stats.duration * 1000:.1f}ms:\n"
+            + "\n".join(f"  [{duration * 1000:.1f}ms] {statement}" for statement, duration in stats.statements)
+        )
+
+    for statement, count in stats.repeated_statements(Config.SQL_REPEAT_WARN_THRESHOLD).items():
+        logger.warning(f"Possible N+1 in {request}: statement ran {count} times: {statement}")
+
+    if stats.over_budget:
+        logger.warning(f"{request} ran {stats.count} SQL statements, over its budget of {stats.budget}")
+
+
+class PoolCollector(Collector):
+    """Reports connection pool occupancy and checkout counters for each engine at scrape time."""
+
+    def __init__(self, engines: Dict[str, AsyncEngine]):
+        self.engines = engines
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "db_pool_connections", "Connections in the pool by state.", labels=["engine", "state"]
+        )
+        checkouts = CounterMetricFamily("db_pool_checkouts", "Connections checked out.", labels=["engine"])
+        timeouts = CounterMetricFamily("db_pool_timeouts", "Checkouts that timed out.", labels=["engine"])
+        wait = CounterMetricFamily("db_pool_wait_seconds", "Time spent waiting for connections.", labels=["engine"])
+
+        for name, engine in self.engines.items():
+            stats = pool_stats(engine.sync_engine.pool)
+            for state in ("size", "checked_in", "checked_out", "overflow"):
+                connections.add_metric([name, state], stats[state])
+
+            if "checkouts" in stats:
+                checkouts.add_metric([name], stats["checkouts"])
+                timeouts.add_metric([name], stats["timeouts"])
+                wait.add_metric([name], stats["avg_wait_seconds"] * stats["checkouts"])
+
+        yield from (connections, checkouts, timeouts, wait)
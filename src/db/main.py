@@ -1,21 +1,69 @@
 from typing import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import SQLModel, create_engine
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
+from src.db.instrumentation import PoolCollector, instrument_engine
+from src.db.pool import TimedAsyncAdaptedQueuePool, build_connect_args
+from src.db.routing import ReplicaSet, RoutingSession
+from src.utils.metrics import register_collector
 
-async_engine = AsyncEngine(create_engine(url=Config.DATABASE_URL))
-AsyncSessionMaker = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+def build_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=Config.DB_POOL_SIZE,
+        max_overflow=Config.DB_MAX_OVERFLOW,
+        pool_timeout=Config.DB_POOL_TIMEOUT,
+        pool_recycle=Config.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=Config.DB_POOL_PRE_PING,
+        connect_args=build_connect_args(),
+    )
+
+
+async_engine = build_engine(Config.DATABASE_URL)
+replica_set = ReplicaSet(
+    engines=[build_engine(url) for url in Config.DATABASE_REPLICA_URLS],
+    max_lag=Config.REPLICA_MAX_LAG_SECONDS,
+    check_interval=Config.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+
+engines = {"primary": async_engine}
+engines.update({f"replica-{index}": replica.engine for index, replica in enumerate(replica_set.replicas)})
+for name, engine in engines.items():
+    instrument_engine(engine, name)
+register_collector(PoolCollector(engines))
+
+AsyncSessionMaker = sessionmaker(
+    bind=async_engine, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+)
+ReadSessionMaker = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    info={"replicas": replica_set},
+)
 
 
 async def init_db():
     async with async_engine.begin() as conn:
+        # The search indexes use pg_trgm operator classes.
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(SQLModel.metadata.create_all)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionMaker() as async_session_maker:
         yield async_session_maker
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints; served by a healthy replica when one is configured."""
+    async with ReadSessionMaker() as read_session:
+        yield read_session
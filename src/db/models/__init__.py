@@ -3,9 +3,11 @@ from .departments import Department
 from .expenses import Expenses
 from .expenses_category import ExpensesCategory
 from .invoices import Invoice
+from .outbox import OutboxEvent
 from .patients import Patient
 from .payments import Payment
 from .roles import Role
+from .rollups import DepartmentBudgetRollup
 from .services import Service
 from .users import User
 
@@ -20,4 +22,6 @@ __all__ = [
     "Invoice",
     "Payment",
     "Expenses",
+    "DepartmentBudgetRollup",
+    "OutboxEvent",
 ]
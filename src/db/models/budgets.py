@@ -3,11 +3,13 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, ClassVar, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Index, Sequence, String
 from sqlalchemy.orm import column_property
 from sqlmodel import Column, DateTime, Field, Numeric, Relationship, SQLModel
 
 from src.features.budgets.schemas import BudgetAvailability, BudgetStatus
+from src.utils import build_serial_no_sql
+from src.utils.search import trigram_indexes
 
 if TYPE_CHECKING:
     from src.db.models.departments import Department
@@ -15,6 +17,9 @@ if TYPE_CHECKING:
     from src.db.models.users import User
 
 
+budget_serial_no_seq = Sequence("budgets_serial_no_seq", metadata=SQLModel.metadata)
+
+
 class BaseBudget(SQLModel):
     """Abstract base with computed SQL + Python props."""
 
@@ -25,15 +30,8 @@ class BaseBudget(SQLModel):
 
     @property
     def total_expenses(self) -> Decimal:
-        if not self.expenses:
-            return Decimal("0.0")
-        return sum(expense.amount_spent for expense in self.expenses if expense.amount_spent)
-
-    @property
-    def amount_spent(self) -> Decimal:
-        if self.gross_amount is None or self.amount_remaining is None:
-            return Decimal("0.0")
-        return self.gross_amount - self.amount_remaining
+        """Total spent against this budget, as maintained in `amount_spent`."""
+        return self.amount_spent or Decimal("0.0")
 
     def calculate_amount_remaining(self, new_gross_amount: int) -> Decimal:
         return new_gross_amount - self.total_expenses
@@ -87,10 +85,22 @@ class BaseBudget(SQLModel):
 
 class Budget(BaseBudget, table=True):
     __tablename__ = "budgets"
+    __table_args__ = (
+        Index("ix_budgets_created_at_id", "created_at", "id"),
+        *trigram_indexes("budgets", "title", "short_description", "serial_no"),
+    )
 
     id: Optional[int] = Field(primary_key=True, default=None)
     uid: UUID = Field(default_factory=uuid4, index=True, unique=True, nullable=False)
-    serial_no: Optional[str] = Field(index=True, unique=True, nullable=True)
+    serial_no: Optional[str] = Field(
+        sa_column=Column(
+            String,
+            nullable=True,
+            index=True,
+            unique=True,
+            server_default=build_serial_no_sql("Budget", budget_serial_no_seq.name),
+        )
+    )
     created_at: datetime = Field(sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)))
     updated_at: datetime = Field(
         sa_column=Column(
@@ -108,6 +118,9 @@ class Budget(BaseBudget, table=True):
     status: Optional[str] = Field(default=BudgetStatus.PENDING.value)
     availability: str = Field(default=BudgetAvailability.AVAILABLE.value)
     gross_amount: Decimal = Field(sa_column=Column(Numeric(12, 2)))
+    amount_spent: Decimal = Field(
+        sa_column=Column(Numeric(12, 2), nullable=False, default=Decimal("0.0"), server_default="0")
+    )
     title: str
     short_description: str
 
@@ -128,14 +141,27 @@ class Budget(BaseBudget, table=True):
         return f"<Budget: {self.model_dump()}>"
 
 
-from src.db.models.expenses import Expenses  # noqa
+BUDGET_SEARCH_COLUMNS = (Budget.title, Budget.short_description, Budget.serial_no)
 
-Budget.amount_remaining = column_property(
-    Budget.gross_amount
-    - (
-        select(func.coalesce(func.sum(Expenses.amount_spent), 0))
-        .where(Expenses.budget_uid == Budget.uid)
-        .correlate_except(Expenses)
-        .scalar_subquery()
-    )
+
+Budget.amount_remaining = column_property(Budget.gross_amount - Budget.amount_spent)
+
+
+BUDGET_EXPORT_COLUMNS = (
+    Budget.uid,
+    Budget.serial_no,
+    Budget.created_at,
+    Budget.received_at,
+    Budget.approved_at,
+    Budget.status,
+    Budget.availability,
+    Budget.title,
+    Budget.short_description,
+    Budget.gross_amount,
+    Budget.amount_spent,
+    Budget.amount_remaining,
+    Budget.department_uid,
+    Budget.user_uid,
+    Budget.approver_uid,
+    Budget.assignee_uid,
 )
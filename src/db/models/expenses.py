@@ -3,20 +3,39 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index, Sequence, String
 from sqlmodel import Column, DateTime, Field, ForeignKey, Numeric, Relationship, SQLModel
 
+from src.utils import build_serial_no_sql
+from src.utils.search import trigram_indexes
+
 if TYPE_CHECKING:
     from src.db.models.budgets import Budget
     from src.db.models.expenses_category import ExpensesCategory
     from src.db.models.users import User
 
 
+expense_serial_no_seq = Sequence("expenses_serial_no_seq", metadata=SQLModel.metadata)
+
+
 class Expenses(SQLModel, table=True):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_created_at_id", "created_at", "id"),
+        *trigram_indexes("expenses", "title", "short_description", "serial_no", "note"),
+    )
 
     id: Optional[int] = Field(primary_key=True, default=None)
     uid: UUID = Field(default_factory=uuid4, nullable=False, index=True, unique=True)
-    serial_no: Optional[str] = Field(nullable=True, index=True, unique=True)
+    serial_no: Optional[str] = Field(
+        sa_column=Column(
+            String,
+            nullable=True,
+            index=True,
+            unique=True,
+            server_default=build_serial_no_sql("Expenses", expense_serial_no_seq.name),
+        )
+    )
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)),
     )
@@ -44,3 +63,19 @@ class Expenses(SQLModel, table=True):
 
     def __repr__(self) -> str:
         return f"<Expenses: {self.model_dump()}>"
+
+
+EXPENSE_SEARCH_COLUMNS = (Expenses.title, Expenses.short_description, Expenses.serial_no, Expenses.note)
+
+EXPENSE_EXPORT_COLUMNS = (
+    Expenses.uid,
+    Expenses.serial_no,
+    Expenses.created_at,
+    Expenses.title,
+    Expenses.short_description,
+    Expenses.note,
+    Expenses.amount_spent,
+    Expenses.budget_uid,
+    Expenses.expenses_category_uid,
+    Expenses.user_uid,
+)
@@ -1,13 +1,15 @@
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import TYPE_CHECKING, ClassVar, List, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import case
+from sqlalchemy import Index, Sequence, String, case, func
 from sqlalchemy.orm import column_property
-from sqlmodel import Column, DateTime, Field, Numeric, Relationship, SQLModel, func, select
+from sqlmodel import Column, DateTime, Field, Numeric, Relationship, SQLModel
 
 from src.features.invoices.schemas import InvoiceStatus
+from src.utils import build_serial_no_sql
+from src.utils.search import trigram_indexes
 
 if TYPE_CHECKING:
     from src.db.models.departments import Department
@@ -17,6 +19,9 @@ if TYPE_CHECKING:
     from src.db.models.users import User
 
 
+invoice_serial_no_seq = Sequence("invoices_serial_no_seq", metadata=SQLModel.metadata)
+
+
 class BaseInvoice(SQLModel):
     """Abstract base with computed SQL + Python props."""
 
@@ -25,72 +30,32 @@ class BaseInvoice(SQLModel):
     # placeholder so Pydantic ignores it as a model field
     net_amount_due: ClassVar[Decimal]
 
-    @property
-    def tax_amount(self) -> Decimal:
-        """Calculate the tax amount based on gross amount."""
-        if self.gross_amount is None or self.tax_percent is None or self.tax_percent <= 0:
-            return Decimal("0.0")
-        return self.gross_amount * (self.tax_percent / 100)
-
-    @property
-    def discount_amount(self) -> Decimal:
-        """Calculate the discount amount based on gross + tax."""
-        if self.gross_amount is None or self.discount_percent is None or self.discount_percent <= 0:
-            return Decimal("0.0")
-
-        gross_with_tax = self.gross_amount + self.tax_amount
-        return gross_with_tax * (self.discount_percent / 100)
-
-    @property
-    def total_invoice_amount(self) -> Decimal:
-        """Calculate the total invoice amount (gross + tax - discount)."""
-        if self.gross_amount is None:
-            return Decimal("0.0")
-
-        return self.gross_amount + self.tax_amount - self.discount_amount
-
     @property
     def total_payments(self) -> Decimal:
-        """Calculate the total amount paid against this invoice."""
-        if not self.payments:
-            return Decimal("0.0")
-
-        return sum(payment.amount_received for payment in self.payments if payment.amount_received)
-
-    def calculate_net_amount_due(self) -> Decimal:
-        """Calculate the net amount due (total invoice - payments made)."""
-        return self.total_invoice_amount - self.total_payments
-
-    @property
-    def is_fully_paid(self) -> bool:
-        """Check if the invoice is fully paid."""
-        return self.calculate_net_amount_due() <= Decimal("0.0")
-
-    @property
-    def is_overpaid(self) -> bool:
-        """Check if payments exceed the invoice total."""
-        return self.calculate_net_amount_due() < Decimal("0.0")
-
-    @property
-    def payment_status(self) -> str:
-        """Get the payment status of the invoice."""
-        net_due = self.calculate_net_amount_due()
-        total_payments = self.total_payments
-
-        if total_payments == Decimal("0.0"):
-            return InvoiceStatus.UNPAID
-        elif net_due <= Decimal("0.0"):
-            return InvoiceStatus.PAID if net_due == Decimal("0.0") else InvoiceStatus.OVER_PAID
-        else:
-            return InvoiceStatus.PARTIALLY_PAID
+        """Total amount paid against this invoice, as maintained in `amount_paid`."""
+        return self.amount_paid or Decimal("0.0")
 
 
 class Invoice(BaseInvoice, table=True):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_created_at_id", "created_at", "id"),
+        Index("ix_invoices_user_uid_status", "user_uid", "status"),
+        Index("ix_invoices_patient_uid_status", "patient_uid", "status"),
+        *trigram_indexes("invoices", "title", "serial_no"),
+    )
 
     id: Optional[int] = Field(primary_key=True, default=None)
     uid: UUID = Field(default_factory=uuid4, nullable=False, index=True, unique=True)
-    serial_no: Optional[str] = Field(nullable=True, index=True, unique=True)
+    serial_no: Optional[str] = Field(
+        sa_column=Column(
+            String,
+            nullable=True,
+            index=True,
+            unique=True,
+            server_default=build_serial_no_sql("Invoice", invoice_serial_no_seq.name),
+        )
+    )
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)),
     )
@@ -111,6 +76,10 @@ class Invoice(BaseInvoice, table=True):
     gross_amount: Decimal = Field(sa_column=Column(Numeric(12, 2)))
     tax_percent: Optional[Decimal] = Field(sa_column=Column(Numeric(12, 2)), default=0.0)
     discount_percent: Optional[Decimal] = Field(sa_column=Column(Numeric(12, 2)), default=0.0)
+    amount_paid: Decimal = Field(
+        sa_column=Column(Numeric(12, 2), nullable=False, default=Decimal("0.0"), server_default="0")
+    )
+    status: str = Field(default=InvoiceStatus.UNPAID.value, nullable=False, index=True)
 
     # relationships
     user: "User" = Relationship(back_populates="invoices")
@@ -122,34 +91,73 @@ class Invoice(BaseInvoice, table=True):
     def __repr__(self) -> str:
         return f"<Invoices: {self.model_dump()}>"
 
+    def refresh_status(self):
+        """Re-derive the stored status after the amounts on this instance change."""
+        zero = Decimal("0.0")
+        amount_paid = self.amount_paid or zero
+        net_amount_due = invoice_amount_due(
+            self.gross_amount, self.tax_percent or zero, self.discount_percent or zero, amount_paid
+        )
+        self.status = derive_invoice_status(net_amount_due, amount_paid)
+
 
-from src.db.models.payments import Payment  # noqa
+INVOICE_SEARCH_COLUMNS = (Invoice.title, Invoice.serial_no)
 
-Invoice.net_amount_due = column_property(
-    Invoice.gross_amount
-    + (Invoice.gross_amount * (Invoice.tax_percent / 100))
-    - (Invoice.gross_amount * (Invoice.tax_percent / 100) * (Invoice.discount_percent / 100))
-    - (
-        select(func.coalesce(func.sum(Payment.amount_received), 0))
-        .where(Payment.invoice_uid == Invoice.uid)
-        .correlate_except(Payment)
-        .scalar_subquery()
+
+def invoice_amount_due(gross_amount: Any, tax_percent: Any, discount_percent: Any, amount_paid: Any) -> Any:
+    """Net amount due; works on plain Decimals and on SQL column expressions alike."""
+    tax_amount = gross_amount * (tax_percent / 100)
+    return gross_amount + tax_amount - tax_amount * (discount_percent / 100) - amount_paid
+
+
+def invoice_amount_due_sql(amount_paid: Any) -> Any:
+    """`invoice_amount_due` over the invoice columns, reading NULL percentages as zero like `refresh_status`."""
+    return invoice_amount_due(
+        Invoice.gross_amount,
+        func.coalesce(Invoice.tax_percent, 0),
+        func.coalesce(Invoice.discount_percent, 0),
+        amount_paid,
     )
-)
-Invoice.status = column_property(
-    case(
-        (
-            Invoice.net_amount_due < 0,
-            InvoiceStatus.OVER_PAID.value,
-        ),
-        (
-            Invoice.net_amount_due == 0,
-            InvoiceStatus.PAID.value,
-        ),
-        (
-            Invoice.net_amount_due == Invoice.gross_amount,
-            InvoiceStatus.UNPAID.value,
-        ),
+
+
+def derive_invoice_status(net_amount_due: Decimal, amount_paid: Decimal) -> str:
+    if net_amount_due < 0:
+        return InvoiceStatus.OVER_PAID.value
+    if net_amount_due == 0:
+        return InvoiceStatus.PAID.value
+    if amount_paid == 0:
+        return InvoiceStatus.UNPAID.value
+    return InvoiceStatus.PARTIALLY_PAID.value
+
+
+def invoice_status_case(net_amount_due: Any, amount_paid: Any):
+    """SQL twin of `derive_invoice_status`, for statements that move `amount_paid`."""
+    return case(
+        (net_amount_due < 0, InvoiceStatus.OVER_PAID.value),
+        (net_amount_due == 0, InvoiceStatus.PAID.value),
+        (amount_paid == 0, InvoiceStatus.UNPAID.value),
         else_=InvoiceStatus.PARTIALLY_PAID.value,
     )
+
+
+Invoice.net_amount_due = column_property(invoice_amount_due_sql(Invoice.amount_paid))
+
+
+INVOICE_EXPORT_COLUMNS = (
+    Invoice.uid,
+    Invoice.serial_no,
+    Invoice.created_at,
+    Invoice.invoiced_at,
+    Invoice.invoice_type,
+    Invoice.status,
+    Invoice.title,
+    Invoice.gross_amount,
+    Invoice.tax_percent,
+    Invoice.discount_percent,
+    Invoice.amount_paid,
+    Invoice.net_amount_due,
+    Invoice.department_uid,
+    Invoice.service_uid,
+    Invoice.patient_uid,
+    Invoice.user_uid,
 )
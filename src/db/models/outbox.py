@@ -0,0 +1,40 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Column, DateTime, Field, SQLModel
+
+from src.features.outbox.schemas import OutboxStatus
+
+
+class OutboxEvent(SQLModel, table=True):
+    """Side effect recorded in the same transaction as the write that caused it.
+
+    The outbox worker claims pending events and runs them after the commit,
+    retrying with backoff until `max_attempts` is reached.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index("ix_outbox_events_pending", "available_at", "id", postgresql_where=text("status = 'PENDING'")),
+    )
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    uid: UUID = Field(default_factory=uuid4, nullable=False, index=True, unique=True)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    )
+    available_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    )
+    processed_at: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True), nullable=True))
+    kind: str = Field(nullable=False)
+    payload: Dict[str, Any] = Field(sa_column=Column(JSONB, nullable=False))
+    status: str = Field(default=OutboxStatus.PENDING.value, nullable=False)
+    attempts: int = Field(default=0, nullable=False)
+    last_error: Optional[str] = Field(default=None, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent: {self.model_dump()}>"
@@ -2,8 +2,11 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy import Index
 from sqlmodel import Column, DateTime, Field, Relationship, SQLModel
 
+from src.utils.search import trigram_indexes
+
 if TYPE_CHECKING:
     from src.db.models.invoices import Invoice
     from src.db.models.users import User
@@ -11,6 +14,10 @@ if TYPE_CHECKING:
 
 class Patient(SQLModel, table=True):
     __tablename__ = "patients"
+    __table_args__ = (
+        Index("ix_patients_created_at_id", "created_at", "id"),
+        *trigram_indexes("patients", "first_name", "last_name", "other_name", "hospital_id"),
+    )
 
     id: Optional[int] = Field(primary_key=True, default=None)
     uid: UUID = Field(default_factory=uuid4, nullable=False, index=True, unique=True)
@@ -39,3 +46,6 @@ class Patient(SQLModel, table=True):
 
     def __repr__(self) -> str:
         return f"<Patient: {self.model_dump()}>"
+
+
+PATIENT_SEARCH_COLUMNS = (Patient.first_name, Patient.last_name, Patient.other_name, Patient.hospital_id)
@@ -3,20 +3,44 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, Sequence, String
 from sqlmodel import Column, DateTime, Field, Numeric, Relationship, SQLModel
 
+from src.utils import build_serial_no_sql
+from src.utils.search import trigram_indexes
+
 if TYPE_CHECKING:
     from src.db.models.invoices import Invoice
     from src.db.models.users import User
 
 
+payment_serial_no_seq = Sequence("payments_serial_no_seq", metadata=SQLModel.metadata)
+
+
 class Payment(SQLModel, table=True):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        # Covers the income analytics scan so it never has to visit the heap.
+        Index(
+            "ix_payments_created_at_income",
+            "created_at",
+            postgresql_include=["invoice_uid", "payment_method", "amount_received"],
+        ),
+        *trigram_indexes("payments", "note", "serial_no", "reference_number"),
+    )
 
     id: Optional[int] = Field(primary_key=True, default=None)
     uid: UUID = Field(default_factory=uuid4, nullable=False, index=True, unique=True)
-    serial_no: Optional[str] = Field(nullable=True, index=True, unique=True)
+    serial_no: Optional[str] = Field(
+        sa_column=Column(
+            String,
+            nullable=True,
+            index=True,
+            unique=True,
+            server_default=build_serial_no_sql("Payment", payment_serial_no_seq.name),
+        )
+    )
     created_at: datetime = Field(
         sa_column=Column(
             DateTime(timezone=True),
@@ -30,7 +54,9 @@ class Payment(SQLModel, table=True):
             onupdate=lambda: datetime.now(timezone.utc),
         ),
     )
-    invoice_uid: UUID = Field(sa_column=Column("invoice_uid", ForeignKey("invoices.uid", ondelete="CASCADE")))
+    invoice_uid: UUID = Field(
+        sa_column=Column("invoice_uid", ForeignKey("invoices.uid", ondelete="CASCADE"), index=True)
+    )
     user_uid: Optional[UUID] = Field(foreign_key="users.uid")
     payment_method: str = Field(...)
     amount_received: Decimal = Field(sa_column=Column(Numeric(12, 2)))
@@ -43,3 +69,18 @@ class Payment(SQLModel, table=True):
 
     def __repr__(self) -> str:
         return f"<Payment: {self.model_dump()}>"
+
+
+PAYMENT_SEARCH_COLUMNS = (Payment.note, Payment.serial_no)
+
+PAYMENT_EXPORT_COLUMNS = (
+    Payment.uid,
+    Payment.serial_no,
+    Payment.created_at,
+    Payment.payment_method,
+    Payment.amount_received,
+    Payment.reference_number,
+    Payment.note,
+    Payment.invoice_uid,
+    Payment.user_uid,
+)
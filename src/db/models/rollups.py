@@ -0,0 +1,45 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Date, UniqueConstraint
+from sqlmodel import Column, DateTime, Field, Numeric, SQLModel
+
+
+def rollup_month(created_at: datetime) -> date:
+    """First day of the UTC month a budget created at `created_at` is rolled up into."""
+    return created_at.astimezone(timezone.utc).date().replace(day=1)
+
+
+class DepartmentBudgetRollup(SQLModel, table=True):
+    """Budget and expense totals per department per month of budget creation.
+
+    Kept up to date by the budget and expense writers and rebuilt from the raw
+    tables on a schedule, so dashboards never scan budgets or expenses.
+    """
+
+    __tablename__ = "department_budget_rollups"
+    __table_args__ = (
+        UniqueConstraint("department_uid", "month", name="uq_department_budget_rollups_department_month"),
+    )
+
+    id: Optional[int] = Field(primary_key=True, default=None)
+    department_uid: UUID = Field(foreign_key="departments.uid", nullable=False)
+    month: date = Field(sa_column=Column(Date, nullable=False))
+    budget_total: Decimal = Field(
+        sa_column=Column(Numeric(14, 2), nullable=False, default=Decimal("0.0"), server_default="0")
+    )
+    expense_total: Decimal = Field(
+        sa_column=Column(Numeric(14, 2), nullable=False, default=Decimal("0.0"), server_default="0")
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            default=lambda: datetime.now(timezone.utc),
+            onupdate=lambda: datetime.now(timezone.utc),
+        )
+    )
+
+    def __repr__(self) -> str:
+        return f"<DepartmentBudgetRollup: {self.model_dump()}>"
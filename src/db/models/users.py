@@ -3,9 +3,11 @@ from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID, uuid4
 
 from pydantic import EmailStr
+from sqlalchemy import Index, Sequence
 from sqlmodel import Column, DateTime, Field, Relationship, SQLModel
 
 from src.features.users.schemas import UserStatus
+from src.utils.search import trigram_indexes
 
 if TYPE_CHECKING:
     from src.db.models.budgets import Budget
@@ -17,8 +19,15 @@ if TYPE_CHECKING:
     from src.db.models.roles import Role
 
 
+staff_no_seq = Sequence("users_staff_no_seq", metadata=SQLModel.metadata)
+
+
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+        *trigram_indexes("users", "first_name", "last_name", "email", "staff_no"),
+    )
 
     id: Optional[int] = Field(primary_key=True, default=None)
     uid: UUID = Field(default_factory=uuid4, nullable=False, index=True, unique=True)
@@ -79,3 +88,6 @@ class User(SQLModel, table=True):
 
     def __repr__(self) -> str:
         return f"<User: {self.model_dump()}>"
+
+
+USER_SEARCH_COLUMNS = (User.first_name, User.last_name, User.email, User.staff_no)
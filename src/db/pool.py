@@ -0,0 +1,96 @@
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PoolStats:
+    """Running checkout counters for the connection pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait: float):
+        self.checkouts += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_seconds": self.total_wait_seconds / self.checkouts if self.checkouts else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> "TimedAsyncAdaptedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            logger.error(f"Timed out waiting for a database connection: {self.status()}")
+            raise
+
+        wait = time.perf_counter() - started_at
+        self.stats.record_checkout(wait)
+
+        if wait > 1:
+            logger.warning(f"Waited {wait:.2f}s for a database connection: {self.status()}")
+
+        return connection
+
+
+def pool_stats(pool: Any) -> Dict[str, Any]:
+    """Current pool occupancy plus the checkout counters, when the pool records them."""
+    stats: Dict[str, Any] = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+    if isinstance(pool, TimedAsyncAdaptedQueuePool):
+        stats.update(pool.stats.as_dict())
+
+    return stats
+
+
+def build_connect_args() -> Dict[str, Any]:
+    """asyncpg connection arguments for the configured pooling mode.
+
+    PgBouncer in transaction mode hands each transaction a different server
+    connection, so named prepared statements would collide or vanish between
+    statements; both statement caches are turned off and names made unique.
+    """
+    if Config.DB_PGBOUNCER_MODE:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {"prepared_statement_cache_size": Config.DB_STATEMENT_CACHE_SIZE}
@@ -1,17 +1,53 @@
-from typing import Optional
+import asyncio
+import time
+from typing import Dict, List, Optional
 
 import backoff
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
 from redis.asyncio.retry import Retry
 from redis.backoff import ExponentialBackoff
 from redis.exceptions import ConnectionError, RedisError
 
 from src.config import Config
 from src.utils.logger import setup_logger
+from src.utils.metrics import observe_redis_command
 
 logger = setup_logger(__name__)
 
 
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True):
+        started_at = time.perf_counter()
+        try:
+            result = await super().execute(raise_on_error)
+        except Exception:
+            observe_redis_command("PIPELINE", started_at, failed=True)
+            raise
+
+        observe_redis_command("PIPELINE", started_at)
+        return result
+
+
+class InstrumentedRedis(aioredis.Redis):
+    """Redis client that records the latency of every command and pipeline it sends."""
+
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper()
+        started_at = time.perf_counter()
+        try:
+            result = await super().execute_command(*args, **options)
+        except Exception:
+            observe_redis_command(command, started_at, failed=True)
+            raise
+
+        observe_redis_command(command, started_at)
+        return result
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
 class RedisClient:
     _instance: Optional["RedisClient"] = None
     _client: Optional[aioredis.Redis] = None
@@ -19,6 +55,8 @@ class RedisClient:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._pending_blocklist_checks = {}
+            cls._instance._blocklist_flush_task = None
         return cls._instance
 
     async def init(self):
@@ -26,7 +64,7 @@ class RedisClient:
         if self._client is None:
             try:
                 retry = Retry(ExponentialBackoff(), 3)
-                self._client = aioredis.from_url(
+                self._client = InstrumentedRedis.from_url(
                     url=f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}/0",
                     retry=retry,
                     decode_responses=True,
@@ -71,16 +109,43 @@ class RedisClient:
             raise
 
     async def in_blocklist(self, key: str) -> bool:
-        """Check if token is in blocklist"""
+        """Check if token is in blocklist.
+
+        Concurrent checks issued in the same event loop tick are coalesced into a
+        single pipelined round trip instead of one EXISTS per request.
+        """
         if not self._client:
             logger.warning("Redis client not initialized")
             return False
 
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending_blocklist_checks.setdefault(key, []).append(future)
+
+        if self._blocklist_flush_task is None:
+            self._blocklist_flush_task = loop.create_task(self._flush_blocklist_checks())
+
+        return await future
+
+    async def _flush_blocklist_checks(self):
+        pending: Dict[str, List[asyncio.Future]] = self._pending_blocklist_checks
+        self._pending_blocklist_checks = {}
+        self._blocklist_flush_task = None
+        keys = list(pending)
+
         try:
-            return await self._client.exists(key) > 0
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.exists(key)
+                results = await pipe.execute()
         except Exception as e:
             logger.error(f"Error checking blocklist: {e}")
-            return False
+            results = [0] * len(keys)
+
+        for key, exists in zip(keys, results):
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(exists > 0)
 
 
 redis_client = RedisClient()
@@ -0,0 +1,126 @@
+import asyncio
+import itertools
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.dml import UpdateBase
+from sqlmodel.orm.session import Session
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Set once the current request has written, so its later reads see those writes.
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def pin_primary():
+    primary_pinned.set(True)
+
+
+class Replica:
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+
+class ReplicaSet:
+    """Read replicas that are polled for replication lag in the background.
+
+    Only replicas that answered the last check within `max_lag` seconds are
+    handed out; with none available, callers fall back to the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], max_lag: float, check_interval: float):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._round_robin = itertools.count()
+        self._checker: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[AsyncEngine]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+
+        return healthy[next(self._round_robin) % len(healthy)].engine
+
+    async def check(self, replica: Replica):
+        try:
+            async with replica.engine.connect() as conn:
+                replica.lag_seconds = float(await conn.scalar(REPLICA_LAG_QUERY))
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"Replica {replica.name} is unreachable, reading from primary: {e}")
+            replica.healthy = False
+            replica.lag_seconds = None
+            return
+
+        healthy = replica.lag_seconds <= self.max_lag
+        if replica.healthy and not healthy:
+            logger.warning(f"Replica {replica.name} is {replica.lag_seconds:.1f}s behind, reading from primary")
+
+        replica.healthy = healthy
+
+    async def check_all(self):
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def start(self):
+        if not self.replicas or self._checker is not None:
+            return
+
+        await self.check_all()
+        self._checker = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._checker:
+            self._checker.cancel()
+            try:
+                await self._checker
+            except asyncio.CancelledError:
+                pass
+            self._checker = None
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica when created with `info={"replicas": ...}`.
+
+    Flushes and DML statements always go to the primary and pin the rest of
+    the request to it; sessions without a replica set behave like a plain
+    primary session.
+    """
+
+    _replica_bind: Optional[AsyncEngine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replicas: Optional[ReplicaSet] = self.info.get("replicas")
+
+        if self._flushing or isinstance(clause, UpdateBase):
+            pin_primary()
+        elif replicas is not None and not primary_pinned.get():
+            if self._replica_bind is None:
+                self._replica_bind = replicas.choose()
+            if self._replica_bind is not None:
+                return self._replica_bind.sync_engine
+
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
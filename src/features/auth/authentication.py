@@ -1,23 +1,24 @@
-import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import uuid4
 
 import jwt
 from fastapi import Response
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from jwt import ExpiredSignatureError, PyJWTError
-from passlib.context import CryptContext
 
 from src.config import Config
 from src.db.redis import redis_client
 from src.utils.exceptions import ExpiredLink, InvalidLink, InvalidToken, RefreshTokenExpired, TokenExpired
+from src.utils.logger import setup_logger
 
+from .hashing import password_hasher
 from .schemas import TokenUserModel
 
+logger = setup_logger(__name__)
+
 
 class Authentication:
-    password_context = CryptContext(schemes=["bcrypt"])
     ACCESS_TOKEN_EXPIRY_IN_SECONDS = 900  # 15 mins
     REFRESH_TOKEN_EXPIRY_IN_SECONDS = 604800  # 7 days
 
@@ -25,12 +26,16 @@ class Authentication:
     serializer: URLSafeTimedSerializer = URLSafeTimedSerializer(secret_key=Config.JWT_SECRET, salt=Config.EMAIL_SALT)
 
     @staticmethod
-    def generate_password_hash(password: str) -> str:
-        return Authentication.password_context.hash(password)
+    async def generate_password_hash(password: str) -> str:
+        return await password_hasher.hash(password)
+
+    @staticmethod
+    async def verify_password(password: str, hash: str) -> bool:
+        return await password_hasher.verify(password, hash)
 
     @staticmethod
-    def verify_password(password: str, hash: str) -> bool:
-        return Authentication.password_context.verify(password, hash)
+    async def verify_and_update_password(password: str, hash: str) -> Tuple[bool, Optional[str]]:
+        return await password_hasher.verify_and_update(password, hash)
 
     @staticmethod
     async def create_token(
@@ -86,7 +91,7 @@ class Authentication:
                     )
 
             except Exception as e:
-                logging.error(f"Failed to initialize Redis client: {e}")
+                logger.error(f"Failed to initialize Redis client: {e}")
                 pass
 
         return token
@@ -107,24 +112,23 @@ class Authentication:
                     jwt=token, key=Config.JWT_SECRET, algorithms=[Config.JWT_ALGORITHM], options={"verify_exp": False}
                 )
                 is_refresh = unverified_payload.get("refresh", False)
-                logging.warning(f"Token expired. Is refresh: {is_refresh}")
+                # Expired tokens are routine client behaviour, not something to warn about.
+                logger.debug(f"Token expired. Is refresh: {is_refresh}")
 
                 if is_refresh:
-                    logging.warning("Raising RefreshTokenExpired")
                     raise RefreshTokenExpired()
                 else:
-                    logging.warning("Raising TokenExpired")
                     raise TokenExpired()
 
             except (KeyError, ValueError, TypeError) as decode_error:
-                logging.warning(f"Could not decode expired token payload: {decode_error}")
+                logger.warning(f"Could not decode expired token payload: {decode_error}")
                 raise TokenExpired()
             except RefreshTokenExpired:
                 raise
             except TokenExpired:
                 raise
-        except PyJWTError:
-            logging.exception("JWT decoding failed.")
+        except PyJWTError as e:
+            logger.debug(f"JWT decoding failed: {e}")
             raise InvalidToken()
 
     @staticmethod
@@ -136,11 +140,11 @@ class Authentication:
         try:
             return Authentication.serializer.loads(token, max_age=Authentication.PWD_RESET_TOKEN_EXPIRY_IN_SECONDS)
         except SignatureExpired:
-            logging.error("Token expired")
+            logger.error("Token expired")
             raise ExpiredLink()
         except BadSignature:
-            logging.error("Invalid token")
+            logger.error("Invalid token")
             raise InvalidLink()
         except Exception as e:
-            logging.error(f"Unexpected error: {e}")
+            logger.error(f"Unexpected error: {e}")
             raise InvalidLink()
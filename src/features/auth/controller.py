@@ -1,16 +1,21 @@
+import asyncio
+from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette_context import context
 
-from src.db.models.users import User
+from src.db.models.users import User, staff_no_seq
 from src.db.redis import add_jti_to_block_list, redis_client
 from src.features.departments.controller import dept_controller
+from src.features.outbox.controller import outbox_controller
+from src.features.outbox.schemas import OutboxEventKind
 from src.features.roles.controller import role_controller
 from src.features.users.controller import user_controller
 from src.features.users.schemas import CreateUserModel, LoginUserModel, UserResponseModel
-from src.misc.schemas import ServerRespModel
+from src.misc.schemas import EmailTypes, ServerRespModel
+from src.utils import build_staff_no_sql
 from src.utils.exceptions import (
     InActive,
     InvalidToken,
@@ -22,6 +27,7 @@ from src.utils.exceptions import (
     WrongCredentials,
 )
 from src.utils.logger import setup_logger
+from src.utils.responses import JSONResponse
 
 from .authentication import Authentication
 from .schemas import ChangePwdModel, TokenModel, TokenUserModel, UserType
@@ -40,9 +46,9 @@ class AuthController:
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[UserResponseModel](
-                data=UserResponseModel.model_validate(user).model_dump(),
+                data=UserResponseModel.model_validate(user),
                 message="user profile retrieved",
-            ).model_dump(mode="json"),
+            ),
         )
 
     async def revoke_token(self, refresh_token_jti: Optional[str], token_payload: dict):
@@ -59,7 +65,7 @@ class AuthController:
             content=ServerRespModel(
                 data=True,
                 message="logged out successfully.",
-            ).model_dump(),
+            ),
         )
 
     async def new_access_token(self, token_jti: str, session: AsyncSession):
@@ -109,7 +115,7 @@ class AuthController:
                         "user_type": UserType.OLD_USER.value,
                     },
                     message="new access token generated.",
-                ).model_dump(),
+                ),
             )
         except (RefreshTokenRequired, RefreshTokenExpired, InvalidToken, TokenExpired):
             raise
@@ -125,26 +131,31 @@ class AuthController:
         if not user:
             raise NotFound("User doesn't exist.")
 
-        if user.password and not Authentication.verify_password(data.old_password, user.password):
-            raise WrongCredentials("Old password is incorrect.")
-
-        if user.password and Authentication.verify_password(data.new_password, user.password):
-            return JSONResponse(
-                status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](
-                    data=False, message="New password cannot be same as old password."
-                ).model_dump(),
+        if user.password:
+            old_password_matches, new_password_matches = await asyncio.gather(
+                Authentication.verify_password(data.old_password, user.password),
+                Authentication.verify_password(data.new_password, user.password),
             )
 
+            if not old_password_matches:
+                raise WrongCredentials("Old password is incorrect.")
+
+            if new_password_matches:
+                return JSONResponse(
+                    status_code=status.HTTP_200_OK,
+                    content=ServerRespModel[bool](data=False, message="New password cannot be same as old password."),
+                )
+
+        outbox_controller.audit(session, "password_change", user.uid)
         await user_controller.update_user(
             user=user,
-            user_data={"password": Authentication.generate_password_hash(data.model_dump().get("new_password"))},
+            user_data={"password": await Authentication.generate_password_hash(data.model_dump().get("new_password"))},
             session=session,
         )
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[bool](data=True, message="Password reset successful.").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Password reset successful."),
         )
 
     async def login_user(self, login_data: LoginUserModel, session: AsyncSession):
@@ -165,10 +176,18 @@ class AuthController:
                             "user_type": UserType.NEW_USER.value,
                         },
                         message="user token not generated.",
-                    ).model_dump(),
+                    ),
                 )
 
-            if Authentication.verify_password(login_data.password, user.password):
+            password_matches, new_password_hash = await Authentication.verify_and_update_password(
+                login_data.password, user.password
+            )
+
+            if password_matches:
+                if new_password_hash:
+                    # bcrypt cost changed since this hash was stored, persist it with the login stamp.
+                    user.password = new_password_hash
+
                 user_data = TokenUserModel.model_validate(
                     {
                         "id": user.id,
@@ -184,7 +203,19 @@ class AuthController:
                 )
 
                 access_token = await Authentication.create_token(user_data)
-                await user_controller.update_last_login(user=user, session=session)
+
+                outbox_controller.enqueue(
+                    session,
+                    OutboxEventKind.LAST_LOGIN,
+                    {"user_uid": str(user.uid), "logged_in_at": datetime.now(timezone.utc).isoformat()},
+                )
+                outbox_controller.audit(session, "login", user.uid)
+
+                try:
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    raise e
 
                 response = JSONResponse(
                     status_code=status.HTTP_200_OK,
@@ -194,7 +225,7 @@ class AuthController:
                             "user_type": UserType.OLD_USER.value,
                         },
                         message="user token generated.",
-                    ).model_dump(),
+                    ),
                 )
 
                 await Authentication.create_token(user_data=user_data, refresh=True, response=response)
@@ -211,7 +242,7 @@ class AuthController:
                         "user_type": UserType.OLD_USER.value if user.password else UserType.NEW_USER.value,
                     },
                     message="user token not generated.",
-                ).model_dump(),
+                ),
             )
 
     async def create_user(self, token_payload: Optional[dict], user_data: CreateUserModel, session: AsyncSession):
@@ -232,14 +263,12 @@ class AuthController:
             user["created_by_uid"] = token_payload["user"]["uid"]
 
         if user.get("password"):
-            user["password"] = Authentication.generate_password_hash(user["password"])
+            user["password"] = await Authentication.generate_password_hash(user["password"])
 
         try:
             new_user = User(**user)
+            new_user.staff_no = build_staff_no_sql(dept.name, staff_no_seq.name)
             session.add(new_user)
-            await session.flush()
-
-            await user_controller.generate_staff_no(dept.name, new_user.uid, session)
 
             await session.commit()
 
@@ -249,7 +278,7 @@ class AuthController:
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
-            content=ServerRespModel[bool](data=True, message="User created!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="User created!"),
         )
 
     async def forgot_password(self, email_staff_no: str, session: AsyncSession):
@@ -258,11 +287,25 @@ class AuthController:
         if not user:
             raise NotFound("User doesn't exist.")
 
-        # TODO: send email with reset link
+        outbox_controller.enqueue(
+            session,
+            OutboxEventKind.NOTIFICATION,
+            {
+                "template": EmailTypes.PWD_RESET.template,
+                "email": user.email,
+                "first_name": user.first_name,
+                "base_url": context.get("base_url"),
+            },
+        )
+        outbox_controller.audit(session, "password_reset_requested", user.uid)
+
+        try:
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[bool](
-                data=True, message="Password reset initiated. Please check your email."
-            ).model_dump(),
+            content=ServerRespModel[bool](data=True, message="Password reset initiated. Please check your email."),
         )
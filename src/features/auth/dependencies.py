@@ -1,48 +1,48 @@
-import logging
+import hashlib
+import time
 from typing import List, Optional, Union
 
 from fastapi import Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlmodel import select
 
-from src.db.main import AsyncSessionMaker
-from src.db.models.roles import Role
+from src.config import Config
 from src.db.redis import token_in_block_list
 from src.features.auth.authentication import Authentication
-from src.features.roles.controller import RoleController
-from src.features.roles.schemas import RoleStatus
+from src.features.roles.registry import role_registry
+from src.utils.cache import TTLCache
 from src.utils.exceptions import (
     AccessTokenRequired,
     InsufficientPermissions,
     InvalidToken,
     NotFound,
-    RefreshTokenExpired,
-    TokenExpired,
 )
 
 
 class TokenBearer(HTTPBearer):
+    claims_cache: TTLCache[dict] = TTLCache(
+        maxsize=Config.TOKEN_CLAIMS_CACHE_SIZE, ttl=Authentication.ACCESS_TOKEN_EXPIRY_IN_SECONDS
+    )
+
     def __init__(self, auto_error=True, is_not_protected: bool = False):
         self.is_not_protected = is_not_protected
         super().__init__(
             auto_error=auto_error,
         )
 
-    async def is_token_valid(self, token: str) -> bool:
-        try:
+    async def get_token_payload(self, token: str) -> dict:
+        """Verify a token once, reusing cached claims until the token expires."""
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        token_payload = self.claims_cache.get(cache_key)
+
+        if token_payload is None:
             token_payload = await Authentication.decode_token(token)
+            self.claims_cache.set(cache_key, token_payload, ttl=token_payload["exp"] - time.time())
 
-            if await token_in_block_list(token_payload["jti"]):
-                raise InvalidToken()
-        except RefreshTokenExpired as e:
-            logging.warning(f"RefreshTokenExpired caught in is_token_valid: {e}")
-            raise
-        except TokenExpired as e:
-            logging.warning(f"TokenExpired caught in is_token_valid: {e}")
-            raise
-        except Exception as e:
-            logging.warning(f"Other exception in is_token_valid: {type(e).__name__}: {e}")
-            return False
+        if await token_in_block_list(token_payload["jti"]):
+            self.claims_cache.pop(cache_key)
+            raise InvalidToken()
+
+        return token_payload
 
     async def __call__(self, request: Request) -> Optional[HTTPAuthorizationCredentials]:
         auth_header = request.headers.get("Authorization")
@@ -51,11 +51,7 @@ class TokenBearer(HTTPBearer):
             return None
 
         cred = await super().__call__(request)
-        token = cred.credentials
-
-        await self.is_token_valid(token)
-
-        token_payload = await Authentication.decode_token(token)
+        token_payload = await self.get_token_payload(cred.credentials)
         await self.verify_token_data(token_payload)
 
         return token_payload
@@ -86,15 +82,11 @@ class RoleBasedTokenBearer(AccessTokenBearer):
 
         self.check_role_status = check_role_status
 
-    async def get_active_roles_from_db(self, role_names: List[str]):
+    async def get_active_roles(self, role_names: List[str]):
         if not role_names or not self.check_role_status:
             return role_names
 
-        async with AsyncSessionMaker() as session:
-            statement = select(Role).where(Role.name.in_(role_names), Role.status == RoleStatus.ACTIVE.value)
-            active_roles = await session.exec(statement=statement)
-
-            return [role.name for role in active_roles]
+        return await role_registry.active_role_names(role_names)
 
     async def verify_token_data(self, token_payload):
         if token_payload and token_payload["refresh"]:
@@ -106,7 +98,7 @@ class RoleBasedTokenBearer(AccessTokenBearer):
         active_required_roles = self.required_roles
 
         if self.check_role_status:
-            valid_required_roles = await self.get_active_roles_from_db(self.required_roles)
+            valid_required_roles = await self.get_active_roles(self.required_roles)
             if not valid_required_roles:
                 raise NotFound(f"None of the required roles {self.required_roles} are active in the system")
 
@@ -116,14 +108,13 @@ class RoleBasedTokenBearer(AccessTokenBearer):
         if not role_uid:
             raise NotFound("Role not found.")
 
-        async with AsyncSessionMaker() as session:
-            role = await RoleController().get_role_by_uid(role_uid, session)
+        role = await role_registry.get_by_uid(role_uid)
 
-            if role is None:
-                raise NotFound("Role not found.")
+        if role is None:
+            raise NotFound("Role not found.")
 
-            if role.name not in active_required_roles:
-                raise InsufficientPermissions()
+        if role.name not in active_required_roles:
+            raise InsufficientPermissions()
 
 
 class AdminTokenBearer(RoleBasedTokenBearer):
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from src.config import Config
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+R = TypeVar("R")
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL while it works, so a handful of threads keeps password
+    checks off the event loop without a process pool's pickling overhead.
+    """
+
+    def __init__(self, rounds: int, max_workers: int):
+        self.context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.in_flight = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pwd-hash")
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submitted jobs still waiting for a free worker."""
+        return max(0, self.in_flight - self.max_workers)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "avg_wait_seconds": self.total_wait_seconds / self.completed if self.completed else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+    async def _run(self, fn: Callable[..., R], *args) -> R:
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+
+        def work() -> Tuple[float, R]:
+            return time.perf_counter(), fn(*args)
+
+        self.in_flight += 1
+        try:
+            started_at, result = await loop.run_in_executor(self.executor, work)
+        finally:
+            self.in_flight -= 1
+
+        wait = started_at - submitted_at
+        self.completed += 1
+        self.total_wait_seconds += wait
+        self.max_wait_seconds = max(self.max_wait_seconds, wait)
+
+        if wait > 1:
+            logger.warning(f"Password hashing waited {wait:.2f}s for a worker, queue depth {self.queue_depth}")
+
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hash: str) -> bool:
+        return await self._run(self.context.verify, password, hash)
+
+    async def verify_and_update(self, password: str, hash: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a fresh hash when the stored one uses stale settings."""
+        return await self._run(self.context.verify_and_update, password, hash)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(rounds=Config.BCRYPT_ROUNDS, max_workers=Config.PASSWORD_HASH_WORKERS)
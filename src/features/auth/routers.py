@@ -79,4 +79,4 @@ async def pwd_reset(data: ChangePwdModel = Body(...), session: AsyncSession = De
 
 @auth_router.post("/forgot-pwd", status_code=status.HTTP_200_OK, response_model=ServerRespModel[bool])
 async def forgot_password(email: str = Body(..., embed=True), session: AsyncSession = Depends(get_session)):
-    return await auth_controller.forgot_password(email=email, session=session)
+    return await auth_controller.forgot_password(email_staff_no=email, session=session)
@@ -1,15 +1,17 @@
 from datetime import datetime, timezone
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
+from sqlalchemy import Numeric, Uuid, column, values
 from sqlalchemy.orm import selectinload
 from sqlmodel import delete, func, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models.budgets import Budget
-from src.db.models.expenses import Expenses
+from src.db.models.budgets import BUDGET_EXPORT_COLUMNS, BUDGET_SEARCH_COLUMNS, Budget
+from src.db.models.expenses import EXPENSE_SEARCH_COLUMNS, Expenses
+from src.db.models.rollups import rollup_month
 from src.features.budgets.schemas import (
     BudgetAssignModel,
     BudgetStatus,
@@ -18,21 +20,20 @@ from src.features.budgets.schemas import (
     UpdateBudgetModel,
 )
 from src.features.config import SelectOfScalar
+from src.features.dashboard.admin.rollups import rollup_controller
 from src.features.expenses.schemas import SingleExpenseResponseModel
 from src.features.roles.controller import role_controller
-from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
-from src.utils import build_serial_no, get_current_and_total_pages
+from src.features.roles.registry import role_registry
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, PaginationModel, SearchSort, ServerRespModel
+from src.utils import get_current_and_total_pages
 from src.utils.exceptions import BadRequest, InsufficientPermissions, InvalidToken, NotFound
+from src.utils.pagination import count_rows, next_cursor, order_query, paginate_query
+from src.utils.responses import JSONResponse
+from src.utils.search import apply_search
+from src.utils.streaming import export_response
 
 
 class BudgetController:
-    async def generate_budget_serial_no(self, budget_uid: UUID, session: AsyncSession):
-        budget = await self.get_budget_by_uid(budget_uid, session)
-        serial_no = build_serial_no("Budget", budget.id)
-        statement = update(Budget).where(Budget.uid == budget_uid).values(serial_no=serial_no)
-
-        await session.exec(statement)
-
     async def get_budget_by_uid(self, budget_uid: UUID, session: AsyncSession):
         statement = (
             select(Budget)
@@ -55,6 +56,83 @@ class BudgetController:
 
         return result.first()
 
+    async def lock_budgets(self, budget_uids: Iterable[UUID], session: AsyncSession) -> Dict[UUID, Budget]:
+        """Row-lock budgets for the rest of the transaction, always in uid order.
+
+        Expense writers take these locks before checking remaining funds, so
+        concurrent expenses queue up instead of overspending, and a fixed lock
+        order keeps writers touching two budgets from deadlocking.
+        """
+        statement = (
+            select(Budget)
+            .where(Budget.uid.in_(set(budget_uids)))
+            .order_by(Budget.uid)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        result = await session.exec(statement)
+
+        return {budget.uid: budget for budget in result.all()}
+
+    async def apply_expense_deltas(self, deltas: Dict[UUID, Decimal], session: AsyncSession):
+        """Shift `amount_spent` for many budgets in a single UPDATE, inside the caller's transaction."""
+        deltas = {budget_uid: delta for budget_uid, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        expense_deltas = values(
+            column("budget_uid", Uuid), column("delta", Numeric(12, 2)), name="expense_deltas"
+        ).data(sorted(deltas.items()))
+
+        statement = (
+            update(Budget)
+            .where(Budget.uid == expense_deltas.c.budget_uid)
+            .values(amount_spent=Budget.amount_spent + expense_deltas.c.delta)
+            .returning(Budget.department_uid, Budget.created_at, expense_deltas.c.delta)
+            .execution_options(synchronize_session=False)
+        )
+        result = await session.exec(statement)
+
+        await rollup_controller.apply_deltas(
+            (
+                (department_uid, rollup_month(created_at), 0, delta)
+                for department_uid, created_at, delta in result.all()
+            ),
+            session,
+        )
+
+    async def reconcile_expense_totals(self, session: AsyncSession) -> int:
+        """Recompute `amount_spent` from the expenses table, returning how many budgets drifted.
+
+        Every budget is row-locked first, in the uid order expense writers use,
+        so no expense change can commit between reading a sum and storing it.
+        Department rollups are not touched here; `rebuild_budget_rollups_task`
+        repairs those on the same schedule.
+        """
+        amount_spent = (
+            select(func.coalesce(func.sum(Expenses.amount_spent), 0))
+            .where(Expenses.budget_uid == Budget.uid)
+            .correlate_except(Expenses)
+            .scalar_subquery()
+        )
+
+        statement = (
+            update(Budget)
+            .where(Budget.amount_spent != amount_spent)
+            .values(amount_spent=amount_spent)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            await session.exec(select(Budget.uid).order_by(Budget.uid).with_for_update())
+            result = await session.exec(statement)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        return result.rowcount
+
     async def single_budget(self, budget_uid: UUID, session: AsyncSession):
         budget = await self.get_budget_by_uid(budget_uid=budget_uid, session=session)
 
@@ -65,14 +143,12 @@ class BudgetController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[SingleBudgetResponseModel](
-                data=budget_response, message="Budget retrieved!"
-            ).model_dump(),
+            content=ServerRespModel[SingleBudgetResponseModel](data=budget_response, message="Budget retrieved!"),
         )
 
     async def create_budget(self, token_payload: dict, data: CreateBudgetModel, session: AsyncSession):
         budget = data.model_dump()
-        if await role_controller.is_role_admin(role_uid=token_payload["user"]["role_uid"], session=session):
+        if await role_controller.is_role_admin(role_uid=token_payload["user"]["role_uid"]):
             budget["status"] = BudgetStatus.APPROVED.value
             budget["approved_at"] = datetime.now(timezone.utc)
 
@@ -83,12 +159,15 @@ class BudgetController:
 
             session.add(new_budget)
             await session.flush()
-            await self.generate_budget_serial_no(new_budget.uid, session)
+            await rollup_controller.apply_deltas(
+                [(new_budget.department_uid, rollup_month(new_budget.created_at), new_budget.gross_amount, 0)],
+                session,
+            )
             await session.commit()
 
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
-                content=ServerRespModel[bool](data=True, message="Budget created!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget created!"),
             )
 
         except Exception as e:
@@ -98,7 +177,7 @@ class BudgetController:
     async def update_budget(
         self, budget_uid: UUID, token_payload: dict, data: UpdateBudgetModel, session: AsyncSession
     ):
-        budget_to_update = await self.get_budget_with_expenses(budget_uid, session)
+        budget_to_update = (await self.lock_budgets([budget_uid], session)).get(budget_uid)
 
         if budget_to_update is None:
             raise NotFound("Budget doesn't exist")
@@ -110,7 +189,7 @@ class BudgetController:
         if not valid_attrs:
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="No changes to update").model_dump(),
+                content=ServerRespModel[bool](data=True, message="No changes to update"),
             )
 
         financial_fields = {"gross_amount"}
@@ -122,12 +201,22 @@ class BudgetController:
             if new_gross_amount and new_gross_amount < budget_to_update.total_expenses:
                 raise BadRequest("New budget amount cannot be lower than existing expenses!")
 
+        month = rollup_month(budget_to_update.created_at)
+        rollup_deltas = [
+            (budget_to_update.department_uid, month, -budget_to_update.gross_amount, -budget_to_update.amount_spent)
+        ]
+
         for field, value in valid_attrs.items():
             setattr(budget_to_update, field, value)
 
+        rollup_deltas.append(
+            (budget_to_update.department_uid, month, budget_to_update.gross_amount, budget_to_update.amount_spent)
+        )
+
         try:
             statement = update(Budget).where(Budget.uid == budget_uid).values(**valid_attrs)
             await session.exec(statement=statement)
+            await rollup_controller.apply_deltas(rollup_deltas, session)
             await session.commit()
             await session.refresh(budget_to_update)
         except Exception as e:
@@ -136,27 +225,18 @@ class BudgetController:
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Budget updated successfully!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Budget updated successfully!"),
         )
 
-    async def get_budgets(
+    def filter_budgets(
         self,
-        limit: int,
         query: SelectOfScalar[Budget],
-        session: AsyncSession,
         budget_status: Optional[str],
         budget_availability: Optional[str],
         q: Optional[str] = None,
-        offset: Optional[int] = None,
+        sort: SearchSort = SearchSort.RECENT,
     ):
-
-        if q:
-            search_term = f"%{q}%"
-            query = query.where(
-                Budget.title.ilike(search_term)
-                | Budget.short_description.ilike(search_term)
-                | Budget.serial_no.ilike(search_term)
-            )
+        query, rank = apply_search(query, q, BUDGET_SEARCH_COLUMNS, sort)
 
         if budget_status:
             status_list = budget_status.split(",")
@@ -166,10 +246,61 @@ class BudgetController:
             availability_list = budget_availability.split(",")
             query = query.where(Budget.availability.in_(availability_list))
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await session.scalar(count_query)
+        return query, rank
+
+    async def user_budgets_query(self, token_payload: dict) -> SelectOfScalar[Budget]:
+        """The budgets the token's user may list; shared by the listing and the export."""
+        user_uid = token_payload["user"]["uid"]
+        role_uid = token_payload["user"]["role_uid"]
+        department_uid = token_payload["user"]["department_uid"]
+
+        if not user_uid or not role_uid:
+            raise InvalidToken()
+
+        query = select(Budget)
+
+        if not await role_controller.is_role_admin(role_uid=role_uid):
+            role = await role_registry.get_by_uid(role_uid)
+
+            if role and role.name == "subadmin":
+                query = query.where(Budget.department_uid == department_uid)
+            else:
+                query = query.where(Budget.user_uid == user_uid)
+
+        return query
+
+    async def export_user_budgets(
+        self,
+        token_payload: dict,
+        data_format: DataFormat,
+        budget_status: Optional[str],
+        budget_availability: Optional[str],
+        q: Optional[str] = None,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query = await self.user_budgets_query(token_payload)
+        query, rank = self.filter_budgets(query, budget_status, budget_availability, q, sort)
+
+        return export_response(order_query(query, Budget, rank), BUDGET_EXPORT_COLUMNS, data_format, "budgets")
+
+    async def get_budgets(
+        self,
+        limit: int,
+        query: SelectOfScalar[Budget],
+        session: AsyncSession,
+        budget_status: Optional[str],
+        budget_availability: Optional[str],
+        q: Optional[str] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = self.filter_budgets(query, budget_status, budget_availability, q, sort)
+
+        total = await count_rows(query, Budget, session, count_mode)
 
-        query = query.order_by(Budget.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Budget, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
         budgets = results.all()
@@ -185,6 +316,7 @@ class BudgetController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(budgets, limit, rank),
             }
         )
 
@@ -192,7 +324,7 @@ class BudgetController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SingleBudgetResponseModel]](
                 data=paginated_budget, message="Budgets retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def get_user_budget(
@@ -204,33 +336,24 @@ class BudgetController:
         budget_availability: Optional[str],
         q: Optional[str] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
-        user_uid = token_payload["user"]["uid"]
-        role_uid = token_payload["user"]["role_uid"]
-        department_uid = token_payload["user"]["department_uid"]
-
-        if not user_uid or not role_uid:
-            raise InvalidToken()
-
-        query = select(Budget).options(
+        query = (await self.user_budgets_query(token_payload)).options(
             selectinload(Budget.department),
             selectinload(Budget.user),
             selectinload(Budget.approver),
             selectinload(Budget.assignee),
         )
 
-        if not await role_controller.is_role_admin(role_uid=role_uid, session=session):
-            role = await role_controller.get_role_by_uid(role_uid=role_uid, session=session)
-
-            if role and role.name == "subadmin":
-                query = query.where(Budget.department_uid == department_uid)
-            else:
-                query = query.where(Budget.user_uid == user_uid)
-
         return await self.get_budgets(
             q=q,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count_mode=count_mode,
+            sort=sort,
             query=query,
             session=session,
             budget_availability=budget_availability,
@@ -246,6 +369,9 @@ class BudgetController:
         budget_availability: Optional[str],
         q: Optional[str] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
         user_uid = token_payload["user"]["uid"]
         role_uid = token_payload["user"]["role_uid"]
@@ -266,6 +392,9 @@ class BudgetController:
             q=q,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count_mode=count_mode,
+            sort=sort,
             query=query,
             session=session,
             budget_availability=budget_availability,
@@ -281,6 +410,9 @@ class BudgetController:
         expenses_category_uid: Optional[UUID],
         token_payload: dict,
         session: AsyncSession,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
         user_uid = token_payload["user"]["uid"]
         if not user_uid:
@@ -294,21 +426,14 @@ class BudgetController:
             .where(Expenses.budget_uid == budget_uid)
         )
 
-        if q:
-            query = query.where(
-                Expenses.title.ilike(f"%{q}")
-                | Expenses.serial_no.ilike(f"%{q}")
-                | Expenses.note.ilike(f"%{q}")
-                | Expenses.short_description.ilike(f"%{q}")
-            )
+        query, rank = apply_search(query, q, EXPENSE_SEARCH_COLUMNS, sort)
 
         if expenses_category_uid:
             query = query.where(Expenses.expenses_category_uid == expenses_category_uid)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await session.scalar(count_query)
+        total = await count_rows(query, Expenses, session, count_mode)
 
-        query = query.order_by(Expenses.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Expenses, limit=limit, offset=offset, cursor=cursor, rank=rank)
         results = await session.exec(query)
         budget_expenses = results.all()
         budget_expenses_response = [SingleExpenseResponseModel.model_validate(expense) for expense in budget_expenses]
@@ -324,6 +449,7 @@ class BudgetController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(budget_expenses, limit, rank),
             }
         )
 
@@ -331,7 +457,7 @@ class BudgetController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SingleExpenseResponseModel]](
                 data=paginated_invoice_payments, message="Budget Expenses retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def delete_budget(
@@ -349,13 +475,29 @@ class BudgetController:
         if not budget_exists.first():
             raise NotFound("Budget not found!")
 
-        statement = delete(Budget).where(Budget.user_uid == user_uid, Budget.uid == budget_uid)
-        await session.exec(statement)
-        await session.commit()
+        statement = (
+            delete(Budget)
+            .where(Budget.user_uid == user_uid, Budget.uid == budget_uid)
+            .returning(Budget.department_uid, Budget.created_at, Budget.gross_amount, Budget.amount_spent)
+        )
+
+        try:
+            result = await session.exec(statement)
+            await rollup_controller.apply_deltas(
+                (
+                    (department_uid, rollup_month(created_at), -gross_amount, -amount_spent)
+                    for department_uid, created_at, gross_amount, amount_spent in result.all()
+                ),
+                session,
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[bool](data=True, message="Budget deleted successfully!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Budget deleted successfully!"),
         )
 
     async def update_availability(self, budget_uid: UUID, availability: BudgetStatus, session: AsyncSession):
@@ -367,7 +509,7 @@ class BudgetController:
         if budget.availability == availability.value:
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget updated successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget updated successfully!"),
             )
 
         try:
@@ -377,7 +519,7 @@ class BudgetController:
 
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget updated successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget updated successfully!"),
             )
         except Exception:
             await session.rollback()
@@ -392,7 +534,7 @@ class BudgetController:
         if budget.status == budget_status.value:
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget updated successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget updated successfully!"),
             )
 
         try:
@@ -402,7 +544,7 @@ class BudgetController:
 
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget updated successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget updated successfully!"),
             )
         except Exception:
             await session.rollback()
@@ -427,7 +569,7 @@ class BudgetController:
         if budget.assignee_uid:
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget already assigned!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget already assigned!"),
             )
 
         try:
@@ -437,7 +579,7 @@ class BudgetController:
 
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget assigned successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget assigned successfully!"),
             )
         except Exception:
             await session.rollback()
@@ -456,7 +598,7 @@ class BudgetController:
         if not budget.assignee_uid:
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget already unassigned!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget already unassigned!"),
             )
 
         assignee_expenses = [expense for expense in budget.expenses if expense.user_uid == budget.assignee_uid]
@@ -470,7 +612,7 @@ class BudgetController:
 
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Budget unassigned successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Budget unassigned successfully!"),
             )
         except Exception:
             await session.rollback()
@@ -2,10 +2,12 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
-from src.db.main import get_session
+from src.db.instrumentation import query_budget
+from src.db.main import get_read_session, get_session
 from src.features.auth.dependencies import AccessTokenBearer, AllAdminsTokenBearer
 from src.features.budgets.controller import budget_controller
 from src.features.budgets.schemas import (
@@ -17,7 +19,7 @@ from src.features.budgets.schemas import (
     UpdateBudgetModel,
 )
 from src.features.expenses.schemas import SingleExpenseResponseModel
-from src.misc.schemas import PaginatedResponseModel, ServerRespModel
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, SearchSort, ServerRespModel
 
 budget_router = APIRouter()
 
@@ -36,6 +38,7 @@ async def create_budget(
     status_code=status.HTTP_200_OK,
     response_model=ServerRespModel[PaginatedResponseModel[SingleBudgetResponseModel]],
 )
+@query_budget(6)
 async def get_user_budgets(
     q: Optional[str] = Query(default=None),
     budget_status: Optional[str] = Query(default=None),
@@ -44,8 +47,11 @@ async def get_user_budgets(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await budget_controller.get_user_budget(
         q=q,
@@ -53,11 +59,33 @@ async def get_user_budgets(
         budget_status=budget_status,
         budget_availability=budget_availability,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         token_payload=token_payload,
         session=session,
     )
 
 
+@budget_router.get("/user_budgets/export", response_class=StreamingResponse)
+async def export_user_budgets(
+    format: DataFormat = Query(default=DataFormat.CSV),
+    q: Optional[str] = Query(default=None),
+    budget_status: Optional[str] = Query(default=None),
+    budget_availability: Optional[str] = Query(default=None),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
+    token_payload: dict = Depends(AccessTokenBearer()),
+):
+    return await budget_controller.export_user_budgets(
+        token_payload=token_payload,
+        data_format=format,
+        budget_status=budget_status,
+        budget_availability=budget_availability,
+        q=q,
+        sort=sort,
+    )
+
+
 @budget_router.get(
     "/user_assigned_budgets",
     status_code=status.HTTP_200_OK,
@@ -71,8 +99,11 @@ async def get_assigned_budgets(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await budget_controller.get_assigned_budget(
         q=q,
@@ -80,6 +111,9 @@ async def get_assigned_budgets(
         budget_status=budget_status,
         budget_availability=budget_availability,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         token_payload=token_payload,
         session=session,
     )
@@ -90,6 +124,7 @@ async def get_assigned_budgets(
     status_code=status.HTTP_200_OK,
     response_model=ServerRespModel[SingleBudgetResponseModel],
 )
+@query_budget(5)
 async def get_budget_by_uid(
     budget_uid: UUID,
     _: dict = Depends(AccessTokenBearer()),
@@ -131,15 +166,21 @@ async def get_budget_expenses(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     expenses_category_uid: Optional[UUID] = Query(default=None),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await budget_controller.get_budget_expenses(
         budget_uid=budget_uid,
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         expenses_category_uid=expenses_category_uid,
         token_payload=token_payload,
         session=session,
@@ -0,0 +1,244 @@
+import asyncio
+import json
+import time
+from datetime import date
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Set, TypeVar
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config
+from src.db.main import ReadSessionMaker
+from src.db.redis import redis_client
+from src.features.dashboard.admin.schema import PeriodicAnalyticsParams
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# KEYS: the entry, then n month generation keys, then the n matching month index keys.
+# ARGV: the entry, its expiry, then the generations read before the value was computed.
+STORE_IF_CURRENT_SCRIPT = """
+local n = (#KEYS - 1) / 2
+for i = 1, n do
+    if (redis.call("get", KEYS[1 + i]) or "0") ~= ARGV[2 + i] then
+        return 0
+    end
+end
+redis.call("set", KEYS[1], ARGV[1], "EX", ARGV[2])
+for i = 1, n do
+    redis.call("sadd", KEYS[1 + n + i], KEYS[1])
+    redis.call("expire", KEYS[1 + n + i], ARGV[2])
+end
+return 1
+"""
+
+# Generation counters outlive any computation that read them, so one that
+# expires and restarts from zero cannot be mistaken for the value read.
+GENERATION_TTL_SECONDS = 86400
+
+
+def months_between(start: date, end: date) -> List[date]:
+    months = []
+    month = start.replace(day=1)
+    while month <= end:
+        months.append(month)
+        month = month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+    return months
+
+
+class AnalyticsCache:
+    """Redis cache for dashboard analytics, keyed by the date range they cover.
+
+    Entries are served fresh for `ttl` seconds and then, for up to `stale_ttl`
+    more, served stale while one worker recomputes them in the background. A
+    miss is computed by whichever request takes the per-key lock; the others
+    wait for its result instead of all querying Postgres. Every entry is
+    indexed under the months it covers so a write only drops the ranges that
+    include its month. Invalidating a month also bumps its generation, and a
+    result is only stored if none of its months' generations moved while it
+    was being computed, so a pre-write result cannot outlive the write.
+    """
+
+    def __init__(self, ttl: int, stale_ttl: int, lock_timeout: int, prefix: str = "analytics"):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.prefix = prefix
+        self._background: Set[asyncio.Task] = set()
+
+    def key(self, name: str, params: PeriodicAnalyticsParams) -> str:
+        start_date, end_date = params.get_date_range()
+        return f"{self.prefix}:{name}:{start_date.isoformat()}:{end_date.isoformat()}"
+
+    def month_index_key(self, month: date) -> str:
+        return f"{self.prefix}:months:{month:%Y-%m}"
+
+    def generation_key(self, month: date) -> str:
+        return f"{self.prefix}:generation:{month:%Y-%m}"
+
+    async def get_or_compute(
+        self,
+        name: str,
+        params: PeriodicAnalyticsParams,
+        adapter: TypeAdapter[T],
+        compute: Callable[[AsyncSession], Awaitable[T]],
+        session: AsyncSession,
+    ) -> T:
+        client = redis_client.client
+        if client is None:
+            return await compute(session)
+
+        key = self.key(name, params)
+        try:
+            entry = await client.get(key)
+        except Exception as e:
+            logger.warning(f"Analytics cache read failed for {key}: {e}")
+            return await compute(session)
+
+        if entry is not None:
+            entry = json.loads(entry)
+            if entry["fresh_until"] < time.time():
+                self._refresh_in_background(key, params, adapter, compute)
+            return adapter.validate_python(entry["data"])
+
+        token = await self._acquire(key)
+        if token is None:
+            cached = await self._wait_for(key)
+            if cached is not None:
+                return adapter.validate_python(cached)
+            return await compute(session)
+
+        try:
+            generations = await self._generations(params)
+            value = await compute(session)
+            await self._store(key, params, adapter.dump_python(value, mode="json"), generations)
+            return value
+        finally:
+            await self._release(key, token)
+
+    async def invalidate(self, months: Iterable[date]):
+        client = redis_client.client
+        months = set(months)
+        if client is None or not months:
+            return
+
+        try:
+            async with client.pipeline(transaction=True) as pipe:
+                for month in sorted(months):
+                    pipe.incr(self.generation_key(month))
+                    pipe.expire(self.generation_key(month), GENERATION_TTL_SECONDS)
+                await pipe.execute()
+
+            index_keys = [self.month_index_key(month) for month in sorted(months)]
+            keys = set(await client.sunion(index_keys))
+            await client.delete(*keys, *index_keys)
+            logger.debug(f"Invalidated {len(keys)} cached analytics for {len(months)} months")
+        except Exception as e:
+            logger.error(f"Error invalidating analytics cache: {e}")
+
+    def run_in_background(self, coro: Awaitable[Any]):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _refresh_in_background(self, key, params, adapter, compute):
+        self.run_in_background(self._refresh(key, params, adapter, compute))
+
+    async def _refresh(self, key, params, adapter, compute):
+        token = await self._acquire(key)
+        if token is None:
+            return
+
+        try:
+            generations = await self._generations(params)
+            # The request's session is closed by the time this runs.
+            async with ReadSessionMaker() as session:
+                value = await compute(session)
+            await self._store(key, params, adapter.dump_python(value, mode="json"), generations)
+        except Exception as e:
+            logger.error(f"Error refreshing cached analytics {key}: {e}")
+        finally:
+            await self._release(key, token)
+
+    async def _generations(self, params: PeriodicAnalyticsParams) -> Optional[List[str]]:
+        """The current generation of every month `params` covers; read before computing, checked on store."""
+        try:
+            generations = await redis_client.client.mget(
+                [self.generation_key(month) for month in months_between(*params.get_date_range())]
+            )
+        except Exception as e:
+            logger.warning(f"Analytics cache generation read failed: {e}")
+            return None
+
+        return [generation or "0" for generation in generations]
+
+    async def _store(self, key: str, params: PeriodicAnalyticsParams, data: Any, generations: Optional[List[str]]):
+        if generations is None:
+            return
+
+        months = months_between(*params.get_date_range())
+        entry = json.dumps({"data": data, "fresh_until": time.time() + self.ttl})
+        keys = [
+            key,
+            *(self.generation_key(month) for month in months),
+            *(self.month_index_key(month) for month in months),
+        ]
+
+        try:
+            stored = await redis_client.client.eval(
+                STORE_IF_CURRENT_SCRIPT, len(keys), *keys, entry, self.ttl + self.stale_ttl, *generations
+            )
+            if not stored:
+                logger.debug(f"Skipped caching {key}: its months were invalidated while it was computed")
+        except Exception as e:
+            logger.warning(f"Analytics cache write failed for {key}: {e}")
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        token = uuid4().hex
+        try:
+            acquired = await redis_client.client.set(f"{key}:lock", token, nx=True, ex=self.lock_timeout)
+        except Exception as e:
+            logger.warning(f"Analytics cache lock failed for {key}: {e}")
+            return None
+
+        return token if acquired else None
+
+    async def _release(self, key: str, token: str):
+        try:
+            await redis_client.client.eval(RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+        except Exception as e:
+            logger.warning(f"Analytics cache unlock failed for {key}: {e}")
+
+    async def _wait_for(self, key: str, interval: float = 0.05) -> Optional[Any]:
+        """Poll for the lock holder's result, giving up after the lock timeout."""
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            try:
+                entry = await redis_client.client.get(key)
+                if entry is not None:
+                    return json.loads(entry)["data"]
+                if not await redis_client.client.exists(f"{key}:lock"):
+                    return None
+            except Exception:
+                return None
+
+        return None
+
+
+analytics_cache = AnalyticsCache(
+    ttl=Config.ANALYTICS_CACHE_TTL_SECONDS,
+    stale_ttl=Config.ANALYTICS_CACHE_STALE_SECONDS,
+    lock_timeout=Config.ANALYTICS_CACHE_LOCK_SECONDS,
+)
@@ -1,37 +1,79 @@
+from datetime import datetime, time, timedelta, timezone
 from typing import List
 
-from sqlalchemy import func, select
+from pydantic import TypeAdapter
+from sqlalchemy import Date, cast, func, null, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models.budgets import Budget
 from src.db.models.departments import Department
-from src.db.models.expenses import Expenses
-from src.features.dashboard.admin.schema import BudgetUtilizationModel, PeriodicAnalyticsParams
+from src.db.models.invoices import Invoice
+from src.db.models.payments import Payment
+from src.db.models.rollups import DepartmentBudgetRollup
+from src.db.models.services import Service
+from src.features.dashboard.admin.cache import analytics_cache
+from src.features.dashboard.admin.schema import (
+    BudgetUtilizationModel,
+    IncomeAnalyticsParams,
+    IncomeDimension,
+    IncomeModel,
+    PeriodicAnalyticsParams,
+)
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+BUDGET_UTILIZATION_ADAPTER = TypeAdapter(List[BudgetUtilizationModel])
+INCOME_ADAPTER = TypeAdapter(List[IncomeModel])
+
+# dimension -> (uid column, label column, outer joins needed from payments)
+INCOME_DIMENSIONS = {
+    IncomeDimension.DEPARTMENT: (
+        Invoice.department_uid,
+        Department.name,
+        [(Invoice, Invoice.uid == Payment.invoice_uid), (Department, Department.uid == Invoice.department_uid)],
+    ),
+    IncomeDimension.SERVICE: (
+        Invoice.service_uid,
+        Service.name,
+        [(Invoice, Invoice.uid == Payment.invoice_uid), (Service, Service.uid == Invoice.service_uid)],
+    ),
+    IncomeDimension.INVOICE_TYPE: (None, Invoice.invoice_type, [(Invoice, Invoice.uid == Payment.invoice_uid)]),
+    IncomeDimension.PAYMENT_METHOD: (None, Payment.payment_method, []),
+}
+
+
 class AdminController:
     async def budget_utilization_by_department(
         self, params: PeriodicAnalyticsParams, session: AsyncSession
     ) -> List[BudgetUtilizationModel]:
-        """Calculate budget utilization per department within date range"""
+        return await analytics_cache.get_or_compute(
+            "budget_utilization",
+            params,
+            BUDGET_UTILIZATION_ADAPTER,
+            lambda session: self.compute_budget_utilization(params, session),
+            session,
+        )
+
+    async def compute_budget_utilization(
+        self, params: PeriodicAnalyticsParams, session: AsyncSession
+    ) -> List[BudgetUtilizationModel]:
+        """Calculate budget utilization per department within date range, from the monthly rollups"""
         try:
             start_date, end_date = params.get_date_range()
-            logger.info(f"Calculating budget utilization from {start_date} to {end_date}")
+            logger.debug(f"Calculating budget utilization from {start_date} to {end_date}")
 
             statement = (
                 select(
                     Department.name.label("department_name"),
-                    Budget.department_uid,
-                    func.sum(Budget.gross_amount).label("total_budget"),
-                    func.coalesce(func.sum(Expenses.amount_spent), 0).label("total_expenses"),
+                    DepartmentBudgetRollup.department_uid,
+                    func.sum(DepartmentBudgetRollup.budget_total).label("total_budget"),
+                    func.sum(DepartmentBudgetRollup.expense_total).label("total_expenses"),
                 )
-                .join(Department, Department.uid == Budget.department_uid)
-                .outerjoin(Expenses, Budget.uid == Expenses.budget_uid)
-                .where(Budget.created_at >= start_date, Budget.created_at <= end_date)
-                .group_by(Department.name, Budget.department_uid)
+                .join(Department, Department.uid == DepartmentBudgetRollup.department_uid)
+                .where(DepartmentBudgetRollup.month >= start_date, DepartmentBudgetRollup.month <= end_date)
+                .group_by(Department.name, DepartmentBudgetRollup.department_uid)
+                .having(func.sum(DepartmentBudgetRollup.budget_total) > 0)
                 .order_by(Department.name)
             )
 
@@ -54,12 +96,60 @@ class AdminController:
                 )
                 utilization_data.append(utilization)
 
-            logger.info(f"Successfully calculated utilization for {len(utilization_data)} departments")
+            logger.debug(f"Successfully calculated utilization for {len(utilization_data)} departments")
             return utilization_data
 
         except Exception as e:
             logger.error(f"Error calculating budget utilization: {e}")
             raise
 
+    async def income(self, params: IncomeAnalyticsParams, session: AsyncSession) -> List[IncomeModel]:
+        return await analytics_cache.get_or_compute(
+            f"income:{params.group_by}:{params.bucket}",
+            params,
+            INCOME_ADAPTER,
+            lambda session: self.compute_income(params, session),
+            session,
+        )
+
+    async def compute_income(self, params: IncomeAnalyticsParams, session: AsyncSession) -> List[IncomeModel]:
+        """Payments received per time bucket and breakdown dimension, aggregated in one grouped query"""
+        try:
+            start_date, end_date = params.get_date_range()
+            logger.debug(f"Calculating income by {params.group_by} per {params.bucket} from {start_date} to {end_date}")
+
+            bucket = cast(func.date_trunc(params.bucket.value, func.timezone("UTC", Payment.created_at)), Date)
+            dimension_uid, dimension, joins = INCOME_DIMENSIONS[params.group_by]
+
+            statement = select(
+                bucket.label("bucket"),
+                (dimension_uid if dimension_uid is not None else null()).label("dimension_uid"),
+                func.coalesce(dimension, "Unassigned").label("dimension"),
+                func.sum(Payment.amount_received).label("total_received"),
+                func.count().label("payment_count"),
+            ).select_from(Payment)
+
+            for target, onclause in joins:
+                statement = statement.outerjoin(target, onclause)
+
+            statement = (
+                statement.where(
+                    Payment.created_at >= datetime.combine(start_date, time.min, tzinfo=timezone.utc),
+                    Payment.created_at < datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc),
+                )
+                .group_by(*(column for column in (bucket, dimension_uid, dimension) if column is not None))
+                .order_by(bucket, dimension)
+            )
+
+            result = await session.exec(statement=statement)
+            income_data = [IncomeModel.model_validate(row) for row in result]
+
+            logger.debug(f"Successfully calculated {len(income_data)} income buckets")
+            return income_data
+
+        except Exception as e:
+            logger.error(f"Error calculating income: {e}")
+            raise
+
 
 admin_controller = AdminController()
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, cast, delete, func, literal, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.models.budgets import Budget
+from src.db.models.expenses import Expenses
+from src.db.models.rollups import DepartmentBudgetRollup
+from src.features.outbox.controller import outbox_controller
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (department_uid, month, budget_delta, expense_delta)
+RollupDelta = Tuple[UUID, date, Decimal, Decimal]
+
+
+def budget_month_sql(created_at):
+    return cast(func.date_trunc("month", func.timezone("UTC", created_at)), Date)
+
+
+class BudgetRollupController:
+    async def apply_deltas(self, deltas: Iterable[RollupDelta], session: AsyncSession):
+        """Add budget/expense deltas to the monthly rollups, inside the caller's transaction.
+
+        Deltas for the same department and month are summed first, and rows are
+        upserted in key order so concurrent writers lock them in the same order.
+        """
+        totals: Dict[Tuple[UUID, date], list] = defaultdict(lambda: [Decimal("0.0"), Decimal("0.0")])
+        for department_uid, month, budget_delta, expense_delta in deltas:
+            totals[(department_uid, month)][0] += Decimal(budget_delta or 0)
+            totals[(department_uid, month)][1] += Decimal(expense_delta or 0)
+
+        rows = [
+            {"department_uid": department_uid, "month": month, "budget_total": budget, "expense_total": expense}
+            for (department_uid, month), (budget, expense) in sorted(totals.items())
+            if budget or expense
+        ]
+        if not rows:
+            return
+
+        outbox_controller.invalidate_analytics(session, (row["month"] for row in rows))
+
+        statement = insert(DepartmentBudgetRollup).values(rows)
+        statement = statement.on_conflict_do_update(
+            constraint="uq_department_budget_rollups_department_month",
+            set_={
+                "budget_total": DepartmentBudgetRollup.budget_total + statement.excluded.budget_total,
+                "expense_total": DepartmentBudgetRollup.expense_total + statement.excluded.expense_total,
+                "updated_at": func.now(),
+            },
+        )
+        await session.exec(statement)
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """Recompute every rollup from the budgets and expenses tables, returning the row count.
+
+        Budget and expense amounts are stacked rather than joined, so a budget's
+        gross amount is counted once no matter how many expenses it has.
+        """
+        budget_month = budget_month_sql(Budget.created_at)
+
+        budget_totals = select(
+            Budget.department_uid.label("department_uid"),
+            budget_month.label("month"),
+            Budget.gross_amount.label("budget_total"),
+            literal(0).label("expense_total"),
+        )
+        expense_totals = select(Budget.department_uid, budget_month, literal(0), Expenses.amount_spent).join(
+            Budget, Budget.uid == Expenses.budget_uid
+        )
+        amounts = union_all(budget_totals, expense_totals).subquery("amounts")
+
+        totals = select(
+            amounts.c.department_uid,
+            amounts.c.month,
+            func.coalesce(func.sum(amounts.c.budget_total), 0),
+            func.coalesce(func.sum(amounts.c.expense_total), 0),
+        ).group_by(amounts.c.department_uid, amounts.c.month)
+
+        statement = insert(DepartmentBudgetRollup).from_select(
+            ["department_uid", "month", "budget_total", "expense_total"], totals
+        )
+
+        try:
+            # Writers upsert rollups while holding their budget/expense changes, so
+            # blocking them for the rebuild means no delta is lost or counted twice.
+            await session.execute(text(f"LOCK TABLE {DepartmentBudgetRollup.__tablename__} IN EXCLUSIVE MODE"))
+            await session.exec(delete(DepartmentBudgetRollup))
+            result = await session.exec(statement)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        logger.info(f"Rebuilt {result.rowcount} department budget rollups")
+
+        return result.rowcount
+
+
+rollup_controller = BudgetRollupController()
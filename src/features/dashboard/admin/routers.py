@@ -3,22 +3,27 @@ from typing import List
 from fastapi import APIRouter, Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.main import get_session
+from src.db.main import get_read_session
 from src.features.auth.dependencies import RoleBasedTokenBearer
-from src.features.dashboard.admin.schema import BudgetUtilizationModel, PeriodicAnalyticsParams
+from src.features.dashboard.admin.schema import (
+    BudgetUtilizationModel,
+    IncomeAnalyticsParams,
+    IncomeModel,
+    PeriodicAnalyticsParams,
+)
 from src.misc.schemas import ServerRespModel
+from src.utils.responses import JSONResponse
 
 from .controller import admin_controller
 
 admin_router = APIRouter()
 
 
-@admin_router.get("/income")
 @admin_router.get("/budget_utilization_by_department", response_model=ServerRespModel[List[BudgetUtilizationModel]])
 async def get_budget_utilization(
     params: PeriodicAnalyticsParams = Depends(),
     _: dict = Depends(RoleBasedTokenBearer(["admin"])),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
     Get budget utilization by department.
@@ -29,4 +34,31 @@ async def get_budget_utilization(
     - end_year: End year
     """
     result = await admin_controller.budget_utilization_by_department(params, session)
-    return ServerRespModel(data=result, message="Budget utilization retrieved successfully")
+    # Returned as a response so the already-validated model isn't validated again against response_model.
+    return JSONResponse(
+        content=ServerRespModel[List[BudgetUtilizationModel]](
+            data=result, message="Budget utilization retrieved successfully"
+        )
+    )
+
+
+@admin_router.get("/income", response_model=ServerRespModel[List[IncomeModel]])
+async def get_income(
+    params: IncomeAnalyticsParams = Depends(),
+    _: dict = Depends(RoleBasedTokenBearer(["admin"])),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Get payments received, bucketed by time and broken down by one dimension.
+
+    Query Parameters:
+    - month_range: Number of months to analyze (1, 3, 6, 12)
+    - end_month: End month (1-12)
+    - end_year: End year
+    - group_by: department, service, invoice_type or payment_method
+    - bucket: day, week or month
+    """
+    result = await admin_controller.income(params, session)
+    return JSONResponse(
+        content=ServerRespModel[List[IncomeModel]](data=result, message="Income retrieved successfully")
+    )
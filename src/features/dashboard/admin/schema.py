@@ -1,6 +1,6 @@
 from calendar import monthrange
 from datetime import date
-from enum import Enum
+from enum import Enum, StrEnum
 from typing import Optional
 from uuid import UUID
 
@@ -67,16 +67,33 @@ class BudgetUtilizationModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class IncomeModel(BaseModel):
-    department_name: str
-    department_uid: UUID
-    total_budget: float
-    total_expenses: float
-    utilization_percentage: float
-    remaining_budget: float
+class IncomeDimension(StrEnum):
+    DEPARTMENT = "department"
+    SERVICE = "service"
+    INVOICE_TYPE = "invoice_type"
+    PAYMENT_METHOD = "payment_method"
 
-    @field_serializer("department_uid")
-    def serialize_uuid(self, value: UUID) -> str:
-        return str(value)
+
+class TimeBucket(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class IncomeAnalyticsParams(PeriodicAnalyticsParams):
+    group_by: IncomeDimension = Field(default=IncomeDimension.DEPARTMENT, description="Breakdown of the revenue")
+    bucket: TimeBucket = Field(default=TimeBucket.MONTH, description="Width of each time bucket")
+
+
+class IncomeModel(BaseModel):
+    bucket: date
+    dimension_uid: Optional[UUID] = None
+    dimension: str
+    total_received: float
+    payment_count: int
+
+    @field_serializer("dimension_uid")
+    def serialize_uuid(self, value: Optional[UUID]) -> Optional[str]:
+        return str(value) if value else None
 
     model_config = ConfigDict(from_attributes=True)
@@ -3,7 +3,6 @@ from typing import List
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -11,6 +10,7 @@ from src.db.models.departments import Department
 from src.features.departments.schemas import CreateDept, DepartmentStatus, DeptResponseModel, UpdateDept
 from src.misc.schemas import ServerRespModel
 from src.utils.exceptions import NotFound, ResourceExists
+from src.utils.responses import JSONResponse
 
 
 class DeptController:
@@ -53,7 +53,7 @@ class DeptController:
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
-            content=ServerRespModel[bool](data=True, message="Dept. created!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Dept. created!"),
         )
 
     async def update_dept(self, dept_uid: UUID, data: UpdateDept, session: AsyncSession):
@@ -73,7 +73,7 @@ class DeptController:
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Department updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Department updated!"),
         )
 
     async def get_all_depts(self, session: AsyncSession):
@@ -87,7 +87,7 @@ class DeptController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[List[DeptResponseModel]](
                 data=role_responses, message="Depts. retrieved successfully!"
-            ).model_dump(),
+            ),
         )
 
     async def single_dept(self, dept_uid: UUID, session: AsyncSession):
@@ -99,9 +99,7 @@ class DeptController:
         role_response = DeptResponseModel.model_validate(role)
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[DeptResponseModel](
-                data=role_response, message="Depts. retrieved successfully!"
-            ).model_dump(),
+            content=ServerRespModel[DeptResponseModel](data=role_response, message="Depts. retrieved successfully!"),
         )
 
 
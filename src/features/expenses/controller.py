@@ -1,32 +1,29 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import selectinload
-from sqlmodel import and_, delete, func, or_, select, update
+from sqlmodel import and_, delete, or_, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.db.models.budgets import Budget
-from src.db.models.expenses import Expenses
+from src.db.models.expenses import EXPENSE_EXPORT_COLUMNS, EXPENSE_SEARCH_COLUMNS, Expenses
 from src.features.budgets.controller import budget_controller
 from src.features.expenses.schemas import CreateExpensesModel, EditExpenseModel, SingleExpenseResponseModel
 from src.features.expenses_category.controller import category_controller
 from src.features.roles.controller import role_controller
-from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
-from src.utils import build_serial_no, get_current_and_total_pages
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, PaginationModel, SearchSort, ServerRespModel
+from src.utils import get_current_and_total_pages
 from src.utils.exceptions import BadRequest, InsufficientPermissions, InvalidToken, NotFound
+from src.utils.pagination import count_rows, next_cursor, order_query, paginate_query
+from src.utils.responses import JSONResponse
+from src.utils.search import apply_search
+from src.utils.streaming import export_response
 
 
 class ExpensesController:
-    async def generate_exp_serial_no(self, exp_uid: UUID, session: AsyncSession):
-        exp = await self.get_exp_by_uid(exp_uid, session)
-        serial_no = build_serial_no("Expenses", exp.id)
-        statement = update(Expenses).where(Expenses.uid == exp_uid).values(serial_no=serial_no)
-
-        await session.exec(statement)
-
     async def get_exp_by_uid(self, exp_uid: UUID, session: AsyncSession):
         statement = (
             select(Expenses)
@@ -42,6 +39,46 @@ class ExpensesController:
 
         return exp
 
+    def check_remaining_budget(self, budget: Budget, amount: Decimal):
+        if budget.amount_spent + amount > budget.gross_amount:
+            raise BadRequest("Expense exceeds the amount remaining on this budget!")
+
+    async def move_expense_amount(self, exp_uid: UUID, valid_attrs: dict, session: AsyncSession):
+        """Re-balance budget totals for an expense whose amount or budget is changing.
+
+        The expense row is locked first and then every budget involved, matching
+        the order used by create and delete so writers cannot deadlock.
+        """
+        current = (
+            await session.exec(
+                select(Expenses.budget_uid, Expenses.amount_spent).where(Expenses.uid == exp_uid).with_for_update()
+            )
+        ).first()
+
+        if current is None:
+            raise NotFound("Expense doesn't exist")
+
+        # Legacy expenses can have a NULL amount; they count as zero, as in the reconcile job's SUM.
+        current_amount = current.amount_spent or Decimal("0.0")
+        new_budget_uid = valid_attrs.get("budget_uid", current.budget_uid)
+        new_amount = Decimal(valid_attrs.get("amount_spent", current_amount))
+
+        budgets = await budget_controller.lock_budgets({current.budget_uid, new_budget_uid}, session)
+        new_budget = budgets.get(new_budget_uid)
+
+        if new_budget is None:
+            raise NotFound("Budget not found!")
+
+        if new_budget_uid != current.budget_uid and new_budget.availability != "AVAILABLE":
+            raise BadRequest("Budget is not available for expenses!")
+
+        already_counted = current_amount if new_budget_uid == current.budget_uid else Decimal("0.0")
+        self.check_remaining_budget(new_budget, new_amount - already_counted)
+
+        deltas = {current.budget_uid: -current_amount}
+        deltas[new_budget_uid] = deltas.get(new_budget_uid, Decimal("0.0")) + new_amount
+        await budget_controller.apply_expense_deltas(deltas, session)
+
     async def single_exp(self, exp_uid: UUID, session: AsyncSession):
         exp = await self.get_exp_by_uid(exp_uid=exp_uid, session=session)
 
@@ -52,23 +89,13 @@ class ExpensesController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[SingleExpenseResponseModel](
-                data=exp_response, message="Expense retrieved!"
-            ).model_dump(),
+            content=ServerRespModel[SingleExpenseResponseModel](data=exp_response, message="Expense retrieved!"),
         )
 
     async def create_exp(self, token_payload: dict, data: CreateExpensesModel, session: AsyncSession):
         exp = data.model_dump()
         user_uid = token_payload["user"]["uid"]
 
-        budget = await budget_controller.get_budget_by_uid(budget_uid=data.budget_uid, session=session)
-
-        if budget is None:
-            raise NotFound("Budget not found!")
-
-        if budget.availability != "AVAILABLE":
-            raise BadRequest("Budget is not available for expenses!")
-
         exp_cat = await category_controller.get_category_by_uid(
             category_uid=data.expenses_category_uid, session=session
         )
@@ -79,16 +106,25 @@ class ExpensesController:
         exp["user_uid"] = user_uid
 
         try:
+            budget = (await budget_controller.lock_budgets([data.budget_uid], session)).get(data.budget_uid)
+
+            if budget is None:
+                raise NotFound("Budget not found!")
+
+            if budget.availability != "AVAILABLE":
+                raise BadRequest("Budget is not available for expenses!")
+
+            self.check_remaining_budget(budget, data.amount_spent)
+
             new_exp = Expenses(**exp)
 
             session.add(new_exp)
-            await session.flush()
-            await self.generate_exp_serial_no(new_exp.uid, session)
+            await budget_controller.apply_expense_deltas({new_exp.budget_uid: new_exp.amount_spent}, session)
             await session.commit()
 
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
-                content=ServerRespModel[bool](data=True, message="Expense created!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Expense created!"),
             )
 
         except Exception as e:
@@ -107,69 +143,89 @@ class ExpensesController:
         valid_attrs = data.model_dump(exclude_none=True)
         if valid_attrs:
             valid_attrs["updated_at"] = datetime.now()
-            statement = update(Expenses).where(Expenses.uid == exp_uid).values(**valid_attrs)
-            await session.exec(statement=statement)
-            await session.commit()
+
+            try:
+                if "amount_spent" in valid_attrs or "budget_uid" in valid_attrs:
+                    await self.move_expense_amount(exp_uid, valid_attrs, session)
+
+                statement = update(Expenses).where(Expenses.uid == exp_uid).values(**valid_attrs)
+                await session.exec(statement=statement)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise e
+
             await session.refresh(exp_to_update)
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Expense updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Expense updated!"),
         )
 
-    async def get_expenses(
+    async def user_expenses_query(
         self,
-        limit: int,
         token_payload: dict,
-        session: AsyncSession,
-        offset: int,
         budget_uid: Optional[UUID] = None,
         q: Optional[str] = None,
+        sort: SearchSort = SearchSort.RECENT,
     ):
+        """The expenses the token's user may list, filtered; shared by the listing and the export."""
         user_uid = token_payload["user"]["uid"]
         role_uid = token_payload["user"]["role_uid"]
 
         if not user_uid:
             raise InvalidToken()
 
-        if await role_controller.is_role_admin(role_uid=role_uid, session=session):
-            query = select(Expenses).options(
-                selectinload(Expenses.budget),
-                selectinload(Expenses.expenses_category),
-                selectinload(Expenses.user),
-            )
-        else:
-            query = (
-                select(Expenses)
-                .join(
-                    Budget,
-                    and_(
-                        Expenses.budget_uid == Budget.uid,
-                        or_(Budget.user_uid == user_uid, Budget.assignee_uid == user_uid),
-                    ),
-                )
-                .options(
-                    selectinload(Expenses.budget),
-                    selectinload(Expenses.expenses_category),
-                    selectinload(Expenses.user),
-                )
+        query = select(Expenses)
+
+        if not await role_controller.is_role_admin(role_uid=role_uid):
+            query = query.join(
+                Budget,
+                and_(
+                    Expenses.budget_uid == Budget.uid,
+                    or_(Budget.user_uid == user_uid, Budget.assignee_uid == user_uid),
+                ),
             )
 
         if budget_uid:
             query = query.where(Expenses.budget_uid == budget_uid)
 
-        if q:
-            search_term = f"%{q}%"
-            query = query.where(
-                Expenses.title.ilike(search_term)
-                | Expenses.short_description.ilike(search_term)
-                | Expenses.serial_no.ilike(search_term)
-            )
+        return apply_search(query, q, EXPENSE_SEARCH_COLUMNS, sort)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await session.scalar(count_query)
+    async def export_expenses(
+        self,
+        token_payload: dict,
+        data_format: DataFormat,
+        budget_uid: Optional[UUID] = None,
+        q: Optional[str] = None,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = await self.user_expenses_query(token_payload, budget_uid, q, sort)
 
-        query = query.order_by(Expenses.created_at.desc()).offset(offset).limit(limit)
+        return export_response(order_query(query, Expenses, rank), EXPENSE_EXPORT_COLUMNS, data_format, "expenses")
+
+    async def get_expenses(
+        self,
+        limit: int,
+        token_payload: dict,
+        session: AsyncSession,
+        offset: int,
+        budget_uid: Optional[UUID] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = await self.user_expenses_query(token_payload, budget_uid, q, sort)
+        query = query.options(
+            selectinload(Expenses.budget),
+            selectinload(Expenses.expenses_category),
+            selectinload(Expenses.user),
+        )
+
+        total = await count_rows(query, Expenses, session, count_mode)
+
+        query = paginate_query(query, Expenses, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
         exps = results.all()
@@ -185,6 +241,7 @@ class ExpensesController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(exps, limit, rank),
             }
         )
 
@@ -192,7 +249,7 @@ class ExpensesController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SingleExpenseResponseModel]](
                 data=paginated_exp, message="Expenses retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def delete_exp(
@@ -209,7 +266,7 @@ class ExpensesController:
 
         statement = select(Expenses).options(selectinload(Expenses.budget)).where(Expenses.uid == exp_uid)
 
-        if not await role_controller.is_role_admin(role_uid=role_uid, session=session):
+        if not await role_controller.is_role_admin(role_uid=role_uid):
             statement = statement.where(Expenses.user_uid == user_uid)
 
         exp_result = await session.exec(statement=statement)
@@ -221,13 +278,27 @@ class ExpensesController:
         if exp_to_delete.budget and exp_to_delete.budget.availability != "AVAILABLE":
             raise BadRequest("Cannot delete expense. Associated budget is currently frozen!")
 
-        statement = delete(Expenses).where(Expenses.uid == exp_uid)
-        await session.exec(statement)
-        await session.commit()
+        statement = (
+            delete(Expenses).where(Expenses.uid == exp_uid).returning(Expenses.budget_uid, Expenses.amount_spent)
+        )
+
+        try:
+            result = await session.exec(statement)
+            deleted_exp = result.first()
+
+            if deleted_exp:
+                await budget_controller.apply_expense_deltas(
+                    {deleted_exp.budget_uid: -(deleted_exp.amount_spent or Decimal("0.0"))}, session
+                )
+
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[bool](data=True, message="Expense deleted successfully!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Expense deleted successfully!"),
         )
 
         raise InsufficientPermissions()
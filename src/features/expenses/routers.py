@@ -2,14 +2,16 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
-from src.db.main import get_session
+from src.db.instrumentation import query_budget
+from src.db.main import get_read_session, get_session
 from src.features.auth.dependencies import AccessTokenBearer
 from src.features.expenses.controller import expense_controller
 from src.features.expenses.schemas import CreateExpensesModel, EditExpenseModel, SingleExpenseResponseModel
-from src.misc.schemas import PaginatedResponseModel, ServerRespModel
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, SearchSort, ServerRespModel
 
 expense_router = APIRouter()
 
@@ -24,6 +26,7 @@ async def create_expense(
 
 
 @expense_router.get("", response_model=ServerRespModel[PaginatedResponseModel[SingleExpenseResponseModel]])
+@query_budget(5)
 async def get_expenses(
     q: Optional[str] = Query(default=None),
     budget_uid: Optional[UUID] = Query(default=None),
@@ -31,15 +34,40 @@ async def get_expenses(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await expense_controller.get_expenses(
-        q=q, budget_uid=budget_uid, limit=limit, offset=offset, token_payload=token_payload, session=session
+        q=q,
+        budget_uid=budget_uid,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
+        token_payload=token_payload,
+        session=session,
+    )
+
+
+@expense_router.get("/export", response_class=StreamingResponse)
+async def export_expenses(
+    format: DataFormat = Query(default=DataFormat.CSV),
+    q: Optional[str] = Query(default=None),
+    budget_uid: Optional[UUID] = Query(default=None),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
+    token_payload: dict = Depends(AccessTokenBearer()),
+):
+    return await expense_controller.export_expenses(
+        token_payload=token_payload, data_format=format, budget_uid=budget_uid, q=q, sort=sort
     )
 
 
 @expense_router.get("/{exp_uid}", response_model=ServerRespModel[SingleExpenseResponseModel])
+@query_budget(4)
 async def get_exp_by_uid(
     exp_uid: UUID,
     _: dict = Depends(AccessTokenBearer()),
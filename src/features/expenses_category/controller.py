@@ -3,7 +3,6 @@ from typing import List
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -16,6 +15,7 @@ from src.features.expenses_category.schemas import (
 )
 from src.misc.schemas import ServerRespModel
 from src.utils.exceptions import NotFound, ResourceExists
+from src.utils.responses import JSONResponse
 
 
 class ExpCategoryController:
@@ -57,7 +57,7 @@ class ExpCategoryController:
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
-            content=ServerRespModel[bool](data=True, message="Expenses Category created!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Expenses Category created!"),
         )
 
     async def update_category(self, category_uid: UUID, data: UpdateExpCategory, session: AsyncSession):
@@ -77,7 +77,7 @@ class ExpCategoryController:
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Expenses Category updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Expenses Category updated!"),
         )
 
     async def get_all_categories(self, session: AsyncSession):
@@ -93,7 +93,7 @@ class ExpCategoryController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[List[ExpCategoryResponseModel]](
                 data=exp_category_responses, message="Expenses Category retrieved successfully!"
-            ).model_dump(),
+            ),
         )
 
     async def single_category(self, category_uid: UUID, session: AsyncSession):
@@ -107,7 +107,7 @@ class ExpCategoryController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[ExpCategoryResponseModel](
                 data=service_response, message="Expenses Category retrieved successfully!"
-            ).model_dump(),
+            ),
         )
 
 
@@ -1,17 +1,34 @@
 from datetime import datetime
-from typing import Optional
-from uuid import UUID
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
 
 from fastapi import status
-from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+from sqlalchemy import Numeric, Uuid, column, text, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
-from sqlmodel import delete, func, select, update
+from sqlmodel import delete, func, or_, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models.invoices import Invoice
+from src.config import Config
+from src.db.models.departments import Department
+from src.db.models.invoices import (
+    INVOICE_EXPORT_COLUMNS,
+    INVOICE_SEARCH_COLUMNS,
+    Invoice,
+    derive_invoice_status,
+    invoice_amount_due,
+    invoice_amount_due_sql,
+    invoice_status_case,
+)
 from src.db.models.patients import Patient
-from src.db.models.payments import Payment
+from src.db.models.payments import PAYMENT_SEARCH_COLUMNS, Payment
+from src.db.models.services import Service
 from src.features.invoices.schemas import (
+    BatchCreateInvoiceModel,
+    BatchInvoiceResultModel,
+    BatchItemResultModel,
     CreateInvoiceModel,
     InvoiceStatus,
     SingleInvoiceResponseModel,
@@ -20,21 +37,18 @@ from src.features.invoices.schemas import (
 from src.features.patients.controller import PatientController
 from src.features.payments.schemas import PaymentMethod, SinglePaymentResponseModel
 from src.features.roles.controller import role_controller
-from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
-from src.utils import build_serial_no, get_current_and_total_pages
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, PaginationModel, SearchSort, ServerRespModel
+from src.utils import get_current_and_total_pages
 from src.utils.exceptions import BadRequest, InsufficientPermissions, InvalidToken, NotFound
+from src.utils.pagination import count_rows, next_cursor, order_query, paginate_query
+from src.utils.responses import JSONResponse
+from src.utils.search import apply_search, search_filter
+from src.utils.streaming import export_response
 
 patient_controller = PatientController()
 
 
 class InvoiceController:
-    async def generate_invoice_serial_no(self, invoice_uid: UUID, session: AsyncSession):
-        invoice = await self.get_invoice_by_uid(invoice_uid, session)
-        serial_no = build_serial_no("Invoice", invoice.id)
-        statement = update(Invoice).where(Invoice.uid == invoice_uid).values(serial_no=serial_no)
-
-        await session.exec(statement)
-
     async def get_invoice_by_uid(self, invoice_uid: UUID, session: AsyncSession):
         statement = (
             select(Invoice)
@@ -50,11 +64,65 @@ class InvoiceController:
 
         return result.first()
 
-    async def get_invoice_with_payments(self, invoice_uid: UUID, session: AsyncSession):
-        statement = select(Invoice).options(selectinload(Invoice.payments)).where(Invoice.uid == invoice_uid)
-        result = await session.exec(statement=statement)
+    async def apply_payment_deltas(self, deltas: Dict[UUID, Decimal], session: AsyncSession):
+        """Shift `amount_paid` and re-derive status for many invoices in a single UPDATE.
 
-        return result.first()
+        Runs inside the caller's transaction, so the invoice totals commit or roll
+        back together with the payment rows that produced the deltas.
+        """
+        deltas = {invoice_uid: delta for invoice_uid, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        payment_deltas = values(
+            column("invoice_uid", Uuid), column("delta", Numeric(12, 2)), name="payment_deltas"
+        ).data(sorted(deltas.items()))
+        amount_paid = Invoice.amount_paid + payment_deltas.c.delta
+        net_amount_due = invoice_amount_due_sql(amount_paid)
+
+        statement = (
+            update(Invoice)
+            .where(Invoice.uid == payment_deltas.c.invoice_uid)
+            .values(amount_paid=amount_paid, status=invoice_status_case(net_amount_due, amount_paid))
+            .execution_options(synchronize_session=False)
+        )
+        await session.exec(statement)
+
+    async def apply_payment_delta(self, invoice_uid: UUID, delta: Decimal, session: AsyncSession):
+        await self.apply_payment_deltas({invoice_uid: delta}, session)
+
+    async def reconcile_payment_totals(self, session: AsyncSession) -> int:
+        """Recompute `amount_paid` and status from the payments table, returning how many invoices drifted.
+
+        Payment writes are blocked for the duration, so a payment posted while
+        the sums are read cannot have its delta overwritten by a stale total.
+        """
+        amount_paid = (
+            select(func.coalesce(func.sum(Payment.amount_received), 0))
+            .where(Payment.invoice_uid == Invoice.uid)
+            .correlate_except(Payment)
+            .scalar_subquery()
+        )
+        net_amount_due = invoice_amount_due_sql(amount_paid)
+        invoice_status = invoice_status_case(net_amount_due, amount_paid)
+
+        statement = (
+            update(Invoice)
+            .where(or_(Invoice.amount_paid != amount_paid, Invoice.status != invoice_status))
+            .values(amount_paid=amount_paid, status=invoice_status)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            # Payment writers touch payments before invoices, so taking this lock first keeps the same order.
+            await session.execute(text(f"LOCK TABLE {Payment.__tablename__} IN SHARE MODE"))
+            result = await session.exec(statement)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        return result.rowcount
 
     async def single_invoice(self, invoice_uid: UUID, session: AsyncSession):
         invoice = await self.get_invoice_by_uid(invoice_uid=invoice_uid, session=session)
@@ -66,47 +134,70 @@ class InvoiceController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[SingleInvoiceResponseModel](
-                data=invoice_response, message="Invoice retrieved!"
-            ).model_dump(),
+            content=ServerRespModel[SingleInvoiceResponseModel](data=invoice_response, message="Invoice retrieved!"),
         )
 
-    async def get_user_invoice(
+    async def user_invoices_query(
         self,
-        limit: int,
         token_payload: dict,
-        session: AsyncSession,
         invoice_status: Optional[InvoiceStatus],
         q: Optional[str] = None,
-        offset: Optional[int] = None,
+        sort: SearchSort = SearchSort.RECENT,
     ):
+        """The invoices the token's user may list, filtered; shared by the listing and the export."""
         user_uid = token_payload["user"]["uid"]
         role_uid = token_payload["user"]["role_uid"]
 
         if not user_uid or not role_uid:
             raise InvalidToken()
 
-        query = select(Invoice).options(
-            selectinload(Invoice.user),
-            selectinload(Invoice.service),
-            selectinload(Invoice.department),
-            selectinload(Invoice.patient).selectinload(Patient.user),
-        )
+        query = select(Invoice)
 
-        if not await role_controller.is_role_admin(role_uid=role_uid, session=session):
+        if not await role_controller.is_role_admin(role_uid=role_uid):
             query = query.where(Invoice.user_uid == user_uid)
 
-        if q:
-            search_term = f"%{q}%"
-            query = query.where(Invoice.title.ilike(search_term) | Invoice.serial_no.ilike(search_term))
+        query, rank = apply_search(query, q, INVOICE_SEARCH_COLUMNS, sort)
 
         if invoice_status:
             query = query.where(Invoice.status == invoice_status)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await session.scalar(count_query)
+        return query, rank
+
+    async def export_invoices(
+        self,
+        token_payload: dict,
+        data_format: DataFormat,
+        invoice_status: Optional[InvoiceStatus],
+        q: Optional[str] = None,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = await self.user_invoices_query(token_payload, invoice_status, q, sort)
+
+        return export_response(order_query(query, Invoice, rank), INVOICE_EXPORT_COLUMNS, data_format, "invoices")
+
+    async def get_user_invoice(
+        self,
+        limit: int,
+        token_payload: dict,
+        session: AsyncSession,
+        invoice_status: Optional[InvoiceStatus],
+        q: Optional[str] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = await self.user_invoices_query(token_payload, invoice_status, q, sort)
+        query = query.options(
+            selectinload(Invoice.user),
+            selectinload(Invoice.service),
+            selectinload(Invoice.department),
+            selectinload(Invoice.patient).selectinload(Patient.user),
+        )
+
+        total = await count_rows(query, Invoice, session, count_mode)
 
-        query = query.order_by(Invoice.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Invoice, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
         invoices = results.all()
@@ -123,6 +214,7 @@ class InvoiceController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(invoices, limit, rank),
             }
         )
 
@@ -130,7 +222,7 @@ class InvoiceController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SingleInvoiceResponseModel]](
                 data=paginated_invoice, message="Invoice retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def create_invoice(self, token_payload: dict, data: CreateInvoiceModel, session: AsyncSession):
@@ -147,24 +239,116 @@ class InvoiceController:
                     raise NotFound("Patient doesn't exist!")
 
             new_invoice = Invoice(**invoice)
+            new_invoice.refresh_status()
             session.add(new_invoice)
 
-            await session.flush()
-            await self.generate_invoice_serial_no(new_invoice.uid, session)
             await session.commit()
 
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
-                content=ServerRespModel[bool](data=True, message="Invoice created!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Invoice created!"),
             )
         except Exception as e:
             await session.rollback()
             raise e
 
+    async def existing_uids(self, model: Any, uids: Set[UUID], session: AsyncSession) -> Set[UUID]:
+        """The subset of `uids` that exist in `model`'s table, looked up with a single IN query."""
+        if not uids:
+            return set()
+
+        result = await session.exec(select(model.uid).where(model.uid.in_(uids)))
+        return set(result.all())
+
+    async def create_invoices_batch(self, token_payload: dict, data: BatchCreateInvoiceModel, session: AsyncSession):
+        """Create many invoices at once, reporting a result per item instead of failing the whole batch.
+
+        References are checked with one IN query per referenced table and the
+        valid invoices go in through multi-row INSERT ... RETURNING statements,
+        with serial numbers assigned by the inserts themselves.
+        """
+        results: Dict[int, BatchItemResultModel] = {}
+        valid: List[Tuple[int, CreateInvoiceModel]] = []
+
+        for index, item in enumerate(data.invoices):
+            try:
+                valid.append((index, CreateInvoiceModel.model_validate(item)))
+            except ValidationError as e:
+                results[index] = BatchItemResultModel(index=index, error=str(e))
+
+        references = {
+            "patient_uid": (Patient, "Patient doesn't exist!"),
+            "service_uid": (Service, "Service doesn't exist!"),
+            "department_uid": (Department, "Department doesn't exist!"),
+        }
+        existing = {
+            field: await self.existing_uids(
+                model, {uid for _, item in valid if (uid := getattr(item, field)) is not None}, session
+            )
+            for field, (model, _) in references.items()
+        }
+
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        row_index: Dict[UUID, int] = {}
+        zero = Decimal("0.0")
+
+        for index, item in valid:
+            missing = [
+                message
+                for field, (_, message) in references.items()
+                if getattr(item, field) is not None and getattr(item, field) not in existing[field]
+            ]
+            if missing:
+                results[index] = BatchItemResultModel(index=index, error=" ".join(missing))
+                continue
+
+            row = item.model_dump()
+            row.update(uid=uuid4(), user_uid=token_payload["user"]["uid"], amount_paid=zero)
+            row["tax_percent"] = row["tax_percent"] or zero
+            row["discount_percent"] = row["discount_percent"] or zero
+            row["status"] = derive_invoice_status(
+                invoice_amount_due(row["gross_amount"], row["tax_percent"], row["discount_percent"], zero), zero
+            )
+
+            rows[row["uid"]] = row
+            row_index[row["uid"]] = index
+
+        try:
+            pending = list(rows.values())
+            for start in range(0, len(pending), Config.INVOICE_BATCH_INSERT_CHUNK):
+                end = start + Config.INVOICE_BATCH_INSERT_CHUNK
+                statement = insert(Invoice).values(pending[start:end]).returning(Invoice.uid, Invoice.serial_no)
+
+                for uid, serial_no in (await session.exec(statement)).all():
+                    results[row_index[uid]] = BatchItemResultModel(index=row_index[uid], uid=uid, serial_no=serial_no)
+
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        items = [results[index] for index in sorted(results)]
+        created = sum(1 for item in items if item.error is None)
+
+        return JSONResponse(
+            status_code=status.HTTP_201_CREATED if created == len(items) else status.HTTP_207_MULTI_STATUS,
+            content=ServerRespModel[BatchInvoiceResultModel](
+                data=BatchInvoiceResultModel(created=created, failed=len(items) - created, items=items),
+                message=f"{created} of {len(items)} invoices created",
+            ),
+        )
+
     async def update_invoice(
         self, invoice_uid: UUID, token_payload: dict, data: UpdateInvoiceModel, session: AsyncSession
     ):
-        invoice_to_update = await self.get_invoice_with_payments(invoice_uid, session)
+        # Locked so a payment cannot commit between the payments guard and the status written below.
+        statement = (
+            select(Invoice)
+            .where(Invoice.uid == invoice_uid)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        invoice_to_update = (await session.exec(statement)).first()
 
         if invoice_to_update is None:
             raise NotFound("Invoice doesn't exist")
@@ -172,20 +356,17 @@ class InvoiceController:
         if str(invoice_to_update.user_uid) != token_payload["user"]["uid"]:
             raise InsufficientPermissions("You don't have the permission to update this invoice!")
 
-        existing_payments = await session.exec(select(Payment).where(Payment.invoice_uid == invoice_uid))
-        payments = existing_payments.all()
-
         valid_attrs = data.model_dump(exclude_none=True)
         if not valid_attrs:
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="No changes to update").model_dump(),
+                content=ServerRespModel[bool](data=True, message="No changes to update"),
             )
 
         financial_fields = {"gross_amount", "tax_percent", "discount_percent"}
         valid_attrs["updated_at"] = datetime.now()
 
-        if payments and any(field in valid_attrs for field in financial_fields):
+        if invoice_to_update.amount_paid and any(field in valid_attrs for field in financial_fields):
             raise BadRequest("Cannot update financial details of an invoice with existing payments")
 
         if valid_attrs.get("patient_uid"):
@@ -204,12 +385,18 @@ class InvoiceController:
         for field, value in valid_attrs.items():
             setattr(invoice_to_update, field, value)
 
-        await session.commit()
-        await session.refresh(invoice_to_update)
+        invoice_to_update.refresh_status()
+
+        try:
+            await session.commit()
+            await session.refresh(invoice_to_update)
+        except Exception as e:
+            await session.rollback()
+            raise e
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Invoice updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Invoice updated!"),
         )
 
     async def get_invoice_payments(
@@ -222,6 +409,9 @@ class InvoiceController:
         payment_method: Optional[PaymentMethod] = None,
         reference_number: Optional[str] = None,
         q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
         user_uid = token_payload["user"]["uid"]
         if not user_uid:
@@ -233,20 +423,17 @@ class InvoiceController:
             .where(Payment.invoice_uid == invoice_uid)
         )
 
-        if q:
-            query = query.where(Payment.note.ilike(f"%{q}"))
+        query, rank = apply_search(query, q, PAYMENT_SEARCH_COLUMNS, sort)
 
         if payment_method:
             query = query.where(Payment.payment_method == payment_method)
 
         if reference_number:
-            query = query.where(Payment.reference_number.ilike(f"%{reference_number}%"))
-
-        count_query = select(func.count()).select_from(query.subquery())
+            query = query.where(search_filter(reference_number, Payment.reference_number))
 
-        total = await session.scalar(count_query)
+        total = await count_rows(query, Payment, session, count_mode)
 
-        query = query.order_by(Payment.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Payment, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
 
@@ -263,6 +450,7 @@ class InvoiceController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(invoice_payments, limit, rank),
             }
         )
 
@@ -270,7 +458,7 @@ class InvoiceController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SinglePaymentResponseModel]](
                 data=paginated_invoice_payments, message="Invoice Payments retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def delete_invoice(
@@ -296,7 +484,7 @@ class InvoiceController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[bool](data=True, message="Invoice deleted successfully!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Invoice deleted successfully!"),
         )
 
 
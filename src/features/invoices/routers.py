@@ -2,20 +2,24 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Body, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
-from src.db.main import get_session
+from src.db.instrumentation import query_budget
+from src.db.main import get_read_session, get_session
 from src.features.auth.dependencies import AccessTokenBearer
 from src.features.invoices.controller import invoice_controller
 from src.features.invoices.schemas import (
+    BatchCreateInvoiceModel,
+    BatchInvoiceResultModel,
     CreateInvoiceModel,
     InvoiceStatus,
     SingleInvoiceResponseModel,
     UpdateInvoiceModel,
 )
 from src.features.payments.schemas import PaymentMethod, SinglePaymentResponseModel
-from src.misc.schemas import PaginatedResponseModel, ServerRespModel
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, SearchSort, ServerRespModel
 
 invoice_router = APIRouter()
 
@@ -29,9 +33,19 @@ async def create_invoice(
     return await invoice_controller.create_invoice(token_payload=token_payload, data=data, session=session)
 
 
+@invoice_router.post("/batch", response_model=ServerRespModel[BatchInvoiceResultModel])
+async def create_invoices_batch(
+    data: BatchCreateInvoiceModel = Body(...),
+    token_payload: dict = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    return await invoice_controller.create_invoices_batch(token_payload=token_payload, data=data, session=session)
+
+
 @invoice_router.get(
     "", status_code=200, response_model=ServerRespModel[PaginatedResponseModel[SingleInvoiceResponseModel]]
 )
+@query_budget(7)
 async def get_invoices(
     invoice_status: InvoiceStatus = Query(default=None),
     q: Optional[str] = Query(default=None),
@@ -39,15 +53,40 @@ async def get_invoices(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await invoice_controller.get_user_invoice(
-        invoice_status=invoice_status, limit=limit, q=q, offset=offset, token_payload=token_payload, session=session
+        invoice_status=invoice_status,
+        limit=limit,
+        q=q,
+        offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
+        token_payload=token_payload,
+        session=session,
+    )
+
+
+@invoice_router.get("/export", response_class=StreamingResponse)
+async def export_invoices(
+    format: DataFormat = Query(default=DataFormat.CSV),
+    invoice_status: InvoiceStatus = Query(default=None),
+    q: Optional[str] = Query(default=None),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
+    token_payload: dict = Depends(AccessTokenBearer()),
+):
+    return await invoice_controller.export_invoices(
+        token_payload=token_payload, data_format=format, invoice_status=invoice_status, q=q, sort=sort
     )
 
 
 @invoice_router.get("/{invoice_uid}", response_model=ServerRespModel[SingleInvoiceResponseModel])
+@query_budget(5)
 async def get_single_invoice(
     invoice_uid: UUID,
     _: dict = Depends(AccessTokenBearer()),
@@ -68,14 +107,20 @@ async def get_invoice_payments(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await invoice_controller.get_invoice_payments(
         invoice_uid=invoice_uid,
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         payment_method=payment_method,
         reference_number=reference_number,
         token_payload=token_payload,
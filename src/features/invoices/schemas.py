@@ -1,11 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import StrEnum
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_serializer
 
+from src.config import Config
 from src.features.config import AbridgedUserResponseModel, DBModel
 from src.features.departments.schemas import DeptResponseModel
 from src.features.patients.schemas import PatientResponseModel
@@ -84,3 +85,25 @@ class SingleInvoiceResponseModel(InvoiceResponseModel):
     service: Optional[ServiceResponseModel] = None
     department: Optional[DeptResponseModel] = None
     patient: Optional[PatientResponseModel] = None
+
+
+class BatchCreateInvoiceModel(BaseModel):
+    # Items are validated one by one so a malformed item is reported instead of failing the batch.
+    invoices: List[Dict[str, Any]] = Field(min_length=1, max_length=Config.INVOICE_BATCH_MAX_SIZE)
+
+
+class BatchItemResultModel(BaseModel):
+    index: int
+    uid: Optional[UUID] = None
+    serial_no: Optional[str] = None
+    error: Optional[str] = None
+
+    @field_serializer("uid")
+    def serialize_uuid(self, value: Optional[UUID]) -> Optional[str]:
+        return str(value) if value else None
+
+
+class BatchInvoiceResultModel(BaseModel):
+    created: int
+    failed: int
+    items: List[BatchItemResultModel]
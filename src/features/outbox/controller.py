@@ -0,0 +1,152 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable
+from uuid import UUID
+
+from sqlmodel import delete, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config
+from src.db.models.outbox import OutboxEvent
+from src.features.dashboard.admin.cache import analytics_cache
+from src.features.outbox.schemas import OutboxEventKind, OutboxStatus
+from src.features.users.controller import user_controller
+from src.utils.logger import setup_logger
+from src.utils.mail import EMAIL_BUILDERS, Mailer
+
+logger = setup_logger(__name__)
+audit_logger = setup_logger("audit")
+
+OutboxHandler = Callable[[Dict[str, Any], AsyncSession], Awaitable[None]]
+
+
+class OutboxController:
+    """Records deferred side effects with the write that caused them and runs them afterwards.
+
+    Handlers must be idempotent: an event whose handler succeeded can still
+    be delivered again if the worker dies before marking it done.
+    """
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.handlers: Dict[str, OutboxHandler] = {
+            OutboxEventKind.LAST_LOGIN: self.handle_last_login,
+            OutboxEventKind.AUDIT: self.handle_audit,
+            OutboxEventKind.NOTIFICATION: self.handle_notification,
+            OutboxEventKind.ANALYTICS_INVALIDATION: self.handle_analytics_invalidation,
+        }
+
+    def enqueue(self, session: AsyncSession, kind: OutboxEventKind, payload: Dict[str, Any]) -> OutboxEvent:
+        """Add an event to the caller's transaction; it only becomes visible to the worker on commit."""
+        event = OutboxEvent(kind=kind.value, payload=payload)
+        session.add(event)
+
+        return event
+
+    def audit(self, session: AsyncSession, action: str, actor_uid: UUID, **details: Any) -> OutboxEvent:
+        return self.enqueue(
+            session,
+            OutboxEventKind.AUDIT,
+            {
+                "action": action,
+                "actor_uid": str(actor_uid),
+                "at": datetime.now(timezone.utc).isoformat(),
+                **details,
+            },
+        )
+
+    def invalidate_analytics(self, session: AsyncSession, months: Iterable[date]):
+        """Drop cached analytics covering `months` once the caller's transaction commits."""
+        months = sorted({month.isoformat() for month in months})
+        if months:
+            self.enqueue(session, OutboxEventKind.ANALYTICS_INVALIDATION, {"months": months})
+
+    async def handle_last_login(self, payload: Dict[str, Any], session: AsyncSession):
+        await user_controller.stamp_last_login(
+            UUID(payload["user_uid"]), datetime.fromisoformat(payload["logged_in_at"]), session
+        )
+
+    async def handle_audit(self, payload: Dict[str, Any], session: AsyncSession):
+        audit_logger.info(f"{payload['action']} by {payload['actor_uid']}: {payload}")
+
+    async def handle_notification(self, payload: Dict[str, Any], session: AsyncSession):
+        build = EMAIL_BUILDERS[payload["template"]]
+        context = {"first_name": payload["first_name"], "base_url": payload["base_url"]}
+        await Mailer.pool.send(build(payload["email"], context))
+
+    async def handle_analytics_invalidation(self, payload: Dict[str, Any], session: AsyncSession):
+        await analytics_cache.invalidate(date.fromisoformat(month) for month in payload["months"])
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(Config.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), 3600))
+
+    async def process_batch(self, session: AsyncSession) -> int:
+        """Claim up to `batch_size` due events, run them and record the outcome, returning how many were claimed.
+
+        `SKIP LOCKED` lets several workers drain the outbox side by side
+        without ever running the same event twice at once. Analytics
+        invalidations are claimed ahead of everything else, so a backlog of
+        slow handlers such as emails cannot keep stale analytics cached.
+        """
+        statement = (
+            select(OutboxEvent)
+            .where(OutboxEvent.status == OutboxStatus.PENDING.value, OutboxEvent.available_at <= func.now())
+            .order_by(
+                OutboxEvent.kind != OutboxEventKind.ANALYTICS_INVALIDATION.value,
+                OutboxEvent.available_at,
+                OutboxEvent.id,
+            )
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        try:
+            events = (await session.exec(statement)).all()
+
+            for event in events:
+                try:
+                    async with session.begin_nested():
+                        await self.handlers[event.kind](event.payload, session)
+                except Exception as e:
+                    self.record_failure(event, e)
+                else:
+                    event.status = OutboxStatus.DONE.value
+                    event.processed_at = datetime.now(timezone.utc)
+
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        return len(events)
+
+    def record_failure(self, event: OutboxEvent, error: Exception):
+        event.attempts += 1
+        event.last_error = str(error)
+
+        if event.attempts >= Config.OUTBOX_MAX_ATTEMPTS:
+            event.status = OutboxStatus.FAILED.value
+            logger.error(
+                f"Outbox event {event.uid} ({event.kind}) failed for good after {event.attempts} attempts: {error}"
+            )
+        else:
+            event.available_at = datetime.now(timezone.utc) + self.retry_delay(event.attempts)
+            logger.warning(f"Outbox event {event.uid} ({event.kind}) failed, attempt {event.attempts}: {error}")
+
+    async def prune(self, session: AsyncSession) -> int:
+        """Delete events that were handled more than `OUTBOX_RETENTION_DAYS` ago."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=Config.OUTBOX_RETENTION_DAYS)
+        statement = delete(OutboxEvent).where(
+            OutboxEvent.status == OutboxStatus.DONE.value, OutboxEvent.processed_at < cutoff
+        )
+
+        try:
+            result = await session.exec(statement)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        return result.rowcount
+
+
+outbox_controller = OutboxController(batch_size=Config.OUTBOX_BATCH_SIZE)
@@ -0,0 +1,14 @@
+from enum import StrEnum
+
+
+class OutboxEventKind(StrEnum):
+    LAST_LOGIN = "LAST_LOGIN"
+    AUDIT = "AUDIT"
+    NOTIFICATION = "NOTIFICATION"
+    ANALYTICS_INVALIDATION = "ANALYTICS_INVALIDATION"
+
+
+class OutboxStatus(StrEnum):
+    PENDING = "PENDING"
+    DONE = "DONE"
+    FAILED = "FAILED"
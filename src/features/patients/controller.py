@@ -3,13 +3,12 @@ from typing import Optional
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import selectinload
-from sqlmodel import delete, func, select, update
+from sqlmodel import delete, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models.invoices import Invoice
-from src.db.models.patients import Patient
+from src.db.models.invoices import INVOICE_SEARCH_COLUMNS, Invoice
+from src.db.models.patients import PATIENT_SEARCH_COLUMNS, Patient
 from src.features.invoices.schemas import InvoiceStatus, SingleInvoiceResponseModel
 from src.features.patients.schemas import (
     CreatePatientModel,
@@ -18,9 +17,12 @@ from src.features.patients.schemas import (
     SinglePatientResponseModel,
     UpdatePatientModel,
 )
-from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
+from src.misc.schemas import CountMode, PaginatedResponseModel, PaginationModel, SearchSort, ServerRespModel
 from src.utils import get_current_and_total_pages
 from src.utils.exceptions import InvalidToken, NotFound, ResourceExists
+from src.utils.pagination import count_rows, next_cursor, paginate_query
+from src.utils.responses import JSONResponse
+from src.utils.search import apply_search
 
 
 class PatientController:
@@ -46,7 +48,7 @@ class PatientController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[PatientResponseModel](data=exp_response, message="Patient retrieved!").model_dump(),
+            content=ServerRespModel[PatientResponseModel](data=exp_response, message="Patient retrieved!"),
         )
 
     async def get_patient(
@@ -57,6 +59,9 @@ class PatientController:
         offset: int,
         patient_type: Optional[PatientType] = None,
         q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
         user_uid = token_payload["user"]["uid"]
         if not user_uid:
@@ -67,19 +72,11 @@ class PatientController:
         if patient_type:
             query = query.where(Patient.patient_type == patient_type)
 
-        if q:
-            search_term = f"%{q}%"
-            query = query.where(
-                Patient.first_name.ilike(search_term)
-                | Patient.last_name.ilike(search_term)
-                | Patient.other_name.ilike(search_term)
-                | Patient.hospital_id.ilike(search_term)
-            )
+        query, rank = apply_search(query, q, PATIENT_SEARCH_COLUMNS, sort)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await session.scalar(count_query)
+        total = await count_rows(query, Patient, session, count_mode)
 
-        query = query.order_by(Patient.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Patient, limit=limit, offset=offset, cursor=cursor, rank=rank)
         results = await session.exec(query)
         patients = results.all()
         patients_response = [SinglePatientResponseModel.model_validate(patient) for patient in patients]
@@ -94,6 +91,7 @@ class PatientController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(patients, limit, rank),
             }
         )
 
@@ -101,7 +99,7 @@ class PatientController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SinglePatientResponseModel]](
                 data=paginated_patients, message="Patients retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def create_patient(self, token_payload: dict, data: CreatePatientModel, session: AsyncSession):
@@ -121,7 +119,7 @@ class PatientController:
 
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
-                content=ServerRespModel[bool](data=True, message="Patient created!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Patient created!"),
             )
         except Exception as e:
             await session.rollback()
@@ -136,6 +134,9 @@ class PatientController:
         session: AsyncSession,
         q: Optional[str] = None,
         offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
         user_uid = token_payload["user"]["uid"]
         role_uid = token_payload["user"]["role_uid"]
@@ -154,17 +155,14 @@ class PatientController:
             .where(Invoice.patient_uid == patient_uid)
         )
 
-        if q:
-            search_term = f"%{q}%"
-            query = query.where(Invoice.title.ilike(search_term) | Invoice.serial_no.ilike(search_term))
+        query, rank = apply_search(query, q, INVOICE_SEARCH_COLUMNS, sort)
 
         if invoice_status:
             query = query.where(Invoice.status == invoice_status)
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await session.scalar(count_query)
+        total = await count_rows(query, Invoice, session, count_mode)
 
-        query = query.order_by(Invoice.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Invoice, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
         invoices = results.all()
@@ -181,6 +179,7 @@ class PatientController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(invoices, limit, rank),
             }
         )
 
@@ -188,7 +187,7 @@ class PatientController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SingleInvoiceResponseModel]](
                 data=paginated_invoice, message="Patient invoices retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def update_patient(self, patient_uid: UUID, data: UpdatePatientModel, session: AsyncSession):
@@ -207,7 +206,7 @@ class PatientController:
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Patient updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Patient updated!"),
         )
 
     async def delete_patient(
@@ -231,7 +230,7 @@ class PatientController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[bool](data=True, message="Patient deleted successfully!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Patient deleted successfully!"),
         )
 
 
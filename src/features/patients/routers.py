@@ -5,7 +5,7 @@ from fastapi import APIRouter, Body, Depends, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
 from src.features.auth.dependencies import AccessTokenBearer
 from src.features.invoices.schemas import InvoiceStatus, SingleInvoiceResponseModel
 from src.features.patients.controller import patient_controller
@@ -16,7 +16,7 @@ from src.features.patients.schemas import (
     SinglePatientResponseModel,
     UpdatePatientModel,
 )
-from src.misc.schemas import PaginatedResponseModel, ServerRespModel
+from src.misc.schemas import CountMode, PaginatedResponseModel, SearchSort, ServerRespModel
 
 patients_router = APIRouter()
 
@@ -38,11 +38,22 @@ async def get_patient(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await patient_controller.get_patient(
-        q=q, patient_type=patient_type, limit=limit, token_payload=token_payload, session=session, offset=offset
+        q=q,
+        patient_type=patient_type,
+        limit=limit,
+        token_payload=token_payload,
+        session=session,
+        offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
     )
 
 
@@ -59,8 +70,11 @@ async def get_patient_invoices(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await patient_controller.get_patient_invoices(
         patient_uid=patient_uid,
@@ -68,6 +82,9 @@ async def get_patient_invoices(
         limit=limit,
         q=q,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         token_payload=token_payload,
         session=session,
     )
@@ -1,35 +1,37 @@
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import selectinload
-from sqlmodel import delete, func, select, update
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models.payments import Payment
+from src.config import Config
+from src.db.models.payments import PAYMENT_EXPORT_COLUMNS, PAYMENT_SEARCH_COLUMNS, Payment
+from src.db.models.rollups import rollup_month
 from src.features.invoices.controller import invoice_controller
+from src.features.outbox.controller import outbox_controller
+from src.features.payments.importer import PaymentImport
 from src.features.payments.schemas import (
     CreatePaymentModel,
+    PaymentImportReportModel,
     PaymentMethod,
     SinglePaymentResponseModel,
     UpdatePaymentModel,
 )
 from src.features.roles.controller import role_controller
-from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
-from src.utils import build_serial_no, get_current_and_total_pages
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, PaginationModel, SearchSort, ServerRespModel
+from src.utils import get_current_and_total_pages
 from src.utils.exceptions import InsufficientPermissions, InvalidToken, NotFound
+from src.utils.pagination import count_rows, next_cursor, order_query, paginate_query
+from src.utils.responses import JSONResponse
+from src.utils.search import apply_search, search_filter
+from src.utils.streaming import export_response, iter_records
 
 
 class PaymentController:
-    async def generate_payment_serial_no(self, payment_uid: UUID, session: AsyncSession):
-        payment = await self.get_payment_by_uid(payment_uid, session)
-        serial_no = build_serial_no("Payment", payment.id)
-        statement = update(Payment).where(Payment.uid == payment_uid).values(serial_no=serial_no)
-
-        await session.exec(statement)
-
     async def get_payment_by_uid(self, payment_uid: UUID, session: AsyncSession):
         statement = (
             select(Payment)
@@ -50,50 +52,80 @@ class PaymentController:
 
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[SinglePaymentResponseModel](
-                data=payment_response, message="Payment retrieved!"
-            ).model_dump(),
+            content=ServerRespModel[SinglePaymentResponseModel](data=payment_response, message="Payment retrieved!"),
         )
 
-    async def get_payments(
+    async def user_payments_query(
         self,
-        limit: int,
         token_payload: dict,
-        session: AsyncSession,
-        offset: int,
         serial_no: Optional[str],
         payment_method: Optional[PaymentMethod] = None,
         reference_number: Optional[str] = None,
         q: Optional[str] = None,
+        sort: SearchSort = SearchSort.RECENT,
     ):
+        """The payments the token's user may list, filtered; shared by the listing and the export."""
         user_uid = token_payload["user"]["uid"]
         role_uid = token_payload["user"]["role_uid"]
 
         if not user_uid or not role_uid:
             raise InvalidToken()
 
-        query = select(Payment).options(selectinload(Payment.user), selectinload(Payment.invoice))
+        query = select(Payment)
 
-        if not await role_controller.is_role_admin(role_uid=role_uid, session=session):
-            query = query.where(Payment.user_uid == user_uid).options(selectinload(Payment.user))
-        if q:
-            search_term = f"%{q}"
-            query = query.where(Payment.note.ilike(search_term) | Payment.serial_no.ilike(search_term))
+        if not await role_controller.is_role_admin(role_uid=role_uid):
+            query = query.where(Payment.user_uid == user_uid)
+        query, rank = apply_search(query, q, PAYMENT_SEARCH_COLUMNS, sort)
 
         if payment_method:
             query = query.where(Payment.payment_method == payment_method)
 
         if reference_number:
-            query = query.where(Payment.reference_number.ilike(f"%{reference_number}%"))
+            query = query.where(search_filter(reference_number, Payment.reference_number))
 
         if serial_no:
             query = query.where(Payment.serial_no == serial_no)
 
-        count_query = select(func.count()).select_from(query.subquery())
+        return query, rank
+
+    async def export_payments(
+        self,
+        token_payload: dict,
+        data_format: DataFormat,
+        serial_no: Optional[str],
+        payment_method: Optional[PaymentMethod] = None,
+        reference_number: Optional[str] = None,
+        q: Optional[str] = None,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = await self.user_payments_query(
+            token_payload, serial_no, payment_method, reference_number, q, sort
+        )
+
+        return export_response(order_query(query, Payment, rank), PAYMENT_EXPORT_COLUMNS, data_format, "payments")
+
+    async def get_payments(
+        self,
+        limit: int,
+        token_payload: dict,
+        session: AsyncSession,
+        offset: int,
+        serial_no: Optional[str],
+        payment_method: Optional[PaymentMethod] = None,
+        reference_number: Optional[str] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
+    ):
+        query, rank = await self.user_payments_query(
+            token_payload, serial_no, payment_method, reference_number, q, sort
+        )
+        query = query.options(selectinload(Payment.user), selectinload(Payment.invoice))
 
-        total = await session.scalar(count_query)
+        total = await count_rows(query, Payment, session, count_mode)
 
-        query = query.order_by(Payment.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, Payment, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
 
@@ -110,6 +142,7 @@ class PaymentController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(invoice_payments, limit, rank),
             }
         )
 
@@ -117,7 +150,7 @@ class PaymentController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[SinglePaymentResponseModel]](
                 data=paginated_invoice_payments, message="Payments retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
     async def create_payment(self, token_payload: dict, data: CreatePaymentModel, session: AsyncSession):
@@ -134,18 +167,58 @@ class PaymentController:
             new_payment = Payment(**payment)
 
             session.add(new_payment)
-            await session.flush()
-            await self.generate_payment_serial_no(new_payment.uid, session)
+            await invoice_controller.apply_payment_delta(new_payment.invoice_uid, new_payment.amount_received, session)
+            outbox_controller.invalidate_analytics(session, [rollup_month(datetime.now(timezone.utc))])
             await session.commit()
 
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
-                content=ServerRespModel[bool](data=True, message="Payment created!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Payment created!"),
             )
         except Exception as e:
             await session.rollback()
             raise e
 
+    async def import_payments(
+        self, token_payload: dict, chunks: AsyncIterator[bytes], data_format: DataFormat, session: AsyncSession
+    ):
+        """Post a remittance file of payments streamed from `chunks`, returning a reconciliation report.
+
+        Records are parsed as they arrive and posted in batches of
+        `PAYMENT_IMPORT_BATCH_SIZE`. Lines that fail validation, reference an
+        unknown invoice or repeat a recorded reference are reported and
+        skipped; everything else commits together, along with a single
+        `amount_paid` update per invoice.
+        """
+        payment_import = PaymentImport(user_uid=token_payload["user"]["uid"])
+
+        try:
+            batch = []
+            async for record in iter_records(chunks, data_format):
+                batch.append(record)
+                if len(batch) >= Config.PAYMENT_IMPORT_BATCH_SIZE:
+                    await payment_import.add_batch(batch, session)
+                    batch = []
+
+            await payment_import.add_batch(batch, session)
+
+            if payment_import.deltas:
+                await invoice_controller.apply_payment_deltas(payment_import.deltas, session)
+                outbox_controller.invalidate_analytics(session, [rollup_month(datetime.now(timezone.utc))])
+
+            report = await payment_import.summarize(session)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+        return JSONResponse(
+            status_code=status.HTTP_200_OK,
+            content=ServerRespModel[PaymentImportReportModel](
+                data=report, message=f"{report.imported} of {report.rows_read} payments imported"
+            ),
+        )
+
     async def update_payment(
         self, payment_uid: UUID, token_payload: dict, data: UpdatePaymentModel, session: AsyncSession
     ):
@@ -161,22 +234,31 @@ class PaymentController:
         if valid_attrs:
             valid_attrs["updated_at"] = datetime.now()
 
-            for field, value in valid_attrs.items():
-                setattr(payment_to_update, field, value)
+            try:
+                # Lock the payment so two concurrent edits cannot both compute a delta from the same old amount.
+                previous_amount = await session.scalar(
+                    select(Payment.amount_received).where(Payment.uid == payment_uid).with_for_update()
+                )
 
-            invoice_to_update = await invoice_controller.get_invoice_with_payments(
-                invoice_uid=payment_to_update.invoice_uid, session=session
-            )
+                for field, value in valid_attrs.items():
+                    setattr(payment_to_update, field, value)
 
-            if not invoice_to_update:
-                raise NotFound("Invoice not found")
+                if "amount_received" in valid_attrs:
+                    await invoice_controller.apply_payment_delta(
+                        payment_to_update.invoice_uid,
+                        Decimal(valid_attrs["amount_received"]) - (previous_amount or Decimal("0")),
+                        session,
+                    )
 
-            await session.commit()
-            await session.refresh(invoice_to_update)
+                outbox_controller.invalidate_analytics(session, [rollup_month(payment_to_update.created_at)])
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise e
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Payment updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Payment updated!"),
         )
 
     async def delete_payment(
@@ -196,16 +278,31 @@ class PaymentController:
         if not payment_to_delete:
             raise NotFound("Payment not found!")
 
-        if payment_to_delete.user_uid == user_uid or await role_controller.is_role_admin(
-            role_uid=role_uid, session=session
-        ):
-            statement = delete(Payment).where(Payment.user_uid == user_uid, Payment.uid == payment_uid)
-            await session.exec(statement)
-            await session.commit()
+        if payment_to_delete.user_uid == user_uid or await role_controller.is_role_admin(role_uid=role_uid):
+            statement = (
+                delete(Payment)
+                .where(Payment.user_uid == user_uid, Payment.uid == payment_uid)
+                .returning(Payment.invoice_uid, Payment.amount_received, Payment.created_at)
+            )
+
+            try:
+                result = await session.exec(statement)
+                deleted_payment = result.first()
+
+                if deleted_payment:
+                    await invoice_controller.apply_payment_delta(
+                        deleted_payment.invoice_uid, -(deleted_payment.amount_received or Decimal("0")), session
+                    )
+                    outbox_controller.invalidate_analytics(session, [rollup_month(deleted_payment.created_at)])
+
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise e
 
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ServerRespModel[bool](data=True, message="Payment deleted successfully!").model_dump(),
+                content=ServerRespModel[bool](data=True, message="Payment deleted successfully!"),
             )
 
         raise InsufficientPermissions()
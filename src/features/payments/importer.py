@@ -0,0 +1,171 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List, Set, Tuple
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from sqlalchemy import insert, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.models.invoices import Invoice
+from src.db.models.payments import Payment
+from src.features.payments.schemas import (
+    ImportedInvoiceModel,
+    ImportPaymentModel,
+    ImportRowErrorModel,
+    PaymentImportReportModel,
+)
+from src.utils.streaming import Record
+
+
+def describe_validation_error(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in error.errors())
+
+
+class PaymentImport:
+    """Posts remittance lines as payments, one batch of parsed records at a time.
+
+    Each batch resolves its invoices and already-recorded references with one
+    query apiece and inserts its payments with a single executemany. Invoice
+    totals are only accumulated here and applied once per invoice by the
+    caller, so a long import does not hold invoice row locks while it reads.
+    """
+
+    def __init__(self, user_uid: str):
+        self.user_uid = user_uid
+        self.report = PaymentImportReportModel()
+        self.deltas: Dict[UUID, Decimal] = defaultdict(Decimal)
+        self.payment_counts: Dict[UUID, int] = defaultdict(int)
+        self.serial_nos: Dict[UUID, str] = {}
+        self.references: Set[Tuple[UUID, str]] = set()
+
+    def fail(self, line: int, error: Any):
+        self.report.failed += 1
+        self.report.errors.append(ImportRowErrorModel(line=line, error=str(error)))
+
+    def validate(self, batch: List[Record]) -> List[Tuple[int, ImportPaymentModel]]:
+        valid = []
+        for line, record in batch:
+            self.report.rows_read += 1
+
+            if isinstance(record, Exception):
+                self.fail(line, f"Invalid JSON: {record}")
+                continue
+
+            if isinstance(record, dict):
+                # Blank CSV cells mean "not given", not an empty value to validate.
+                record = {field: value for field, value in record.items() if value not in ("", None)}
+
+            try:
+                valid.append((line, ImportPaymentModel.model_validate(record)))
+            except ValidationError as e:
+                self.fail(line, describe_validation_error(e))
+
+        return valid
+
+    async def resolve_invoices(
+        self, rows: List[Tuple[int, ImportPaymentModel]], session: AsyncSession
+    ) -> Tuple[Set[UUID], Dict[str, UUID]]:
+        uids = {row.invoice_uid for _, row in rows if row.invoice_uid is not None}
+        serial_nos = {row.invoice_serial_no for _, row in rows if row.invoice_serial_no}
+
+        result = await session.exec(
+            select(Invoice.uid, Invoice.serial_no).where(or_(Invoice.uid.in_(uids), Invoice.serial_no.in_(serial_nos)))
+        )
+
+        invoices = result.all()
+        self.serial_nos.update({uid: serial_no for uid, serial_no in invoices})
+
+        return {uid for uid, _ in invoices}, {serial_no: uid for uid, serial_no in invoices}
+
+    async def recorded_references(
+        self, invoice_uids: Set[UUID], references: Set[str], session: AsyncSession
+    ) -> Set[Tuple[UUID, str]]:
+        if not references:
+            return set()
+
+        result = await session.exec(
+            select(Payment.invoice_uid, Payment.reference_number).where(
+                Payment.invoice_uid.in_(invoice_uids), Payment.reference_number.in_(references)
+            )
+        )
+        return set(result.all())
+
+    async def add_batch(self, batch: List[Record], session: AsyncSession):
+        rows = self.validate(batch)
+        if not rows:
+            return
+
+        invoice_uids, uids_by_serial_no = await self.resolve_invoices(rows, session)
+
+        resolved: List[Tuple[int, UUID, ImportPaymentModel]] = []
+        for line, row in rows:
+            invoice_uid = row.invoice_uid if row.invoice_uid in invoice_uids else None
+            if row.invoice_uid is None:
+                invoice_uid = uids_by_serial_no.get(row.invoice_serial_no)
+
+            if invoice_uid is None:
+                self.fail(line, f"Invoice {row.invoice_uid or row.invoice_serial_no} not found")
+                continue
+
+            resolved.append((line, invoice_uid, row))
+
+        self.references |= await self.recorded_references(
+            {invoice_uid for _, invoice_uid, _ in resolved},
+            {row.reference_number for _, _, row in resolved if row.reference_number},
+            session,
+        )
+
+        payments = []
+        for line, invoice_uid, row in resolved:
+            if row.reference_number:
+                if (invoice_uid, row.reference_number) in self.references:
+                    self.report.duplicates += 1
+                    self.report.errors.append(
+                        ImportRowErrorModel(line=line, error=f"Duplicate payment reference {row.reference_number}")
+                    )
+                    continue
+                self.references.add((invoice_uid, row.reference_number))
+
+            payments.append(
+                {
+                    "uid": uuid4(),
+                    "invoice_uid": invoice_uid,
+                    "user_uid": self.user_uid,
+                    "payment_method": row.payment_method,
+                    "amount_received": row.amount_received,
+                    "reference_number": row.reference_number,
+                    "note": row.note,
+                }
+            )
+            self.deltas[invoice_uid] += row.amount_received
+            self.payment_counts[invoice_uid] += 1
+
+        if payments:
+            await session.exec(insert(Payment), params=payments)
+            self.report.imported += len(payments)
+            self.report.total_received += sum(payment["amount_received"] for payment in payments)
+
+    async def summarize(self, session: AsyncSession) -> PaymentImportReportModel:
+        """Fill in each touched invoice's totals, read back after the deltas were applied."""
+        self.report.errors.sort(key=lambda error: error.line)
+
+        if self.deltas:
+            result = await session.exec(
+                select(Invoice.uid, Invoice.amount_paid, Invoice.status).where(Invoice.uid.in_(self.deltas))
+            )
+
+            self.report.invoices = [
+                ImportedInvoiceModel(
+                    invoice_uid=invoice_uid,
+                    serial_no=self.serial_nos.get(invoice_uid),
+                    payments=self.payment_counts[invoice_uid],
+                    amount_received=self.deltas[invoice_uid],
+                    amount_paid=amount_paid,
+                    status=status,
+                )
+                for invoice_uid, amount_paid, status in result.all()
+            ]
+
+        return self.report
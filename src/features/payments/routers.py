@@ -1,20 +1,23 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, Query, status
+from fastapi import APIRouter, Body, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
-from src.db.main import get_session
+from src.db.instrumentation import query_budget
+from src.db.main import get_read_session, get_session
 from src.features.auth.dependencies import AccessTokenBearer
 from src.features.payments.controller import payment_controller
 from src.features.payments.schemas import (
     CreatePaymentModel,
+    PaymentImportReportModel,
     PaymentMethod,
     SinglePaymentResponseModel,
     UpdatePaymentModel,
 )
-from src.misc.schemas import PaginatedResponseModel, ServerRespModel
+from src.misc.schemas import CountMode, DataFormat, PaginatedResponseModel, SearchSort, ServerRespModel
 
 payment_router = APIRouter()
 
@@ -28,11 +31,25 @@ async def create_payment(
     return await payment_controller.create_payment(token_payload=token_payload, data=data, session=session)
 
 
+@payment_router.post("/import", response_model=ServerRespModel[PaymentImportReportModel])
+async def import_payments(
+    request: Request,
+    format: DataFormat = Query(default=DataFormat.CSV),
+    token_payload: dict = Depends(AccessTokenBearer()),
+    session: AsyncSession = Depends(get_session),
+):
+    """Import a remittance file sent as the raw request body, one payment per CSV row or NDJSON line."""
+    return await payment_controller.import_payments(
+        token_payload=token_payload, chunks=request.stream(), data_format=format, session=session
+    )
+
+
 @payment_router.get(
     "",
     status_code=status.HTTP_200_OK,
     response_model=ServerRespModel[PaginatedResponseModel[SinglePaymentResponseModel]],
 )
+@query_budget(4)
 async def get_payments(
     payment_method: Optional[PaymentMethod] = Query(default=None),
     serial_no: Optional[str] = Query(default=None),
@@ -42,13 +59,19 @@ async def get_payments(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     token_payload: dict = Depends(AccessTokenBearer()),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await payment_controller.get_payments(
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         reference_number=reference_number,
         payment_method=payment_method,
         serial_no=serial_no,
@@ -57,7 +80,29 @@ async def get_payments(
     )
 
 
+@payment_router.get("/export", response_class=StreamingResponse)
+async def export_payments(
+    format: DataFormat = Query(default=DataFormat.CSV),
+    payment_method: Optional[PaymentMethod] = Query(default=None),
+    serial_no: Optional[str] = Query(default=None),
+    reference_number: str = Query(default=None),
+    q: Optional[str] = Query(default=None),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
+    token_payload: dict = Depends(AccessTokenBearer()),
+):
+    return await payment_controller.export_payments(
+        token_payload=token_payload,
+        data_format=format,
+        serial_no=serial_no,
+        payment_method=payment_method,
+        reference_number=reference_number,
+        q=q,
+        sort=sort,
+    )
+
+
 @payment_router.get("/{payment_uid}", response_model=ServerRespModel[SinglePaymentResponseModel])
+@query_budget(3)
 async def get_single_payment(
     payment_uid: UUID,
     _: dict = Depends(AccessTokenBearer()),
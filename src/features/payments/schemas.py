@@ -1,10 +1,10 @@
 from datetime import datetime
 from decimal import Decimal
 from enum import StrEnum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_serializer
+from pydantic import BaseModel, Field, field_serializer, model_validator
 
 from src.features.config import AbridgedUserResponseModel, DBModel
 from src.features.invoices.schemas import InvoiceResponseModel
@@ -56,3 +56,54 @@ class PaymentResponseModel(DBModel):
 class SinglePaymentResponseModel(PaymentResponseModel):
     user: AbridgedUserResponseModel
     invoice: Optional[InvoiceResponseModel] = None
+
+
+class ImportPaymentModel(BaseModel):
+    invoice_uid: Optional[UUID] = None
+    invoice_serial_no: Optional[str] = None
+    amount_received: Decimal = Field(gt=0)
+    payment_method: PaymentMethod
+    reference_number: str = Field(default="")
+    note: str = Field(default="")
+
+    @model_validator(mode="after")
+    def check_invoice_reference(self):
+        if self.invoice_uid is None and not self.invoice_serial_no:
+            raise ValueError("Either invoice_uid or invoice_serial_no is required")
+        return self
+
+
+class ImportRowErrorModel(BaseModel):
+    line: int
+    error: str
+
+
+class ImportedInvoiceModel(BaseModel):
+    invoice_uid: UUID
+    serial_no: Optional[str] = None
+    payments: int
+    amount_received: Decimal
+    amount_paid: Decimal
+    status: str
+
+    @field_serializer("invoice_uid")
+    def serialize_uuids(self, value: UUID, _info):
+        return str(value)
+
+    @field_serializer("amount_received", "amount_paid")
+    def serialize_decimals(self, value: Decimal, _info):
+        return float(value)
+
+
+class PaymentImportReportModel(BaseModel):
+    rows_read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    total_received: Decimal = Decimal("0.0")
+    invoices: List[ImportedInvoiceModel] = []
+    errors: List[ImportRowErrorModel] = []
+
+    @field_serializer("total_received")
+    def serialize_decimals(self, value: Decimal, _info):
+        return float(value)
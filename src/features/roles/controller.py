@@ -3,14 +3,15 @@ from typing import List
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.db.models.roles import Role
+from src.features.roles.registry import role_registry
 from src.features.roles.schemas import CreateRole, RoleResponseModel, RoleStatus, UpdateRole
 from src.misc.schemas import ServerRespModel
 from src.utils.exceptions import NotFound, ResourceExists
+from src.utils.responses import JSONResponse
 
 
 class RoleController:
@@ -39,13 +40,11 @@ class RoleController:
 
         return self.is_role_active(role)
 
-    async def is_role_admin(self, role_uid: UUID, session: AsyncSession):
-        role_by_uid = await self.get_role_by_uid(role_uid, session)
+    async def is_role_admin(self, role_uid: UUID):
+        role = await role_registry.get_by_uid(role_uid)
 
-        if role_by_uid is None:
-            False
-
-        role = RoleResponseModel.model_validate(role_by_uid)
+        if role is None:
+            return False
 
         return True if role.name == "admin" else False
 
@@ -59,10 +58,11 @@ class RoleController:
 
         session.add(new_role)
         await session.commit()
+        await role_registry.invalidate()
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
-            content=ServerRespModel[bool](data=True, message="Role created!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Role created!"),
         )
 
     async def update_role(self, role_uid: UUID, data: UpdateRole, session: AsyncSession):
@@ -79,10 +79,11 @@ class RoleController:
             await session.exec(statement=statement)
             await session.commit()
             await session.refresh(role_to_update)
+            await role_registry.invalidate()
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Role updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Role updated!"),
         )
 
     async def get_all_roles(self, session: AsyncSession):
@@ -96,7 +97,7 @@ class RoleController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[List[RoleResponseModel]](
                 data=role_responses, message="Roles retrieved successfully!"
-            ).model_dump(),
+            ),
         )
 
     async def single_role(self, role_uid: UUID, session: AsyncSession):
@@ -108,9 +109,7 @@ class RoleController:
         role_response = RoleResponseModel.model_validate(role)
         return JSONResponse(
             status_code=status.HTTP_200_OK,
-            content=ServerRespModel[RoleResponseModel](
-                data=role_response, message="Role retrieved successfully!"
-            ).model_dump(),
+            content=ServerRespModel[RoleResponseModel](data=role_response, message="Role retrieved successfully!"),
         )
 
 
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Union
+from uuid import UUID
+
+from sqlmodel import select
+
+from src.config import Config
+from src.db.main import AsyncSessionMaker
+from src.db.models.roles import Role
+from src.db.redis import redis_client
+from src.features.roles.schemas import RoleResponseModel, RoleStatus
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ROLE_INVALIDATION_CHANNEL = "roles:invalidate"
+
+
+class RoleRegistry:
+    """In-memory snapshot of all roles, keyed by uid and name.
+
+    The snapshot is reloaded when it is older than the configured TTL, and
+    dropped immediately when any worker publishes a role change.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._by_uid: Dict[str, RoleResponseModel] = {}
+        self._by_name: Dict[str, RoleResponseModel] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def load(self):
+        # An invalidation that lands while the query runs means the result may predate
+        # the change, so it is served but left stale and reloaded on the next read.
+        generation = self._generation
+        started_at = time.monotonic()
+
+        # Always the primary: a lagging replica would bring back a revoked role for a full TTL.
+        async with AsyncSessionMaker() as session:
+            result = await session.exec(select(Role))
+            roles = [RoleResponseModel.model_validate(role) for role in result.all()]
+
+        self._by_uid = {str(role.uid): role for role in roles}
+        self._by_name = {role.name: role for role in roles}
+        if generation == self._generation:
+            self._loaded_at = started_at
+        logger.info(f"Loaded {len(roles)} roles into the role registry")
+
+    async def ensure_fresh(self):
+        if not self.is_stale:
+            return
+
+        async with self._lock:
+            if self.is_stale:
+                await self.load()
+
+    async def get_by_uid(self, role_uid: Union[str, UUID]) -> Optional[RoleResponseModel]:
+        await self.ensure_fresh()
+        return self._by_uid.get(str(role_uid))
+
+    async def get_by_name(self, role_name: str) -> Optional[RoleResponseModel]:
+        await self.ensure_fresh()
+        return self._by_name.get(role_name.lower())
+
+    async def active_role_names(self, role_names: List[str]) -> List[str]:
+        await self.ensure_fresh()
+        return [
+            name
+            for name in role_names
+            if name in self._by_name and self._by_name[name].status == RoleStatus.ACTIVE.value
+        ]
+
+    def invalidate_local(self):
+        self._generation += 1
+        self._loaded_at = None
+
+    async def invalidate(self):
+        """Drop the snapshot here and tell every other worker to do the same."""
+        self.invalidate_local()
+
+        if not redis_client.client:
+            logger.warning("Redis client not initialized, role change not broadcast")
+            return
+
+        try:
+            await redis_client.client.publish(ROLE_INVALIDATION_CHANNEL, "1")
+        except Exception as e:
+            logger.error(f"Error publishing role invalidation: {e}")
+
+    async def start(self):
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Failed to preload role registry: {e}")
+
+        if redis_client.client and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self):
+        while True:
+            try:
+                pubsub = redis_client.client.pubsub()
+                await pubsub.subscribe(ROLE_INVALIDATION_CHANNEL)
+
+                try:
+                    while True:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message:
+                            self.invalidate_local()
+                finally:
+                    await pubsub.aclose()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while disconnected.
+                logger.warning(f"Role invalidation listener error: {e}")
+                self.invalidate_local()
+                await asyncio.sleep(5)
+
+
+role_registry = RoleRegistry(ttl=Config.ROLE_REGISTRY_TTL_SECONDS)
@@ -3,7 +3,6 @@ from typing import List
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlmodel import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -11,6 +10,7 @@ from src.db.models.services import Service
 from src.features.services.schemas import CreateServiceModel, ServiceResponseModel, ServiceStatus, UpdateServiceModel
 from src.misc.schemas import ServerRespModel
 from src.utils.exceptions import NotFound, ResourceExists
+from src.utils.responses import JSONResponse
 
 
 class ServiceController:
@@ -52,7 +52,7 @@ class ServiceController:
 
         return JSONResponse(
             status_code=status.HTTP_201_CREATED,
-            content=ServerRespModel[bool](data=True, message="Service created!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Service created!"),
         )
 
     async def update_service(self, service_uid: UUID, data: UpdateServiceModel, session: AsyncSession):
@@ -72,7 +72,7 @@ class ServiceController:
 
         return JSONResponse(
             status_code=status.HTTP_202_ACCEPTED,
-            content=ServerRespModel[bool](data=True, message="Service updated!").model_dump(),
+            content=ServerRespModel[bool](data=True, message="Service updated!"),
         )
 
     async def get_all_services(self, session: AsyncSession):
@@ -86,7 +86,7 @@ class ServiceController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[List[ServiceResponseModel]](
                 data=service_responses, message="Services retrieved successfully!"
-            ).model_dump(),
+            ),
         )
 
     async def single_service(self, service_uid: UUID, session: AsyncSession):
@@ -100,7 +100,7 @@ class ServiceController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[ServiceResponseModel](
                 data=service_response, message="Service retrieved successfully!"
-            ).model_dump(),
+            ),
         )
 
 
@@ -1,32 +1,24 @@
-from datetime import datetime, timezone
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from fastapi import status
-from fastapi.responses import JSONResponse
 from sqlalchemy.orm import selectinload
-from sqlmodel import func, select, update
+from sqlmodel import or_, select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.db.models.users import User
+from src.db.models.users import USER_SEARCH_COLUMNS, User
 from src.features.users.schemas import UserResponseModel, UserStatus
-from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
+from src.misc.schemas import CountMode, PaginatedResponseModel, PaginationModel, SearchSort, ServerRespModel
 from src.utils import get_current_and_total_pages
 from src.utils.exceptions import NotFound
+from src.utils.pagination import count_rows, next_cursor, paginate_query
+from src.utils.responses import JSONResponse
+from src.utils.search import apply_search
 from src.utils.validators import email_validator, is_email
 
 
 class UserController:
-    async def generate_staff_no(self, dept: str, user_uid: UUID, session: AsyncSession):
-        user = await self.get_user_by_uid(user_uid, session)
-
-        dept_prefix = dept.upper().ljust(3, "D")[:3]
-        current_year_last_two_digits = str(datetime.now(timezone.utc).year)[2:]
-        staff_no = f"{dept_prefix}-{current_year_last_two_digits}-{str(user.id).zfill(4)}"
-
-        statement = update(User).where(User.uid == user_uid).values(staff_no=staff_no)
-        await session.exec(statement)
-
     async def get_user_by_email(self, email: str, session: AsyncSession):
         statement = (
             select(User)
@@ -84,12 +76,15 @@ class UserController:
 
         return False if user is None else True
 
-    async def update_last_login(self, user: User, session: AsyncSession):
-        setattr(user, "last_login", datetime.now(timezone.utc))
-
-        await session.commit()
-        await session.refresh(user)
-        return user
+    async def stamp_last_login(self, user_uid: UUID, logged_in_at: datetime, session: AsyncSession):
+        """Move `last_login` forward to `logged_in_at`; replayed or out-of-order stamps are no-ops."""
+        statement = (
+            update(User)
+            .where(User.uid == user_uid, or_(User.last_login.is_(None), User.last_login < logged_in_at))
+            .values(last_login=logged_in_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.exec(statement)
 
     async def update_user(self, user: User, user_data: User, session: AsyncSession):
         allowed_fields = ["first_name", "last_name", "password"]
@@ -113,7 +108,7 @@ class UserController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[UserResponseModel](
                 data=UserResponseModel.model_validate(user), message="User retrieved!"
-            ).model_dump(),
+            ),
         )
 
     async def get_users(
@@ -124,17 +119,13 @@ class UserController:
         limit: Optional[int],
         offset: Optional[int],
         session: AsyncSession,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT,
+        sort: SearchSort = SearchSort.RECENT,
     ):
         query = select(User).options(selectinload(User.role), selectinload(User.department))
 
-        if q:
-            search_term = f"%{q}"
-            query = query.where(
-                User.first_name.ilike(search_term)
-                | User.last_name.ilike(search_term)
-                | User.email.ilike(search_term)
-                | User.staff_no.ilike(search_term)
-            )
+        query, rank = apply_search(query, q, USER_SEARCH_COLUMNS, sort)
 
         if staff_no:
             query = query.where(User.staff_no == staff_no)
@@ -142,11 +133,9 @@ class UserController:
         if user_status:
             query = query.where(User.status == user_status)
 
-        count_query = select(func.count()).select_from(query.subquery())
-
-        total = await session.scalar(count_query)
+        total = await count_rows(query, User, session, count_mode)
 
-        query = query.order_by(User.created_at.desc()).offset(offset).limit(limit)
+        query = paginate_query(query, User, limit=limit, offset=offset, cursor=cursor, rank=rank)
 
         results = await session.exec(query)
 
@@ -163,6 +152,7 @@ class UserController:
                 "pagination": PaginationModel(
                     total=total, current_page=current_page, limit=limit, total_pages=total_pages
                 ),
+                "next_cursor": next_cursor(users, limit, rank),
             }
         )
 
@@ -170,7 +160,7 @@ class UserController:
             status_code=status.HTTP_200_OK,
             content=ServerRespModel[PaginatedResponseModel[UserResponseModel]](
                 data=paginated_users_response, message="Users retrieved successfully"
-            ).model_dump(),
+            ),
         )
 
 
@@ -5,11 +5,11 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import Config
-from src.db.main import get_session
+from src.db.main import get_read_session, get_session
 from src.features.auth.dependencies import RoleBasedTokenBearer
 from src.features.users.controller import user_controller
 from src.features.users.schemas import UserResponseModel, UserStatus
-from src.misc.schemas import PaginatedResponseModel, ServerRespModel
+from src.misc.schemas import CountMode, PaginatedResponseModel, SearchSort, ServerRespModel
 
 user_router = APIRouter()
 
@@ -25,8 +25,11 @@ async def get_users(
         default=Config.DEFAULT_PAGE_LIMIT, ge=Config.DEFAULT_PAGE_MIN_LIMIT, le=Config.DEFAULT_PAGE_MAX_LIMIT
     ),
     offset: Optional[int] = Query(default=Config.DEFAULT_PAGE_OFFSET, ge=Config.DEFAULT_PAGE_OFFSET),
+    cursor: Optional[str] = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    sort: SearchSort = Query(default=SearchSort.RECENT),
     _: dict = Depends(RoleBasedTokenBearer(["admin"])),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     return await user_controller.get_users(
         user_status=user_status,
@@ -34,6 +37,9 @@ async def get_users(
         q=q,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        sort=sort,
         session=session,
     )
 
@@ -1,4 +1,5 @@
-from typing import Generic, List, TypeVar
+from enum import StrEnum
+from typing import Generic, List, Optional, TypeVar
 
 from fastapi import UploadFile
 from pydantic import BaseModel, ConfigDict
@@ -13,16 +14,33 @@ class ServerRespModel(BaseModel, Generic[T]):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
 
+class CountMode(StrEnum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+class SearchSort(StrEnum):
+    RECENT = "recent"
+    RELEVANCE = "relevance"
+
+
+class DataFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class PaginationModel(BaseModel):
-    total: int
+    total: Optional[int] = None
     current_page: int
     limit: int
-    total_pages: int
+    total_pages: Optional[int] = None
 
 
 class PaginatedResponseModel(BaseModel, Generic[T]):
     items: list[T]
     pagination: PaginationModel
+    next_cursor: Optional[str] = None
 
 
 class ServerErrorModel(BaseModel, Generic[T]):
@@ -6,6 +6,36 @@ celery_app = Celery(
     "worker",
     broker=f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}/1",
     backend=f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}/2",
+    include=[
+        "src.tasks.budget_tasks",
+        "src.tasks.email_tasks",
+        "src.tasks.invoice_tasks",
+        "src.tasks.outbox_tasks",
+        "src.tasks.rollup_tasks",
+    ],
 )
 
+celery_app.conf.beat_schedule = {
+    "reconcile-budget-spend": {
+        "task": "reconcile_budget_spend_task",
+        "schedule": Config.TOTALS_RECONCILE_INTERVAL_SECONDS,
+    },
+    "reconcile-invoice-totals": {
+        "task": "reconcile_invoice_totals_task",
+        "schedule": Config.TOTALS_RECONCILE_INTERVAL_SECONDS,
+    },
+    "process-outbox": {
+        "task": "process_outbox_task",
+        "schedule": Config.OUTBOX_POLL_INTERVAL_SECONDS,
+    },
+    "prune-outbox": {
+        "task": "prune_outbox_task",
+        "schedule": Config.TOTALS_RECONCILE_INTERVAL_SECONDS,
+    },
+    "rebuild-budget-rollups": {
+        "task": "rebuild_budget_rollups_task",
+        "schedule": Config.TOTALS_RECONCILE_INTERVAL_SECONDS,
+    },
+}
+
 celery_app.autodiscover_tasks(["src.tasks"])
@@ -0,0 +1,24 @@
+from src.db.main import AsyncSessionMaker, async_engine
+from src.features.budgets.controller import budget_controller
+from src.tasks import celery_app
+from src.tasks.runtime import on_worker_shutdown, run_async
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+on_worker_shutdown(async_engine.dispose)
+
+
+async def reconcile_budget_spend() -> int:
+    async with AsyncSessionMaker() as session:
+        reconciled = await budget_controller.reconcile_expense_totals(session)
+
+    if reconciled:
+        logger.warning(f"Reconciled {reconciled} budgets whose stored spend had drifted")
+
+    return reconciled
+
+
+@celery_app.task(name="reconcile_budget_spend_task")
+def reconcile_budget_spend_task():
+    return run_async(reconcile_budget_spend())
@@ -1,30 +1,44 @@
-import asyncio
+from typing import Any, Dict, List
 
 from src.tasks import celery_app
-from src.utils.mail import Mailer
+from src.tasks.runtime import on_worker_shutdown, run_async
+from src.utils.logger import setup_logger
+from src.utils.mail import Mailer, smtp_pool
+
+logger = setup_logger(__name__)
+
+on_worker_shutdown(smtp_pool.close)
 
 
 @celery_app.task(name="send_email_verification_task", bind=True, max_retries=3, default_retry_delay=5)
-def send_email_verification_task(*args, **kwargs):
-    email = kwargs.get("email") or args[0]
-    first_name = kwargs.get("first_name") or args[1]
-    base_url = kwargs.get("base_url") or args[2]
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+def send_email_verification_task(self, email: str, first_name: str, base_url: str):
     try:
-        loop.run_until_complete(Mailer.send_email_verification(email=email, first_name=first_name, base_url=base_url))
-    finally:
-        loop.close()
+        run_async(Mailer.send_email_verification(email=email, first_name=first_name, base_url=base_url))
+    except Exception as e:
+        raise self.retry(exc=e)
 
 
 @celery_app.task(name="send_password_reset_task", bind=True, max_retries=3, default_retry_delay=5)
-def send_password_reset_task(*args, **kwargs):
-    email = kwargs.get("email") or args[0]
-    first_name = kwargs.get("first_name") or args[1]
-    base_url = kwargs.get("base_url") or args[2]
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+def send_password_reset_task(self, email: str, first_name: str, base_url: str):
     try:
-        loop.run_until_complete(Mailer.send_password_reset(email=email, first_name=first_name, base_url=base_url))
-    finally:
-        loop.close()
+        run_async(Mailer.send_password_reset(email=email, first_name=first_name, base_url=base_url))
+    except Exception as e:
+        raise self.retry(exc=e)
+
+
+@celery_app.task(name="send_email_batch_task", bind=True, max_retries=3, default_retry_delay=5)
+def send_email_batch_task(self, template: str, recipients: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Send one templated email to many `{"email": ..., "context": {...}}` recipients.
+
+    Only the recipients that failed are retried; once retries run out, each
+    recipient's outcome is returned so the caller can act on `sent: false`.
+    """
+    results = run_async(Mailer.send_bulk(template, recipients))
+    failed = [recipient for recipient, result in zip(recipients, results) if not result["sent"]]
+
+    logger.info(f"Sent {len(recipients) - len(failed)} of {len(recipients)} '{template}' emails")
+
+    if failed and self.request.retries < self.max_retries:
+        raise self.retry(args=(template, failed))
+
+    return results
@@ -0,0 +1,25 @@
+from src.db.main import AsyncSessionMaker, async_engine
+from src.features.invoices.controller import invoice_controller
+from src.tasks import celery_app
+from src.tasks.runtime import on_worker_shutdown, run_async
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+on_worker_shutdown(async_engine.dispose)
+
+
+async def reconcile_invoice_totals() -> int:
+    async with AsyncSessionMaker() as session:
+        reconciled = await invoice_controller.reconcile_payment_totals(session)
+
+    if reconciled:
+        logger.warning(f"Reconciled {reconciled} invoices whose stored payment totals had drifted")
+
+    return reconciled
+
+
+@celery_app.task(name="reconcile_invoice_totals_task")
+def reconcile_invoice_totals_task():
+    """Backfill/repair stored invoice totals, e.g. `celery -A src.tasks call reconcile_invoice_totals_task`."""
+    return run_async(reconcile_invoice_totals())
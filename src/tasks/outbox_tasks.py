@@ -0,0 +1,46 @@
+from src.db.main import AsyncSessionMaker, async_engine
+from src.db.redis import redis_client
+from src.features.outbox.controller import outbox_controller
+from src.tasks import celery_app
+from src.tasks.runtime import on_worker_shutdown, run_async
+from src.utils.logger import setup_logger
+from src.utils.mail import smtp_pool
+
+logger = setup_logger(__name__)
+
+on_worker_shutdown(async_engine.dispose)
+on_worker_shutdown(smtp_pool.close)
+on_worker_shutdown(redis_client.close)
+
+
+async def process_outbox() -> int:
+    if redis_client.client is None:
+        try:
+            await redis_client.init()
+        except Exception as e:
+            logger.warning(f"Outbox worker running without Redis: {e}")
+
+    processed = 0
+    async with AsyncSessionMaker() as session:
+        while True:
+            claimed = await outbox_controller.process_batch(session)
+            processed += claimed
+            if claimed < outbox_controller.batch_size:
+                break
+
+    return processed
+
+
+async def prune_outbox() -> int:
+    async with AsyncSessionMaker() as session:
+        return await outbox_controller.prune(session)
+
+
+@celery_app.task(name="process_outbox_task")
+def process_outbox_task():
+    return run_async(process_outbox())
+
+
+@celery_app.task(name="prune_outbox_task")
+def prune_outbox_task():
+    return run_async(prune_outbox())
@@ -0,0 +1,16 @@
+from src.db.main import AsyncSessionMaker, async_engine
+from src.features.dashboard.admin.rollups import rollup_controller
+from src.tasks import celery_app
+from src.tasks.runtime import on_worker_shutdown, run_async
+
+on_worker_shutdown(async_engine.dispose)
+
+
+async def rebuild_budget_rollups() -> int:
+    async with AsyncSessionMaker() as session:
+        return await rollup_controller.rebuild(session)
+
+
+@celery_app.task(name="rebuild_budget_rollups_task")
+def rebuild_budget_rollups_task():
+    return run_async(rebuild_budget_rollups())
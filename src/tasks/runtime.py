@@ -0,0 +1,101 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from celery.signals import (
+    setup_logging,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_ready,
+)
+from prometheus_client import multiprocess, start_http_server
+
+from src.config import Config
+from src.utils.logger import configure_logging, setup_logger
+from src.utils.metrics import CELERY_TASK_DURATION, metrics_registry, multiprocess_enabled
+
+logger = setup_logger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_shutdown_hooks: List[Callable[[], Awaitable[None]]] = []
+_task_started_at: Dict[str, float] = {}
+
+
+def on_worker_shutdown(hook: Callable[[], Awaitable[None]]):
+    """Run `hook` on the worker loop before it closes, e.g. to dispose a pool bound to it."""
+    if hook not in _shutdown_hooks:
+        _shutdown_hooks.append(hook)
+
+
+def worker_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+
+    return _loop
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run `coro` on this worker process's long-lived event loop.
+
+    Keeping one loop for the process lifetime lets connection pools created
+    on it (database, SMTP) be reused from task to task instead of being
+    rebuilt for every task.
+    """
+    return worker_loop().run_until_complete(coro)
+
+
+@setup_logging.connect
+def use_logging_pipeline(**_):
+    # Having a receiver stops Celery from replacing the root handlers and redirecting stdout.
+    configure_logging()
+
+
+@worker_process_init.connect
+def start_worker_loop(**_):
+    worker_loop()
+
+
+@worker_process_shutdown.connect
+def stop_worker_loop(**_):
+    if _loop is None or _loop.is_closed():
+        return
+
+    for hook in _shutdown_hooks:
+        try:
+            _loop.run_until_complete(hook())
+        except Exception as e:
+            logger.error(f"Error running worker shutdown hook {hook}: {e}")
+
+    _loop.close()
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(**_):
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+@worker_ready.connect
+def start_metrics_server(**_):
+    if Config.CELERY_METRICS_PORT:
+        start_http_server(Config.CELERY_METRICS_PORT, registry=metrics_registry())
+        logger.info(f"Serving worker metrics on port {Config.CELERY_METRICS_PORT}")
+
+
+@task_prerun.connect
+def start_task_timer(task_id: str = None, **_):
+    _task_started_at[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task(task_id: str = None, task=None, state: Optional[str] = None, **_):
+    started_at = _task_started_at.pop(task_id, None)
+    if started_at is not None and task is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started_at)
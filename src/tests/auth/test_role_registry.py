@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from src.features.roles.registry import RoleRegistry
+
+
+def make_role(name: str):
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(uid=uuid4(), id=1, name=name, status="ACTIVE", created_at=now, updated_at=now)
+
+
+class FakeSessionMaker:
+    def __init__(self, roles, during_query=None):
+        self.roles = roles
+        self.during_query = during_query
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        session = MagicMock()
+
+        async def exec(_):
+            if self.during_query:
+                self.during_query()
+            return MagicMock(all=MagicMock(return_value=self.roles))
+
+        session.exec = exec
+        return session
+
+    async def __aexit__(self, *_):
+        return False
+
+
+class TestRoleRegistry:
+    def test_load_marks_the_snapshot_fresh(self, monkeypatch):
+        registry = RoleRegistry(ttl=60)
+        monkeypatch.setattr("src.features.roles.registry.AsyncSessionMaker", FakeSessionMaker([make_role("admin")]))
+
+        asyncio.run(registry.load())
+
+        assert not registry.is_stale
+        assert asyncio.run(registry.active_role_names(["admin", "staff"])) == ["admin"]
+
+    def test_invalidation_during_load_keeps_the_snapshot_stale(self, monkeypatch):
+        registry = RoleRegistry(ttl=60)
+        monkeypatch.setattr(
+            "src.features.roles.registry.AsyncSessionMaker",
+            FakeSessionMaker([make_role("admin")], during_query=registry.invalidate_local),
+        )
+
+        asyncio.run(registry.load())
+
+        assert registry.is_stale
@@ -0,0 +1,55 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.features.budgets.controller import budget_controller
+from src.features.expenses.controller import ExpensesController
+from src.utils.exceptions import NotFound
+
+
+class TestBudgetTotals:
+    def test_budgets_are_locked_before_spend_is_recomputed(self):
+        statements = []
+        session = MagicMock(commit=AsyncMock())
+        session.exec = AsyncMock(side_effect=lambda statement: statements.append(statement) or MagicMock(rowcount=1))
+
+        assert asyncio.run(budget_controller.reconcile_expense_totals(session)) == 1
+
+        lock, update = (str(statement) for statement in statements)
+        assert lock.endswith("ORDER BY budgets.uid FOR UPDATE")
+        assert update.startswith("UPDATE budgets SET")
+
+    def test_moving_a_deleted_expense_is_not_found(self):
+        session = MagicMock()
+        session.exec = AsyncMock(return_value=MagicMock(first=MagicMock(return_value=None)))
+
+        with pytest.raises(NotFound):
+            asyncio.run(ExpensesController().move_expense_amount(uuid4(), {"amount_spent": 10}, session))
+
+    def test_expense_with_a_null_amount_moves_as_zero(self, monkeypatch):
+        old_budget, new_budget = uuid4(), uuid4()
+        session = MagicMock()
+        session.exec = AsyncMock(
+            return_value=MagicMock(
+                first=MagicMock(return_value=SimpleNamespace(budget_uid=old_budget, amount_spent=None))
+            )
+        )
+        budgets = {
+            old_budget: SimpleNamespace(
+                amount_spent=Decimal("0"), gross_amount=Decimal("100"), availability="AVAILABLE"
+            ),
+            new_budget: SimpleNamespace(
+                amount_spent=Decimal("0"), gross_amount=Decimal("100"), availability="AVAILABLE"
+            ),
+        }
+        apply_expense_deltas = AsyncMock()
+        monkeypatch.setattr(budget_controller, "lock_budgets", AsyncMock(return_value=budgets))
+        monkeypatch.setattr(budget_controller, "apply_expense_deltas", apply_expense_deltas)
+
+        asyncio.run(ExpensesController().move_expense_amount(uuid4(), {"budget_uid": new_budget}, session))
+
+        assert apply_expense_deltas.await_args.args[0] == {old_budget: Decimal("0"), new_budget: Decimal("0")}
@@ -0,0 +1,97 @@
+import asyncio
+import json
+import time
+from datetime import date
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from pydantic import TypeAdapter
+
+from src.features.dashboard.admin.cache import STORE_IF_CURRENT_SCRIPT, AnalyticsCache, months_between
+from src.features.dashboard.admin.schema import PeriodicAnalyticsParams
+
+ADAPTER = TypeAdapter(List[int])
+
+
+class TestAnalyticsCache:
+    def make_client(self, entry=None):
+        client = Mock()
+        client.get = AsyncMock(return_value=entry)
+        client.set = AsyncMock(return_value=True)
+        client.eval = AsyncMock()
+        client.mget = AsyncMock(return_value=["2", None, None, None])
+        return client
+
+    def run(self, cache, client, compute):
+        params = PeriodicAnalyticsParams(month_range="3", end_month=10, end_year=2025)
+
+        async def go():
+            with patch("src.features.dashboard.admin.cache.redis_client", Mock(client=client)):
+                result = await cache.get_or_compute("test", params, ADAPTER, compute, session=Mock())
+                await asyncio.sleep(0)
+                return result
+
+        return asyncio.run(go())
+
+    def test_months_between_spans_year_end(self):
+        assert months_between(date(2024, 11, 1), date(2025, 1, 31)) == [
+            date(2024, 11, 1),
+            date(2024, 12, 1),
+            date(2025, 1, 1),
+        ]
+
+    def test_key_is_normalized_to_the_date_range(self):
+        cache = AnalyticsCache(ttl=60, stale_ttl=600, lock_timeout=5)
+        params = PeriodicAnalyticsParams(month_range="3", end_month=10, end_year=2025)
+
+        assert cache.key("test", params) == "analytics:test:2025-07-01:2025-10-31"
+
+    def test_fresh_entry_skips_compute(self):
+        cache = AnalyticsCache(ttl=60, stale_ttl=600, lock_timeout=5)
+        client = self.make_client(json.dumps({"data": [1, 2], "fresh_until": time.time() + 60}))
+        compute = AsyncMock(return_value=[3])
+
+        assert self.run(cache, client, compute) == [1, 2]
+        compute.assert_not_awaited()
+        client.set.assert_not_awaited()
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        cache = AnalyticsCache(ttl=60, stale_ttl=600, lock_timeout=5)
+        client = self.make_client(json.dumps({"data": [1, 2], "fresh_until": time.time() - 1}))
+        client.set = AsyncMock(return_value=False)
+
+        assert self.run(cache, client, AsyncMock(return_value=[3])) == [1, 2]
+        # The refresh tried to take the lock; another worker holds it, so it gives up.
+        assert client.set.await_args.kwargs == {"nx": True, "ex": 5}
+
+    def test_miss_is_stored_only_if_its_months_were_not_invalidated(self):
+        cache = AnalyticsCache(ttl=60, stale_ttl=600, lock_timeout=5)
+        client = self.make_client()
+
+        assert self.run(cache, client, AsyncMock(return_value=[3])) == [3]
+
+        store = client.eval.await_args_list[0].args
+        assert store[0] == STORE_IF_CURRENT_SCRIPT
+        assert store[1:4] == (9, "analytics:test:2025-07-01:2025-10-31", "analytics:generation:2025-07")
+        # Entry, expiry, then the generations read before computing.
+        assert json.loads(store[-6])["data"] == [3]
+        assert store[-5:] == (660, "2", "0", "0", "0")
+
+    def test_invalidate_bumps_generations_before_dropping_entries(self):
+        cache = AnalyticsCache(ttl=60, stale_ttl=600, lock_timeout=5)
+        client = self.make_client()
+        pipe = MagicMock(execute=AsyncMock())
+        client.pipeline = MagicMock(
+            return_value=MagicMock(__aenter__=AsyncMock(return_value=pipe), __aexit__=AsyncMock())
+        )
+        client.sunion = AsyncMock(return_value={"analytics:test:2025-07-01:2025-10-31"})
+        client.delete = AsyncMock()
+
+        async def go():
+            with patch("src.features.dashboard.admin.cache.redis_client", Mock(client=client)):
+                await cache.invalidate([date(2025, 8, 1)])
+
+        asyncio.run(go())
+
+        pipe.incr.assert_called_once_with("analytics:generation:2025-08")
+        client.delete.assert_awaited_once_with("analytics:test:2025-07-01:2025-10-31", "analytics:months:2025-08")
@@ -0,0 +1,32 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.features.dashboard.admin.controller import admin_controller
+from src.features.dashboard.admin.schema import IncomeAnalyticsParams, IncomeDimension
+
+
+class TestIncomeAnalytics:
+    def compile_income_query(self, **params) -> str:
+        session = Mock(exec=AsyncMock(return_value=[]))
+        asyncio.run(admin_controller.compute_income(IncomeAnalyticsParams(**params), session))
+
+        statement = session.exec.await_args.kwargs["statement"]
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.parametrize("dimension", list(IncomeDimension))
+    def test_single_grouped_query_per_dimension(self, dimension):
+        sql = self.compile_income_query(group_by=dimension, bucket="week")
+
+        assert "sum(payments.amount_received)" in sql
+        assert (
+            "GROUP BY CAST(date_trunc(%(date_trunc_1)s, timezone(%(timezone_1)s, payments.created_at)) AS DATE)" in sql
+        )
+
+    def test_payment_method_breakdown_skips_invoice_join(self):
+        sql = self.compile_income_query(group_by=IncomeDimension.PAYMENT_METHOD)
+
+        assert "JOIN" not in sql
+        assert "NULL AS dimension_uid" in sql
@@ -0,0 +1,43 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from src.db.models.rollups import rollup_month
+from src.features.dashboard.admin.rollups import rollup_controller
+
+
+class TestBudgetRollups:
+    def test_rollup_month_is_the_utc_month(self):
+        created_at = datetime(2025, 10, 1, 0, 30, tzinfo=timezone(timedelta(hours=1)))
+
+        assert rollup_month(created_at) == date(2025, 9, 1)
+
+    def test_deltas_are_summed_per_department_month(self):
+        session = Mock(exec=AsyncMock())
+        department_uid, month = uuid4(), date(2025, 9, 1)
+
+        deltas = [
+            (department_uid, month, Decimal("-500"), Decimal("-20")),
+            (department_uid, month, Decimal("700"), Decimal("20")),
+        ]
+        asyncio.run(rollup_controller.apply_deltas(deltas, session))
+
+        statement = session.exec.await_args.args[0]
+        params = statement.compile(dialect=postgresql.dialect()).params
+
+        assert params["budget_total_m0"] == Decimal("200")
+        assert params["expense_total_m0"] == Decimal("0")
+        assert "budget_total_m1" not in params
+
+    def test_cancelling_deltas_skip_the_upsert(self):
+        session = Mock(exec=AsyncMock())
+        department_uid, month = uuid4(), date(2025, 9, 1)
+
+        deltas = [(department_uid, month, Decimal("500"), 0), (department_uid, month, Decimal("-500"), 0)]
+        asyncio.run(rollup_controller.apply_deltas(deltas, session))
+
+        session.exec.assert_not_awaited()
@@ -0,0 +1,22 @@
+import pytest
+
+from src.config import Config
+from src.db.pool import PoolStats, build_connect_args
+
+
+class TestPoolConfig:
+    def test_pgbouncer_mode_disables_prepared_statement_caches(self, monkeypatch):
+        monkeypatch.setattr(Config, "DB_PGBOUNCER_MODE", True)
+        connect_args = build_connect_args()
+
+        assert connect_args["statement_cache_size"] == 0
+        assert connect_args["prepared_statement_cache_size"] == 0
+        assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+    def test_pool_stats_average_checkout_wait(self):
+        stats = PoolStats()
+        stats.record_checkout(0.2)
+        stats.record_checkout(0.4)
+
+        assert stats.as_dict()["avg_wait_seconds"] == pytest.approx(0.3)
+        assert stats.as_dict()["max_wait_seconds"] == 0.4
@@ -0,0 +1,55 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.config import Config
+from src.db.instrumentation import QueryStats, capture_queries, query_budget, request_query_stats
+from src.utils.exceptions import register_exceptions
+from src.utils.middlewares import MetricsMiddleware
+
+
+def build_app(statements: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/widgets")
+    @query_budget(2)
+    async def list_widgets():
+        for _ in range(statements):
+            request_query_stats.get().record(0.001, "SELECT widgets.id FROM widgets WHERE widgets.owner_id = $1")
+        return []
+
+    register_exceptions(app)
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+class TestQueryBudget:
+    def test_counts_are_sent_as_headers_in_instrumentation_mode(self, monkeypatch):
+        monkeypatch.setattr(Config, "SQL_INSTRUMENTATION", True)
+
+        response = TestClient(build_app(statements=2)).get("/widgets")
+
+        assert response.status_code == 200
+        assert response.headers["X-DB-Query-Count"] == "2"
+        assert float(response.headers["X-DB-Query-Time-Ms"]) > 0
+
+    def test_strict_mode_fails_an_endpoint_over_its_budget(self, monkeypatch):
+        monkeypatch.setattr(Config, "QUERY_BUDGET_STRICT", True)
+
+        response = TestClient(build_app(statements=3)).get("/widgets")
+
+        assert response.status_code == 500
+        assert response.json()["error_code"] == "QueryBudgetExceeded"
+
+    def test_overrun_is_only_logged_outside_strict_mode(self):
+        assert TestClient(build_app(statements=3)).get("/widgets").status_code == 200
+
+    def test_repeated_statements_are_reported_as_possible_n_plus_one(self):
+        with capture_queries() as stats:
+            for _ in range(3):
+                request_query_stats.get().record(0.001, "SELECT users.* FROM users WHERE users.uid = $1")
+            request_query_stats.get().record(0.001, "SELECT budgets.* FROM budgets")
+
+        assert stats.count == 4
+        assert stats.repeated_statements(threshold=3) == {"SELECT users.* FROM users WHERE users.uid = $1": 3}
+        assert request_query_stats.get() is None
+        assert QueryStats().repeated_statements(threshold=1) == {}
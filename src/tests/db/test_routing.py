@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.db.models.budgets import Budget
+from src.db.routing import ReplicaSet, RoutingSession
+
+primary = create_async_engine("postgresql+asyncpg://u:p@primary/db")
+replica = create_async_engine("postgresql+asyncpg://u:p@replica/db")
+
+
+def make_read_session(replica_set: ReplicaSet) -> RoutingSession:
+    session = AsyncSession(bind=primary, sync_session_class=RoutingSession, info={"replicas": replica_set})
+    return session.sync_session
+
+
+class TestRoutingSession:
+    def test_reads_use_replica_until_the_request_writes(self):
+        replica_set = ReplicaSet([replica], max_lag=5, check_interval=5)
+        replica_set.replicas[0].healthy = True
+
+        async def run():
+            session = make_read_session(replica_set)
+            binds = [session.get_bind(clause=select(Budget))]
+            binds.append(session.get_bind(clause=update(Budget)))
+            binds.append(make_read_session(replica_set).get_bind(clause=select(Budget)))
+            return binds
+
+        assert asyncio.run(run()) == [replica.sync_engine, primary.sync_engine, primary.sync_engine]
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        replica_set = ReplicaSet([replica], max_lag=5, check_interval=5)
+
+        async def run():
+            return make_read_session(replica_set).get_bind(clause=select(Budget))
+
+        assert asyncio.run(run()) is primary.sync_engine
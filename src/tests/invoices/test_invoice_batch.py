@@ -0,0 +1,58 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from src.db.models.patients import Patient
+from src.features.invoices.controller import InvoiceController
+from src.features.invoices.schemas import BatchCreateInvoiceModel
+
+
+class TestInvoiceBatch:
+    def make_session(self, inserted):
+        def returning(statement):
+            params = statement.compile(dialect=postgresql.dialect()).params
+            uids = [value for key, value in sorted(params.items()) if key.startswith("uid_m")]
+            inserted.append(len(uids))
+            return MagicMock(all=MagicMock(return_value=[(uid, f"INV-{i}") for i, uid in enumerate(uids)]))
+
+        session = MagicMock()
+        session.exec = AsyncMock(side_effect=returning)
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        return session
+
+    def test_invalid_items_are_reported_and_the_rest_inserted_together(self):
+        known_patient, unknown_patient = uuid4(), uuid4()
+        controller = InvoiceController()
+
+        async def existing_uids(model, uids, session):
+            return {known_patient} & uids if model is Patient else set(uids)
+
+        controller.existing_uids = existing_uids
+
+        item = {"title": "Consultation", "gross_amount": 100, "invoice_type": "SERVICE"}
+        data = BatchCreateInvoiceModel(
+            invoices=[
+                {**item, "patient_uid": str(known_patient)},
+                {**item, "gross_amount": "lots"},
+                {**item, "patient_uid": str(unknown_patient)},
+                item,
+            ]
+        )
+        inserted = []
+        session = self.make_session(inserted)
+
+        response = asyncio.run(controller.create_invoices_batch({"user": {"uid": str(uuid4())}}, data, session))
+        body = json.loads(response.body)["data"]
+
+        assert response.status_code == 207
+        assert inserted == [2]
+        assert (body["created"], body["failed"]) == (2, 2)
+        assert [item["index"] for item in body["items"]] == [0, 1, 2, 3]
+        assert body["items"][0]["serial_no"] is not None
+        assert "gross_amount" in body["items"][1]["error"]
+        assert body["items"][2]["error"] == "Patient doesn't exist!"
+        session.commit.assert_awaited_once()
@@ -0,0 +1,100 @@
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import Numeric, create_engine, func, literal, null, select
+
+from src.db.models.invoices import Invoice, derive_invoice_status, invoice_amount_due, invoice_status_case
+from src.features.invoices.controller import invoice_controller
+from src.features.invoices.schemas import InvoiceStatus
+
+
+class TestInvoiceStatus:
+    @pytest.mark.parametrize(
+        "amount_paid, expected",
+        [
+            (Decimal("0"), InvoiceStatus.UNPAID),
+            (Decimal("50"), InvoiceStatus.PARTIALLY_PAID),
+            (Decimal("110"), InvoiceStatus.PAID),
+            (Decimal("120"), InvoiceStatus.OVER_PAID),
+        ],
+    )
+    def test_status_follows_amount_paid(self, amount_paid, expected):
+        invoice = Invoice(
+            title="Consultation",
+            invoice_type="SERVICE",
+            gross_amount=Decimal("100"),
+            tax_percent=Decimal("10"),
+            discount_percent=Decimal("0"),
+            amount_paid=amount_paid,
+        )
+
+        invoice.refresh_status()
+
+        assert invoice.status == expected.value
+
+    @pytest.mark.parametrize(
+        "amount_paid, expected",
+        [
+            (Decimal("0"), InvoiceStatus.UNPAID),
+            (Decimal("60"), InvoiceStatus.PARTIALLY_PAID),
+            (Decimal("100"), InvoiceStatus.PAID),
+        ],
+    )
+    def test_null_percentages_count_as_zero(self, amount_paid, expected):
+        invoice = Invoice(
+            title="Consultation",
+            invoice_type="SERVICE",
+            gross_amount=Decimal("100"),
+            tax_percent=None,
+            discount_percent=None,
+            amount_paid=amount_paid,
+        )
+
+        invoice.refresh_status()
+
+        assert invoice.status == expected.value
+
+    @pytest.mark.parametrize(
+        "tax_percent, discount_percent, amount_paid",
+        [
+            (Decimal("25"), Decimal("50"), Decimal("0")),
+            (Decimal("25"), Decimal("50"), Decimal("50")),
+            (Decimal("25"), Decimal("50"), Decimal("112.5")),
+            (Decimal("25"), Decimal("50"), Decimal("120")),
+            (None, Decimal("50"), Decimal("100")),
+            (Decimal("25"), None, Decimal("125")),
+            (None, None, Decimal("40")),
+        ],
+    )
+    def test_sql_status_matches_python_status(self, tax_percent, discount_percent, amount_paid):
+        gross_amount = Decimal("100")
+
+        def value(amount):
+            return null() if amount is None else literal(amount, Numeric(12, 2))
+
+        # Same COALESCE as invoice_amount_due_sql, over literals instead of the invoice columns.
+        net_amount_due = invoice_amount_due(
+            value(gross_amount),
+            func.coalesce(value(tax_percent), 0),
+            func.coalesce(value(discount_percent), 0),
+            value(amount_paid),
+        )
+        with create_engine("sqlite://").connect() as connection:
+            sql_status = connection.execute(select(invoice_status_case(net_amount_due, value(amount_paid)))).scalar()
+
+        zero = Decimal("0")
+        python_due = invoice_amount_due(gross_amount, tax_percent or zero, discount_percent or zero, amount_paid)
+        assert sql_status == derive_invoice_status(python_due, amount_paid)
+
+
+class TestPaymentReconciliation:
+    def test_payments_are_locked_before_totals_are_recomputed(self):
+        calls = []
+        session = MagicMock(commit=AsyncMock())
+        session.execute = AsyncMock(side_effect=lambda statement: calls.append(str(statement)))
+        session.exec = AsyncMock(side_effect=lambda statement: calls.append("UPDATE") or MagicMock(rowcount=2))
+
+        assert asyncio.run(invoice_controller.reconcile_payment_totals(session)) == 2
+        assert calls == ["LOCK TABLE payments IN SHARE MODE", "UPDATE"]
@@ -0,0 +1,39 @@
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.db.models.invoices import Invoice
+from src.features.invoices.controller import invoice_controller
+from src.features.invoices.schemas import UpdateInvoiceModel
+from src.utils.exceptions import BadRequest
+
+
+class TestInvoiceUpdate:
+    def test_financial_edit_is_checked_against_the_locked_row(self):
+        user_uid = uuid4()
+        invoice = Invoice(
+            title="Consultation",
+            invoice_type="SERVICE",
+            gross_amount=Decimal("100"),
+            amount_paid=Decimal("20"),
+            user_uid=user_uid,
+        )
+        statements = []
+        session = MagicMock(commit=AsyncMock())
+        session.exec = AsyncMock(
+            side_effect=lambda statement: statements.append(statement)
+            or MagicMock(first=MagicMock(return_value=invoice))
+        )
+
+        with pytest.raises(BadRequest):
+            asyncio.run(
+                invoice_controller.update_invoice(
+                    invoice.uid, {"user": {"uid": str(user_uid)}}, UpdateInvoiceModel(gross_amount=150), session
+                )
+            )
+
+        assert str(statements[0]).endswith("FOR UPDATE")
+        session.commit.assert_not_awaited()
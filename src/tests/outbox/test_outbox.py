@@ -0,0 +1,53 @@
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+from src.config import Config
+from src.db.models.outbox import OutboxEvent
+from src.features.outbox.controller import OutboxController
+from src.features.outbox.schemas import OutboxEventKind, OutboxStatus
+
+
+class TestOutbox:
+    def make_session(self, events):
+        session = MagicMock()
+        session.exec = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=events)))
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        return session
+
+    def test_handled_events_are_marked_done_and_failures_backed_off(self):
+        controller = OutboxController(batch_size=10)
+        controller.handlers[OutboxEventKind.AUDIT] = AsyncMock()
+        controller.handlers[OutboxEventKind.NOTIFICATION] = AsyncMock(side_effect=ConnectionError("smtp down"))
+
+        audit = OutboxEvent(kind=OutboxEventKind.AUDIT, payload={})
+        notification = OutboxEvent(kind=OutboxEventKind.NOTIFICATION, payload={}, attempts=0)
+        session = self.make_session([audit, notification])
+
+        assert asyncio.run(controller.process_batch(session)) == 2
+
+        assert audit.status == OutboxStatus.DONE
+        assert audit.processed_at is not None
+        assert notification.status == OutboxStatus.PENDING
+        assert notification.attempts == 1
+        assert notification.last_error == "smtp down"
+        session.commit.assert_awaited_once()
+
+    def test_event_fails_for_good_after_max_attempts(self):
+        controller = OutboxController(batch_size=10)
+        event = OutboxEvent(kind="UNKNOWN", payload={}, attempts=Config.OUTBOX_MAX_ATTEMPTS - 1)
+
+        asyncio.run(controller.process_batch(self.make_session([event])))
+
+        assert event.status == OutboxStatus.FAILED
+
+    def test_analytics_invalidation_is_enqueued_once_per_write(self):
+        controller = OutboxController(batch_size=10)
+        session = MagicMock()
+
+        controller.invalidate_analytics(session, [date(2025, 9, 1), date(2025, 9, 1), date(2025, 8, 1)])
+
+        [event] = [call.args[0] for call in session.add.call_args_list]
+        assert event.kind == OutboxEventKind.ANALYTICS_INVALIDATION
+        assert event.payload == {"months": ["2025-08-01", "2025-09-01"]}
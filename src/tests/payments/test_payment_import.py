@@ -0,0 +1,41 @@
+import asyncio
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from src.features.payments.importer import PaymentImport
+
+
+class TestPaymentImport:
+    def make_session(self, invoices, references=()):
+        results = [MagicMock(all=MagicMock(return_value=rows)) for rows in (invoices, references, None)]
+
+        session = MagicMock()
+        session.exec = AsyncMock(side_effect=results)
+        return session
+
+    def test_batch_is_resolved_and_inserted_with_one_statement_each(self):
+        invoice_uid = uuid4()
+        session = self.make_session(invoices=[(invoice_uid, "INV-1")], references=[(invoice_uid, "REF-1")])
+        payment_import = PaymentImport(user_uid=str(uuid4()))
+        row = {"invoice_serial_no": "INV-1", "payment_method": "BANK_TRANSFER", "note": ""}
+
+        batch = [
+            (2, {**row, "amount_received": "10.50", "reference_number": "REF-2"}),
+            (3, {**row, "amount_received": "4.50", "reference_number": ""}),
+            (4, {**row, "amount_received": "7", "reference_number": "REF-1"}),
+            (5, {**row, "amount_received": "7", "invoice_serial_no": "INV-404"}),
+            (6, {**row, "amount_received": "-1"}),
+            (7, ValueError("Expecting value")),
+        ]
+        asyncio.run(payment_import.add_batch(batch, session))
+
+        assert session.exec.await_count == 3
+        insert_call = session.exec.await_args_list[2]
+        assert len(insert_call.kwargs["params"]) == 2
+
+        report = payment_import.report
+        assert (report.rows_read, report.imported, report.duplicates, report.failed) == (6, 2, 1, 3)
+        assert report.total_received == Decimal("15.00")
+        assert payment_import.deltas == {invoice_uid: Decimal("15.00")}
+        assert sorted(error.line for error in report.errors) == [4, 5, 6, 7]
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from src.utils.cache import TTLCache
+
+
+class TestTTLCache:
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entry_ttl_is_capped_by_cache_ttl(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        with patch("src.utils.cache.time.monotonic", return_value=100.0):
+            cache.set("token", {"jti": "x"}, ttl=3600)
+
+        with patch("src.utils.cache.time.monotonic", return_value=109.0):
+            assert cache.get("token") == {"jti": "x"}
+
+        with patch("src.utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("token") is None
+
+    def test_expired_ttl_is_not_stored(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("token", {"jti": "x"}, ttl=-1)
+
+        assert len(cache) == 0
@@ -0,0 +1,76 @@
+import json
+import logging
+import sys
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.utils.logger import ContextQueueHandler, CustomFormatter, JSONFormatter, WarningSampler
+from src.utils.middlewares import RequestContextMiddleware
+
+
+def make_record(level=logging.WARNING, msg="Budget %s over limit", args=("b-1",), lineno=10, **extra):
+    record = logging.LogRecord("src.test", level, "/src/test.py", lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class RecordingQueue(list):
+    def put_nowait(self, record):
+        self.append(record)
+
+
+class TestLoggingPipeline:
+    def test_json_lines_carry_request_ids_and_extra_fields(self):
+        handler = ContextQueueHandler(RecordingQueue())
+        app = FastAPI()
+
+        @app.get("/log")
+        async def log():
+            handler.handle(make_record(invoice_uid="i-1"))
+            return {}
+
+        app.add_middleware(RequestContextMiddleware)
+        response = TestClient(app).get("/log")
+
+        entry = json.loads(JSONFormatter().format(handler.queue[0]))
+        assert entry["message"] == "Budget b-1 over limit"
+        assert entry["level"] == "WARNING"
+        assert entry["request_id"] == response.headers["X-Request-ID"]
+        assert entry["correlation_id"] == response.headers["X-Correlation-ID"]
+        assert entry["invoice_uid"] == "i-1"
+
+    def test_records_are_rendered_before_queueing(self):
+        handler = ContextQueueHandler(RecordingQueue())
+        try:
+            raise ValueError("bad token")
+        except ValueError:
+            record = make_record(level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+            handler.handle(record)
+
+        queued = handler.queue[0]
+        assert queued.args is None and queued.exc_info is None
+        assert "ValueError: bad token" in queued.exc_text
+        assert "request_id" not in vars(queued)
+
+    def test_text_formatter_leaves_the_record_alone(self):
+        record = make_record(suppressed=3)
+        line = CustomFormatter(fmt="%(levelname)s %(message)s").format(record)
+
+        assert line == "⚠️ WARNING Budget b-1 over limit (3 similar suppressed)"
+        assert record.levelname == "WARNING"
+
+    def test_warnings_are_sampled_per_call_site(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr("src.utils.logger.time.monotonic", lambda: now[0])
+        sampler = WarningSampler(burst=2, interval=60)
+
+        assert [sampler.filter(make_record()) for _ in range(5)] == [True, True, False, False, False]
+        assert sampler.filter(make_record(lineno=11))
+        assert sampler.filter(make_record(level=logging.ERROR))
+
+        now[0] = 61
+        record = make_record()
+        assert sampler.filter(record)
+        assert record.suppressed == 3
@@ -0,0 +1,101 @@
+import asyncio
+from email.message import EmailMessage
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+import pytest
+from celery.exceptions import Retry
+
+from src.misc.schemas import EmailTypes
+from src.tasks.email_tasks import send_email_batch_task
+from src.utils.mail import Mailer, SMTPPool, mail_config
+
+
+def make_message(recipient: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = recipient
+    message["Subject"] = "Hello"
+    return message
+
+
+class TestSMTPPool:
+    def make_smtp(self):
+        smtp = MagicMock(is_connected=True)
+        smtp.connect = AsyncMock()
+        smtp.login = AsyncMock()
+        smtp.send_message = AsyncMock()
+        smtp.quit = AsyncMock()
+        return smtp
+
+    def test_connection_is_reused_across_sends(self):
+        smtp = self.make_smtp()
+        pool = SMTPPool(mail_config, size=1, max_idle=60)
+
+        async def send():
+            await pool.send_many([make_message("a@example.com"), make_message("b@example.com")])
+            await pool.send(make_message("c@example.com"))
+
+        with patch("src.utils.mail.aiosmtplib.SMTP", return_value=smtp) as connect:
+            asyncio.run(send())
+
+        assert connect.call_count == 1
+        assert smtp.login.await_count == 1
+        assert smtp.send_message.await_count == 3
+
+    def test_dropped_connection_is_reopened_once(self):
+        stale, fresh = self.make_smtp(), self.make_smtp()
+        stale.send_message.side_effect = aiosmtplib.SMTPServerDisconnected("gone")
+        pool = SMTPPool(mail_config, size=1, max_idle=60)
+
+        with patch("src.utils.mail.aiosmtplib.SMTP", side_effect=[stale, fresh]):
+            errors = asyncio.run(pool.send_many([make_message("a@example.com"), make_message("b@example.com")]))
+
+        assert errors == [None, None]
+        assert fresh.send_message.await_count == 2
+
+    def test_bulk_send_reports_each_recipient(self):
+        smtp = self.make_smtp()
+        smtp.send_message.side_effect = [None, aiosmtplib.SMTPRecipientsRefused({}), None]
+        pool = SMTPPool(mail_config, size=2, max_idle=60)
+        recipients = [
+            {"email": f"{name}@example.com", "context": {"first_name": name, "base_url": "http://test/"}}
+            for name in "abc"
+        ]
+
+        with (
+            patch("src.utils.mail.aiosmtplib.SMTP", return_value=smtp),
+            patch.object(Mailer, "pool", pool),
+        ):
+            results = asyncio.run(Mailer.send_bulk(EmailTypes.PWD_RESET.template, recipients))
+
+        assert [result["sent"] for result in results] == [True, False, True]
+        assert [result["email"] for result in results] == ["a@example.com", "b@example.com", "c@example.com"]
+
+
+class TestEmailBatchTask:
+    recipients = [{"email": f"{name}@example.com", "context": {"first_name": name}} for name in "ab"]
+
+    def results(self, *sent):
+        return [
+            {"email": recipient["email"], "sent": ok, "error": None if ok else "refused"}
+            for recipient, ok in zip(self.recipients, sent)
+        ]
+
+    def test_only_failed_recipients_are_retried(self, monkeypatch):
+        monkeypatch.setattr(Mailer, "send_bulk", AsyncMock(return_value=self.results(True, False)))
+
+        with patch.object(send_email_batch_task, "retry", side_effect=Retry) as retry:
+            with pytest.raises(Retry):
+                send_email_batch_task.apply(args=(EmailTypes.PWD_RESET.template, self.recipients), throw=True)
+
+        assert retry.call_args.kwargs["args"] == (EmailTypes.PWD_RESET.template, self.recipients[1:])
+
+    def test_outcomes_are_returned_once_retries_run_out(self, monkeypatch):
+        results = self.results(True, False)
+        monkeypatch.setattr(Mailer, "send_bulk", AsyncMock(return_value=results))
+
+        task = send_email_batch_task.apply(
+            args=(EmailTypes.PWD_RESET.template, self.recipients), retries=send_email_batch_task.max_retries
+        )
+
+        assert task.get() == results
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.db.instrumentation import request_query_stats
+from src.utils.metrics import router_label
+from src.utils.middlewares import MetricsMiddleware
+
+
+def build_app() -> FastAPI:
+    router = APIRouter()
+
+    @router.get("/{widget_uid}")
+    async def get_widget(widget_uid: str):
+        request_query_stats.get().record(0.004)
+        request_query_stats.get().record(0.006)
+        return {"uid": widget_uid}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1/widgets")
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+class TestMetrics:
+    def test_router_label_is_the_first_segment_under_the_api_prefix(self):
+        assert router_label("/api/v1/budgets/{budget_uid}/expenses") == "/budgets"
+        assert router_label("/metrics") == "/metrics"
+        assert router_label(None) == "unmatched"
+
+    def test_requests_are_recorded_by_route_template_with_their_queries(self):
+        labels = {"method": "GET", "router": "/widgets", "route": "/api/v1/widgets/{widget_uid}"}
+        before = REGISTRY.get_sample_value("http_requests_total", {**labels, "status": "200"}) or 0
+        queries_before = REGISTRY.get_sample_value("db_queries_per_request_sum", {"router": "/widgets"}) or 0
+
+        client = TestClient(build_app())
+        client.get("/api/v1/widgets/a")
+        client.get("/api/v1/widgets/b")
+        client.get("/nowhere")
+
+        assert REGISTRY.get_sample_value("http_requests_total", {**labels, "status": "200"}) == before + 2
+        assert REGISTRY.get_sample_value("db_queries_per_request_sum", {"router": "/widgets"}) == queries_before + 4
+        assert REGISTRY.get_sample_value(
+            "http_requests_total", {"method": "GET", "router": "unmatched", "route": "unmatched", "status": "404"}
+        )
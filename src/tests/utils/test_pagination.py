@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from src.db.models.budgets import Budget
+from src.misc.schemas import CountMode
+from src.utils import get_current_and_total_pages
+from src.utils.exceptions import BadRequest
+from src.utils.pagination import count_rows, decode_cursor, encode_cursor, exact_counts, next_cursor
+
+
+class TestCursorPagination:
+    def test_cursor_round_trip(self):
+        created_at = datetime(2025, 9, 4, 11, 41, 15, 436468, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "eyJhIjogMX0"])
+    def test_invalid_cursor_is_rejected(self, cursor):
+        with pytest.raises(BadRequest):
+            decode_cursor(cursor)
+
+    def test_next_cursor_only_on_full_page(self):
+        created_at = datetime(2025, 9, 4, tzinfo=timezone.utc)
+        rows = [SimpleNamespace(created_at=created_at, id=row_id) for row_id in (3, 2)]
+
+        assert next_cursor(rows, limit=3) is None
+        assert decode_cursor(next_cursor(rows, limit=2)) == (created_at, 2)
+
+
+class TestCountModes:
+    def make_session(self, total):
+        session = Mock()
+        session.get_bind.return_value = SimpleNamespace(dialect=postgresql.dialect())
+        session.scalar = AsyncMock(return_value=total)
+        return session
+
+    def test_exact_count_is_cached_per_filter_set(self):
+        exact_counts.clear()
+        session = self.make_session(7)
+
+        for _ in range(2):
+            query = select(Budget).where(Budget.status.in_(["PENDING"]))
+            assert asyncio.run(count_rows(query, Budget, session)) == 7
+
+        query = select(Budget).where(Budget.status.in_(["APPROVED"]))
+        asyncio.run(count_rows(query, Budget, session))
+
+        assert session.scalar.await_count == 2
+
+    def test_none_mode_skips_the_count(self):
+        session = self.make_session(7)
+
+        assert asyncio.run(count_rows(select(Budget), Budget, session, CountMode.NONE)) is None
+        assert get_current_and_total_pages(limit=10, total=None, offset=20) == (3, None)
+        session.scalar.assert_not_awaited()
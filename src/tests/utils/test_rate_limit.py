@@ -0,0 +1,27 @@
+import asyncio
+from unittest.mock import patch
+
+from src.utils.rate_limit import TokenBucket
+
+
+class TestTokenBucket:
+    def test_bursts_up_to_capacity_then_waits_for_refill(self):
+        clock = {"now": 0.0}
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock["now"] += seconds
+
+        async def acquire_many(bucket, count):
+            for _ in range(count):
+                await bucket.acquire()
+
+        with (
+            patch("src.utils.rate_limit.time.monotonic", side_effect=lambda: clock["now"]),
+            patch("src.utils.rate_limit.asyncio.sleep", side_effect=fake_sleep),
+        ):
+            bucket = TokenBucket(rate=10, capacity=2)
+            asyncio.run(acquire_many(bucket, 4))
+
+        assert sleeps == [0.1, 0.1]
@@ -0,0 +1,53 @@
+from uuid import UUID
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette_context import context
+
+from src.utils import build_link_from_base_url
+from src.utils.middlewares import RequestContextMiddleware
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/link")
+    async def link():
+        return {"link": build_link_from_base_url("api/v1/auth/verify/abc"), "request_id": context["X-Request-ID"]}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for chunk in (b"a,", b"b"):
+                yield chunk
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+class TestRequestContext:
+    def test_base_url_and_ids_are_available_to_handlers(self):
+        response = TestClient(build_app()).get("/link")
+
+        assert response.json()["link"] == "http://testserver/api/v1/auth/verify/abc"
+        assert response.json()["request_id"] == response.headers["X-Request-ID"]
+        assert UUID(response.headers["X-Correlation-ID"])
+
+    def test_valid_incoming_ids_are_kept_and_invalid_ones_replaced(self):
+        correlation_id = "0b0c6f6e-4a4b-4f7f-9f6a-1f0f3c2b1a00"
+
+        response = TestClient(build_app()).get(
+            "/link", headers={"X-Correlation-ID": correlation_id, "X-Request-ID": "not-a-uuid"}
+        )
+
+        assert UUID(response.headers["X-Correlation-ID"]) == UUID(correlation_id)
+        assert response.headers["X-Request-ID"] != "not-a-uuid"
+
+    def test_streaming_responses_pass_through(self):
+        response = TestClient(build_app()).get("/stream")
+
+        assert response.content == b"a,b"
+        assert "X-Request-ID" in response.headers
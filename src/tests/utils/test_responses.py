@@ -0,0 +1,62 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from src.features.invoices.schemas import InvoiceResponseModel
+from src.misc.schemas import PaginatedResponseModel, PaginationModel, ServerRespModel
+from src.utils.responses import JSONResponse
+
+
+def make_invoice(**overrides) -> InvoiceResponseModel:
+    now = datetime(2025, 3, 1, 9, 30, tzinfo=timezone.utc)
+    fields = {
+        "uid": uuid4(),
+        "created_at": now,
+        "updated_at": now,
+        "id": 1,
+        "serial_no": "INV-0001",
+        "invoice_type": "SERVICE",
+        "status": "UNPAID",
+        "title": "Consultation",
+        "gross_amount": Decimal("1200.50"),
+        "tax_percent": Decimal("7.5"),
+        "discount_percent": Decimal("0"),
+        "net_amount_due": Decimal("1290.54"),
+        "department_uid": uuid4(),
+    }
+    return InvoiceResponseModel(**{**fields, **overrides})
+
+
+class TestJSONResponse:
+    def test_models_render_with_their_field_serializers(self):
+        invoices = [make_invoice(), make_invoice(id=2, serial_no="INV-0002")]
+        content = ServerRespModel[PaginatedResponseModel[InvoiceResponseModel]](
+            data=PaginatedResponseModel(items=invoices, pagination=PaginationModel(current_page=1, limit=10)),
+            message="Invoices retrieved!",
+        )
+
+        body = json.loads(JSONResponse(content=content).body)
+
+        # Same document the dict-based path produced.
+        assert body == json.loads(json.dumps(content.model_dump()))
+        item = body["data"]["items"][0]
+        assert item["uid"] == str(invoices[0].uid)
+        assert item["gross_amount"] == 1200.5
+        assert item["created_at"] == "2025-03-01T09:30:00+00:00"
+        assert item["service_uid"] is None
+
+    def test_fields_without_serializers_are_encoded_natively(self):
+        invoiced_at = datetime(2025, 3, 2, tzinfo=timezone.utc)
+        content = ServerRespModel[InvoiceResponseModel](data=make_invoice(invoiced_at=invoiced_at), message="ok")
+
+        body = json.loads(JSONResponse(content=content).body)
+
+        assert body["data"]["invoiced_at"] == "2025-03-02T00:00:00Z"
+
+    def test_plain_content_is_encoded_with_orjson(self):
+        response = JSONResponse(status_code=404, content={"error_code": "NotFound", "message": "Invoice not found"})
+
+        assert response.status_code == 404
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {"error_code": "NotFound", "message": "Invoice not found"}
@@ -0,0 +1,18 @@
+from sqlalchemy.dialects import postgresql
+from sqlmodel import select
+
+from src.db.models.patients import PATIENT_SEARCH_COLUMNS, Patient
+from src.utils.search import escape_like, search_filter
+
+
+class TestSearch:
+    def test_like_wildcards_are_escaped(self):
+        assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+    def test_every_word_must_match_some_column(self):
+        statement = select(Patient).where(search_filter("ada lovelace", *PATIENT_SEARCH_COLUMNS))
+        compiled = statement.compile(dialect=postgresql.dialect())
+
+        assert str(compiled).count(" AND ") == 1
+        assert str(compiled).count("ILIKE") == 2 * len(PATIENT_SEARCH_COLUMNS)
+        assert {"%ada%", "%lovelace%"} <= set(compiled.params.values())
@@ -0,0 +1,84 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from sqlmodel import select
+
+from src.config import Config
+from src.db.models.invoices import Invoice
+from src.misc.schemas import DataFormat
+from src.utils.streaming import encode_rows, iter_records, stream_export
+
+
+async def chunked(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        end = start + size
+        yield data[start:end]
+
+
+def collect(data: bytes, data_format: DataFormat, size: int = 7):
+    async def run():
+        return [record async for record in iter_records(chunked(data, size), data_format)]
+
+    return asyncio.run(run())
+
+
+class TestStreaming:
+    def test_csv_records_survive_chunk_boundaries_and_quoted_newlines(self):
+        data = 'invoice_serial_no,amount_received,note\r\nINV-1,10.50,"paid, in ""full""\nby cheque"\n\nINV-2,5,\n'
+
+        records = collect(data.encode(), DataFormat.CSV)
+
+        assert records == [
+            (2, {"invoice_serial_no": "INV-1", "amount_received": "10.50", "note": 'paid, in "full"\nby cheque'}),
+            (5, {"invoice_serial_no": "INV-2", "amount_received": "5", "note": ""}),
+        ]
+
+    def test_multibyte_characters_split_across_chunks_are_decoded(self):
+        data = "note\nCafé ₦ receipt\n".encode()
+
+        assert collect(data, DataFormat.CSV, size=1) == [(2, {"note": "Café ₦ receipt"})]
+
+    def test_malformed_ndjson_lines_are_passed_on_as_errors(self):
+        [(first_line, first), (bad_line, bad)] = collect(b'{"amount_received": 1}\n\n{oops\n', DataFormat.NDJSON)
+
+        assert (first_line, first) == (1, {"amount_received": 1})
+        assert bad_line == 3
+        assert isinstance(bad, ValueError)
+
+    def test_export_streams_header_then_one_chunk_per_partition(self):
+        uid = uuid4()
+        partitions = [[(uid, "INV-1", Decimal("10.10"), None)], [(uid, "INV-2", Decimal("0.30"), None)]]
+
+        async def iter_partitions():
+            for partition in partitions:
+                yield partition
+
+        result = MagicMock(partitions=MagicMock(return_value=iter_partitions()))
+        session = MagicMock(stream=AsyncMock(return_value=result))
+        session_maker = MagicMock(return_value=MagicMock(__aenter__=AsyncMock(return_value=session)))
+        columns = (Invoice.uid, Invoice.serial_no, Invoice.amount_paid, Invoice.invoiced_at)
+
+        async def run():
+            with patch("src.utils.streaming.ReadSessionMaker", session_maker):
+                return [chunk async for chunk in stream_export(select(Invoice), columns, DataFormat.CSV)]
+
+        chunks = asyncio.run(run())
+
+        assert chunks == [
+            b"uid,serial_no,amount_paid,invoiced_at\r\n",
+            f"{uid},INV-1,10.10,\r\n".encode(),
+            f"{uid},INV-2,0.30,\r\n".encode(),
+        ]
+        [statement] = session.stream.await_args.args
+        assert statement.get_execution_options()["yield_per"] == Config.EXPORT_BATCH_SIZE
+
+    def test_ndjson_export_keeps_amounts_exact(self):
+        row = (Decimal("0.10"), datetime(2025, 9, 1, tzinfo=timezone.utc), None)
+
+        line = encode_rows([row], ["amount", "created_at", "note"], DataFormat.NDJSON)
+
+        assert json.loads(line) == {"amount": "0.10", "created_at": "2025-09-01T00:00:00+00:00", "note": None}
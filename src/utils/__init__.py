@@ -1,20 +1,47 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import Request
+from sqlalchemy import ColumnElement, TextClause, func, literal_column, text
 from starlette_context import context
 
 
 def build_link_from_base_url(path: str) -> str:
-    request: Request = context.get("base_url")
-    return f"{request.base_url}{path}"
+    base_url: str = context.get("base_url", "")
+    return f"{base_url}{path}"
+
+
+def serial_no_prefix(name: str, fill: str = "X") -> str:
+    return name.upper().ljust(3, fill)[:3]
 
 
 def build_serial_no(name: str, id: int):
-    prefix = name.upper().ljust(3, "X")[:3]
     current_year = str(datetime.now(timezone.utc).year)
 
-    return f"{prefix}-{current_year}-{str(id).zfill(4)}"
+    return f"{serial_no_prefix(name)}-{current_year}-{str(id).zfill(4)}"
+
+
+def serial_number_sql(sequence_name: str) -> str:
+    """SQL for the next value of `sequence_name`, zero-padded like `str.zfill(4)` (never truncated)."""
+    return f"regexp_replace('000' || nextval('{sequence_name}')::text, '^0+(?=[0-9]{{4}})', '')"
+
+
+def build_serial_no_sql(name: str, sequence_name: str) -> TextClause:
+    """Server-side twin of `build_serial_no`, so the INSERT itself assigns the serial number."""
+    return text(
+        f"('{serial_no_prefix(name)}-' || to_char(now() AT TIME ZONE 'UTC', 'YYYY') || '-' || "
+        f"{serial_number_sql(sequence_name)})"
+    )
+
+
+def build_staff_no_sql(dept: str, sequence_name: str) -> ColumnElement[str]:
+    """Staff number for a new user in `dept`, numbered from `sequence_name` within the INSERT."""
+    return func.concat(
+        serial_no_prefix(dept, fill="D"),
+        "-",
+        literal_column("to_char(now() AT TIME ZONE 'UTC', 'YY')"),
+        "-",
+        literal_column(serial_number_sql(sequence_name)),
+    )
 
 
 def get_current_and_total_pages(limit: int, total: Optional[int] = None, offset: Optional[int] = None):
@@ -24,13 +51,13 @@ def get_current_and_total_pages(limit: int, total: Optional[int] = None, offset:
     if offset is None:
         offset = 0
 
-    if total is None:
-        total = 0
-
     if offset < 0:
         offset = 0
 
     current_page = (offset // limit) + 1
+    if total is None:
+        return current_page, None
+
     total_pages = max(1, (total + limit - 1) // limit) if total > 0 else 1
 
     return current_page, total_pages
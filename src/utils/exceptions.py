@@ -2,7 +2,8 @@ from typing import Callable, Optional
 
 from fastapi import FastAPI, status
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+
+from src.utils.responses import JSONResponse
 
 
 class AppException(Exception):
@@ -113,6 +114,14 @@ class BadRequest(Exception):
         super().__init__(self.message)
 
 
+class QueryBudgetExceeded(Exception):
+    """Raised in strict query budget mode when an endpoint runs more SQL statements than it declared."""
+
+    def __init__(self, message: Optional[str] = None):
+        self.message = message or "Query budget exceeded"
+        super().__init__(self.message)
+
+
 def create_exception_handler(
     status_code: int, default_message: str = "An error occurred"
 ) -> Callable[[Request, Exception], JSONResponse]:
@@ -142,6 +151,7 @@ def register_exceptions(app: FastAPI):
     app.add_exception_handler(InvalidLink, create_exception_handler(status.HTTP_410_GONE))
     app.add_exception_handler(InsufficientPermissions, create_exception_handler(status.HTTP_405_METHOD_NOT_ALLOWED))
     app.add_exception_handler(BadRequest, create_exception_handler(status.HTTP_409_CONFLICT))
+    app.add_exception_handler(QueryBudgetExceeded, create_exception_handler(status.HTTP_500_INTERNAL_SERVER_ERROR))
 
     @app.exception_handler(status.HTTP_500_INTERNAL_SERVER_ERROR)
     async def internal_server_error(request: Request, exc):
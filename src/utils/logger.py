@@ -1,52 +1,200 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+from starlette_context import context
+from starlette_context.header_keys import HeaderKeys
+
+from src.config import Config
 
 # Define log levels with emojis for better visibility
 LOG_LEVELS = {"DEBUG": "🔍", "INFO": "ℹ️", "WARNING": "⚠️", "ERROR": "❌", "CRITICAL": "🚨"}
 
+# Attributes every LogRecord has; anything else was passed through `extra=` and is emitted as a field.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "request_id", "correlation_id", "suppressed"}
+
 
 class CustomFormatter(logging.Formatter):
     """Custom formatter adding emojis and colors to logs"""
 
     def format(self, record):
-        # Add emoji to the log level
-        level_emoji = LOG_LEVELS.get(record.levelname, "")
-        record.levelname = f"{level_emoji} {record.levelname}"
-        return super().format(record)
+        # Decorate a copy, so the level name other handlers see is left alone.
+        record = copy.copy(record)
+        record.levelname = f"{LOG_LEVELS.get(record.levelname, '')} {record.levelname}"
+
+        message = super().format(record)
+        if getattr(record, "suppressed", 0):
+            message += f" ({record.suppressed} similar suppressed)"
+
+        return message
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, carrying the request ids and any `extra=` fields."""
+
+    def format(self, record):
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for field in ("request_id", "correlation_id", "suppressed"):
+            if getattr(record, field, None):
+                entry[field] = getattr(record, field)
+
+        entry.update({key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES})
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Hands records to the listener thread, tagged with the request ids of the code that logged them.
+
+    The ids are read here because the context they live in is not visible
+    from the listener thread. Messages and tracebacks are rendered to text
+    now, so records never carry live arguments across threads.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        if context.exists():
+            record.request_id = context.get(HeaderKeys.request_id)
+            record.correlation_id = context.get(HeaderKeys.correlation_id)
+
+        return record
+
+
+class WarningSampler(logging.Filter):
+    """Lets through at most `burst` warnings per call site every `interval` seconds.
+
+    The first warning after a quiet window reports how many were dropped.
+    Errors and above are never sampled.
+    """
+
+    def __init__(self, burst: int, interval: float):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self._windows: Dict[Tuple[str, str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+
+        with self._lock:
+            # [window start, emitted in window, suppressed since last emitted]
+            window = self._windows.setdefault(key, [now, 0, 0])
+            if now - window[0] >= self.interval:
+                window[0], window[1] = now, 0
+
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+
+            window[1] += 1
+            record.suppressed, window[2] = window[2], 0
+
+        return True
+
+
+_queue_handler: Optional[ContextQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def build_formatter() -> logging.Formatter:
+    if Config.LOG_FORMAT == "json":
+        return JSONFormatter()
+
+    return CustomFormatter(fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+
+
+def start_listener():
+    """(Re)start the thread that writes queued records to stdout, on a fresh queue."""
+    global _listener
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(build_formatter())
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_listener():
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def configure_logging():
+    """Route every logger through one queue so a slow stdout never blocks the code that logs.
+
+    Loggers keep no handlers of their own and propagate to the root, whose
+    only handler enqueues the record; a listener thread does the formatting
+    and writing.
+    """
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    _queue_handler = ContextQueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(WarningSampler(Config.LOG_WARNING_SAMPLE_BURST, Config.LOG_WARNING_SAMPLE_SECONDS))
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(Config.LOG_LEVEL)
+
+    start_listener()
+    atexit.register(stop_listener)
+    # The listener thread does not survive a fork, e.g. into a Celery prefork child.
+    os.register_at_fork(after_in_child=start_listener)
 
 
 def setup_logger(name: str, level: Optional[int] = None) -> logging.Logger:
     """
-    Creates a logger with consistent formatting and configuration
+    Returns a logger feeding the shared logging pipeline
 
     Args:
         name: The name of the logger (usually __name__)
-        level: Optional logging level (defaults to INFO)
+        level: Optional logging level (defaults to LOG_LEVEL)
 
     Returns:
         Configured logger instance
     """
-    # Create logger
-    logger = logging.getLogger(name)
-
-    # Avoid adding handlers if they already exist
-    if not logger.handlers:
-        # Create console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-
-        # Create formatter
-        formatter = CustomFormatter(
-            fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-        )
+    configure_logging()
 
-        # Add formatter to handler
-        console_handler.setFormatter(formatter)
-
-        # Add handler to logger
-        logger.addHandler(console_handler)
-
-    # Set level (default to INFO if not specified)
-    logger.setLevel(level or logging.INFO)
+    logger = logging.getLogger(name)
+    if level is not None:
+        logger.setLevel(level)
 
     return logger
@@ -1,13 +1,24 @@
+import asyncio
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+import aiosmtplib
 from fastapi import UploadFile
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+from fastapi_mail import ConnectionConfig, MessageSchema, MessageType
+from jinja2 import Template
 from pydantic import EmailStr
 
 from src.config import Config
 from src.features.auth.authentication import Authentication
-from src.misc.schemas import EmailTypes
+from src.misc.schemas import EmailType, EmailTypes
+from src.utils.logger import setup_logger
+from src.utils.rate_limit import TokenBucket
+
+logger = setup_logger(__name__)
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 
@@ -25,7 +36,10 @@ mail_config = ConnectionConfig(
     TEMPLATE_FOLDER=Path(ROOT_DIR, "templates"),
 )
 
-mail = FastMail(config=mail_config)
+template_env = mail_config.template_engine()
+
+# Placeholder error for messages a bulk send never got to.
+NOT_SENT = object()
 
 
 def create_message(
@@ -47,52 +61,192 @@ def create_message(
     return message
 
 
+@lru_cache(maxsize=None)
+def load_template(name: str) -> Template:
+    """Compiled template, parsed once per process rather than on every send."""
+    return template_env.get_template(name)
+
+
+def render_email(email_type: EmailType, recipient: str, context: dict) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = formataddr((mail_config.MAIL_FROM_NAME or "", mail_config.MAIL_FROM))
+    message["To"] = recipient
+    message["Subject"] = email_type.subject
+    message.set_content(load_template(email_type.template).render(**context), subtype="html")
+
+    return message
+
+
+class SMTPPool:
+    """Logged-in SMTP connections kept open and reused across messages.
+
+    A connection that sat idle longer than `max_idle` seconds is dropped
+    rather than trusted, since servers close idle sessions on their side;
+    one that turns out to be disconnected mid-send is reopened once.
+    """
+
+    def __init__(self, config: ConnectionConfig, size: int, max_idle: float):
+        self.config = config
+        self.size = size
+        self.max_idle = max_idle
+        self._idle: List[Tuple[float, aiosmtplib.SMTP]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.config.MAIL_SERVER,
+            port=self.config.MAIL_PORT,
+            timeout=self.config.TIMEOUT,
+            use_tls=self.config.MAIL_SSL_TLS,
+            start_tls=self.config.MAIL_STARTTLS,
+            validate_certs=self.config.VALIDATE_CERTS,
+            local_hostname=self.config.LOCAL_HOSTNAME,
+        )
+        await smtp.connect()
+
+        if self.config.USE_CREDENTIALS:
+            await smtp.login(self.config.MAIL_USERNAME, self.config.MAIL_PASSWORD.get_secret_value())
+
+        return smtp
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            released_at, smtp = self._idle.pop()
+            if smtp.is_connected and time.monotonic() - released_at < self.max_idle:
+                return smtp
+            await self._quit(smtp)
+
+        return await self._connect()
+
+    def _checkin(self, smtp: aiosmtplib.SMTP):
+        if smtp.is_connected:
+            self._idle.append((time.monotonic(), smtp))
+
+    async def _quit(self, smtp: aiosmtplib.SMTP):
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+
+    async def _send_on(self, smtp: aiosmtplib.SMTP, message: EmailMessage) -> aiosmtplib.SMTP:
+        try:
+            await smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            smtp = await self._connect()
+            await smtp.send_message(message)
+
+        return smtp
+
+    async def _drain(
+        self,
+        pending: Iterator[Tuple[int, EmailMessage]],
+        errors: List[Any],
+        rate_limiter: Optional[TokenBucket],
+    ):
+        """Send messages taken from the shared `pending` iterator over one connection until it runs dry."""
+        async with self._slots:
+            smtp = await self._checkout()
+            try:
+                for index, message in pending:
+                    if rate_limiter is not None:
+                        await rate_limiter.acquire()
+
+                    try:
+                        smtp = await self._send_on(smtp, message)
+                        errors[index] = None
+                    except Exception as e:
+                        logger.error(f"Failed to send '{message['Subject']}' to {message['To']}: {e}")
+                        errors[index] = e
+            finally:
+                self._checkin(smtp)
+
+    async def send_many(
+        self, messages: List[EmailMessage], concurrency: int = 1, rate_limiter: Optional[TokenBucket] = None
+    ) -> List[Optional[Exception]]:
+        """Send `messages` over up to `concurrency` pooled connections, returning each one's error."""
+        if self.config.SUPPRESS_SEND:
+            return [None] * len(messages)
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+
+        errors: List[Any] = [NOT_SENT] * len(messages)
+        pending = iter(enumerate(messages))
+        workers = min(concurrency, self.size, len(messages))
+
+        results = await asyncio.gather(
+            *(self._drain(pending, errors, rate_limiter) for _ in range(workers)), return_exceptions=True
+        )
+
+        # Messages left over because no connection could be opened carry that failure.
+        failure = next((result for result in results if isinstance(result, Exception)), None)
+        return [failure if error is NOT_SENT else error for error in errors]
+
+    async def send(self, message: EmailMessage):
+        [error] = await self.send_many([message])
+        if error is not None:
+            raise error
+
+    async def close(self):
+        while self._idle:
+            _, smtp = self._idle.pop()
+            await self._quit(smtp)
+
+        self._slots = None
+
+
+smtp_pool = SMTPPool(mail_config, size=Config.MAIL_POOL_SIZE, max_idle=Config.MAIL_CONNECTION_MAX_IDLE_SECONDS)
+
+
 class Mailer:
-    mail = FastMail(config=mail_config)
+    pool = smtp_pool
 
     @staticmethod
-    def _create_message(
-        recipients: List[EmailStr],
-        attachments: List[Union[UploadFile, Dict, str]] = [],
-        subject: str = "",
-        body: Optional[Union[List, str]] = None,
-        template_body: Optional[Union[List, str]] = None,
-    ) -> MessageSchema:
-        message = MessageSchema(
-            recipients=recipients,
-            attachments=attachments,
-            subject=subject,
-            body=body,
-            template_body=template_body,
-            subtype=MessageType.html,
-        )
+    def build_email_verification(email: str, context: Dict[str, Any]) -> EmailMessage:
+        email_token = Authentication.create_url_safe_token({"email": email})
+        verification_url = f"{context['base_url']}api/v1/auth/verify/{email_token}"
 
-        return message
+        return render_email(EmailTypes.EMAIL_VERIFICATION, email, {**context, "verification_url": verification_url})
 
     @staticmethod
-    async def send_email_verification(email: str, first_name: str, base_url: str):
-        token_payload = {"email": email}
-        email_token = Authentication.create_url_safe_token(token_payload)
-        verification_url = f"{base_url}api/v1/auth/verify/{email_token}"
-
-        message = Mailer._create_message(
-            recipients=[email],
-            subject=EmailTypes.EMAIL_VERIFICATION.subject,
-            template_body={"first_name": first_name, "verification_url": verification_url},
+    def build_password_reset(email: str, context: Dict[str, Any]) -> EmailMessage:
+        email_token = Authentication.create_url_safe_token({"email": email})
+        reset_url = f"{context['base_url']}api/v1/auth/pwd-reset/{email_token}"
+
+        return render_email(EmailTypes.PWD_RESET, email, {**context, "reset_url": reset_url})
+
+    @staticmethod
+    async def send_bulk(template: str, recipients: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build `template` for every `{"email": ..., "context": {...}}` recipient and send them all.
+
+        Messages go out over `MAIL_BULK_CONCURRENCY` pooled sessions at no more
+        than `MAIL_SEND_RATE_PER_SECOND`; a failure for one recipient never
+        stops the rest, and each recipient's outcome is reported.
+        """
+        build = EMAIL_BUILDERS[template]
+        messages = [build(recipient["email"], recipient["context"]) for recipient in recipients]
+        rate_limiter = TokenBucket(rate=Config.MAIL_SEND_RATE_PER_SECOND)
+
+        errors = await Mailer.pool.send_many(
+            messages, concurrency=Config.MAIL_BULK_CONCURRENCY, rate_limiter=rate_limiter
         )
 
-        await Mailer.mail.send_message(message=message, template_name=EmailTypes.EMAIL_VERIFICATION.template)
+        return [
+            {"email": recipient["email"], "sent": error is None, "error": str(error) if error else None}
+            for recipient, error in zip(recipients, errors)
+        ]
+
+    @staticmethod
+    async def send_email_verification(email: str, first_name: str, base_url: str):
+        await Mailer.pool.send(Mailer.build_email_verification(email, {"first_name": first_name, "base_url": base_url}))
 
     @staticmethod
     async def send_password_reset(email: str, first_name: str, base_url: str):
-        token_payload = {"email": email}
-        email_token = Authentication.create_url_safe_token(token_payload)
-        reset_url = f"{base_url}api/v1/auth/pwd-reset/{email_token}"
-
-        message = Mailer._create_message(
-            recipients=[email],
-            subject=EmailTypes.PWD_RESET.subject,
-            template_body={"first_name": first_name, "reset_url": reset_url},
-        )
+        await Mailer.pool.send(Mailer.build_password_reset(email, {"first_name": first_name, "base_url": base_url}))
+
 
-        await Mailer.mail.send_message(message=message, template_name=EmailTypes.PWD_RESET.template)
+# template -> builder taking (email, context); the context needs at least `first_name` and `base_url`
+EMAIL_BUILDERS = {
+    EmailTypes.EMAIL_VERIFICATION.template: Mailer.build_email_verification,
+    EmailTypes.PWD_RESET.template: Mailer.build_password_reset,
+}
@@ -0,0 +1,128 @@
+import os
+import time
+from typing import List, Optional
+
+import redis.asyncio as aioredis
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.registry import Collector
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.config import Config
+from src.tasks import celery_app
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+API_PREFIX = "/api/v1"
+UNMATCHED_ROUTE = "unmatched"
+
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests handled.", ["method", "router", "route", "status"])
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time spent handling HTTP requests.", ["method", "router", "route"]
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Time spent executing individual SQL statements.", ["engine"], buckets=FAST_BUCKETS
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements executed per HTTP request.", ["router"], buckets=QUERY_COUNT_BUCKETS
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Total SQL execution time per HTTP request.", ["router"], buckets=FAST_BUCKETS
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds", "Round trip time of Redis commands.", ["command"], buckets=FAST_BUCKETS
+)
+REDIS_COMMAND_ERRORS = Counter("redis_command_errors_total", "Redis commands that raised.", ["command"])
+
+CELERY_TASK_DURATION = Histogram("celery_task_duration_seconds", "Time spent running Celery tasks.", ["task", "state"])
+CELERY_QUEUE_DEPTH = Gauge(
+    "celery_queue_depth", "Messages waiting in a Celery broker queue.", ["queue"], multiprocess_mode="mostrecent"
+)
+
+_collectors: List[Collector] = []
+_broker: Optional[aioredis.Redis] = None
+
+
+def multiprocess_enabled() -> bool:
+    return "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+
+def register_collector(collector: Collector):
+    """Register a collector that reads live, process-local state (e.g. pool occupancy) at scrape time."""
+    _collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """The registry to expose; aggregates every worker process's metrics when multiprocess mode is on."""
+    if not multiprocess_enabled():
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _collectors:
+        registry.register(collector)
+
+    return registry
+
+
+def router_label(route_path: Optional[str]) -> str:
+    """First path segment under the API prefix, e.g. `/budgets` for `/api/v1/budgets/{budget_uid}`."""
+    if route_path is None:
+        return UNMATCHED_ROUTE
+
+    path = route_path.removeprefix(API_PREFIX)
+    return "/" + path.strip("/").split("/", 1)[0]
+
+
+def observe_redis_command(command: str, started_at: float, failed: bool = False):
+    REDIS_COMMAND_DURATION.labels(command).observe(time.perf_counter() - started_at)
+    if failed:
+        REDIS_COMMAND_ERRORS.labels(command).inc()
+
+
+async def refresh_queue_depths(queues: List[str]):
+    """Sample the broker queue lengths; kept out of collection so scrapes never block on Redis."""
+    global _broker
+    if _broker is None:
+        _broker = aioredis.from_url(celery_app.conf.broker_url, socket_timeout=1, socket_connect_timeout=1)
+
+    try:
+        async with _broker.pipeline(transaction=False) as pipe:
+            for queue in queues:
+                pipe.llen(queue)
+            depths = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not read Celery queue depths: {e}")
+        return
+
+    for queue, depth in zip(queues, depths):
+        CELERY_QUEUE_DEPTH.labels(queue).set(depth)
+
+
+async def close_broker():
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    await refresh_queue_depths(Config.CELERY_METRICS_QUEUES)
+
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,123 @@
+import time
+from typing import Optional
+from uuid import UUID, uuid4
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette_context import context, plugins
-from starlette_context.middleware import RawContextMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from starlette_context import request_cycle_context
+from starlette_context.header_keys import HeaderKeys
+
+from src.config import Config
+from src.db.instrumentation import QueryStats, report_queries, request_query_stats
+from src.utils.metrics import (
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    UNMATCHED_ROUTE,
+    router_label,
+)
+
+
+def request_uuid(value: Optional[str]) -> str:
+    """The caller's id when it is a valid UUID, a fresh one otherwise."""
+    if value:
+        try:
+            return UUID(value).hex
+        except ValueError:
+            pass
+
+    return uuid4().hex
+
+
+class RequestContextMiddleware:
+    """Opens the starlette-context store for each request, in the request's own task.
+
+    It holds the base URL used to build links in emails, the request and
+    correlation ids (echoed back as response headers) and the user agent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_id = request_uuid(headers.get(HeaderKeys.request_id))
+        correlation_id = request_uuid(headers.get(HeaderKeys.correlation_id))
+
+        async def send_with_ids(message: Message):
+            if message["type"] == "http.response.start":
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append(HeaderKeys.request_id, request_id)
+                response_headers.append(HeaderKeys.correlation_id, correlation_id)
+            await send(message)
+
+        initial_data = {
+            "base_url": str(HTTPConnection(scope).base_url),
+            HeaderKeys.request_id: request_id,
+            HeaderKeys.correlation_id: correlation_id,
+            HeaderKeys.user_agent: headers.get(HeaderKeys.user_agent),
+        }
 
+        with request_cycle_context(initial_data):
+            await self.app(scope, receive, send_with_ids)
 
-async def custom_context_middleware(request, call_next):
-    context["base_url"] = str(request.base_url)
-    return await call_next(request)
+
+class MetricsMiddleware:
+    """Records latency, status and SQL usage for each HTTP request, labeled by the route it matched.
+
+    In SQL instrumentation mode the statement count and time also go out as
+    response headers, and the request's statements are logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        stats = QueryStats(keep_statements=Config.SQL_INSTRUMENTATION)
+        token = request_query_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if Config.SQL_INSTRUMENTATION:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Query-Count", str(stats.count))
+                    headers.append("X-DB-Query-Time-Ms", f"{stats.duration * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_query_stats.reset(token)
+
+            # The router stores the matched route in the scope; its path template keeps label cardinality bounded.
+            route = getattr(scope.get("route"), "path", None)
+            router = router_label(route)
+            route = route or UNMATCHED_ROUTE
+
+            HTTP_REQUEST_DURATION.labels(scope["method"], router, route).observe(time.perf_counter() - started_at)
+            HTTP_REQUESTS.labels(scope["method"], router, route, str(status_code)).inc()
+            DB_QUERIES_PER_REQUEST.labels(router).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(router).observe(stats.duration)
+
+            if Config.SQL_INSTRUMENTATION or stats.over_budget:
+                report_queries(stats, scope["method"], route)
 
 
 def register_middlewares(app: FastAPI):
@@ -21,13 +130,7 @@ def register_middlewares(app: FastAPI):
         expose_headers=["Set-Cookie"],
     )
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=["localhost", "127.0.0.1"])
-    app.add_middleware(BaseHTTPMiddleware, dispatch=custom_context_middleware)
+    app.add_middleware(RequestContextMiddleware)
 
-    app.add_middleware(
-        RawContextMiddleware,
-        plugins=(
-            plugins.RequestIdPlugin(),
-            plugins.CorrelationIdPlugin(),
-            plugins.UserAgentPlugin(),
-        ),
-    )
+    # Added last so it is outermost and times the whole middleware stack.
+    app.add_middleware(MetricsMiddleware)
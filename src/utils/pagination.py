@@ -0,0 +1,132 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, func, select, text, tuple_
+from sqlalchemy.exc import CompileError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config
+from src.features.config import SelectOfScalar
+from src.misc.schemas import CountMode
+from src.utils.cache import TTLCache
+from src.utils.exceptions import BadRequest
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+exact_counts: TTLCache[int] = TTLCache(maxsize=Config.COUNT_CACHE_SIZE, ttl=Config.COUNT_CACHE_TTL_SECONDS)
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Build an opaque cursor pointing just past the given row."""
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(id)
+    except (binascii.Error, ValueError, TypeError):
+        raise BadRequest("Invalid pagination cursor")
+
+
+def order_query(query: SelectOfScalar, model: Any, rank: Optional[ColumnElement[float]] = None) -> SelectOfScalar:
+    """Order newest first, or by search relevance first when a `rank` is given."""
+    if rank is not None:
+        query = query.order_by(rank.desc())
+
+    return query.order_by(model.created_at.desc(), model.id.desc())
+
+
+def paginate_query(
+    query: SelectOfScalar,
+    model: Any,
+    limit: int,
+    offset: Optional[int] = None,
+    cursor: Optional[str] = None,
+    rank: Optional[ColumnElement[float]] = None,
+) -> SelectOfScalar:
+    """Order newest first and page by keyset when a cursor is given, by offset otherwise.
+
+    The keyset predicate on (created_at, id) lets Postgres walk the composite
+    index instead of counting past `offset` rows on deep pages. A search `rank`
+    takes precedence over recency and only supports offset paging.
+    """
+    if rank is not None and cursor:
+        raise BadRequest("Cursor pagination is not available when sorting by relevance")
+
+    query = order_query(query, model, rank)
+
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        return query.where(tuple_(model.created_at, model.id) < tuple_(created_at, id)).limit(limit)
+
+    return query.offset(offset).limit(limit)
+
+
+def next_cursor(rows: Sequence[Any], limit: int, rank: Optional[ColumnElement[float]] = None) -> Optional[str]:
+    if rank is not None or not rows or len(rows) < limit:
+        return None
+
+    last_row = rows[-1]
+    return encode_cursor(last_row.created_at, last_row.id)
+
+
+def _count_cache_key(statement, dialect) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    compiled = statement.compile(dialect=dialect)
+    return str(compiled), tuple(sorted((name, repr(value)) for name, value in compiled.params.items()))
+
+
+async def _estimate_rows(query, model: Any, session: AsyncSession) -> int:
+    """Ask the planner for its row estimate, falling back to the table's reltuples."""
+    try:
+        sql = query.compile(dialect=session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    except (CompileError, NotImplementedError) as e:
+        logger.warning(f"Falling back to reltuples for {model.__tablename__}: {e}")
+    else:
+        # Run as raw driver SQL so literals such as ':' in search terms are not read as bind params.
+        connection = await session.connection()
+        plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    reltuples = await session.scalar(
+        text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table_name AS regclass)"),
+        params={"table_name": model.__tablename__},
+    )
+    # reltuples is -1 for tables that have never been analyzed.
+    return max(0, int(reltuples or 0))
+
+
+async def count_rows(
+    query: SelectOfScalar, model: Any, session: AsyncSession, count_mode: CountMode = CountMode.EXACT
+) -> Optional[int]:
+    """Total the rows matched by a list query according to the requested count mode.
+
+    Only the primary key is selected, which keeps correlated column properties
+    and loader options out of the count. Exact counts are cached briefly per
+    distinct filter set, so paging through the same listing counts once.
+    """
+    if count_mode == CountMode.NONE:
+        return None
+
+    query = query.with_only_columns(model.id, maintain_column_froms=True).order_by(None)
+
+    if count_mode == CountMode.ESTIMATED:
+        return await _estimate_rows(query, model, session)
+
+    count_query = select(func.count()).select_from(query.subquery())
+    cache_key = _count_cache_key(count_query, session.get_bind().dialect)
+
+    total = exact_counts.get(cache_key)
+    if total is None:
+        total = await session.scalar(count_query)
+        exact_counts.set(cache_key, total)
+
+    return total
@@ -0,0 +1,26 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def dump_json(content: Any) -> bytes:
+    """Encode a response body in one pass, straight to bytes.
+
+    Pydantic models are serialized by their compiled serializer, which applies
+    their field_serializers and handles UUID, Decimal and datetime fields
+    itself, so they never round-trip through a dict. Anything else goes
+    through orjson.
+    """
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JSONResponse(ORJSONResponse):
+    """The app's default response class; controllers pass the validated response model as `content`."""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
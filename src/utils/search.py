@@ -0,0 +1,46 @@
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import ColumnElement, Index, and_, func, or_
+
+from src.features.config import SelectOfScalar
+from src.misc.schemas import SearchSort
+
+LIKE_ESCAPE = "\\"
+
+
+def trigram_indexes(table: str, *columns: str) -> Tuple[Index, ...]:
+    """pg_trgm GIN indexes that let `ILIKE '%term%'` on these columns use an index scan."""
+    return tuple(
+        Index(f"ix_{table}_{column}_trgm", column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+        for column in columns
+    )
+
+
+def escape_like(term: str) -> str:
+    return term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", f"{LIKE_ESCAPE}%").replace("_", f"{LIKE_ESCAPE}_")
+
+
+def search_filter(q: str, *columns: Any) -> ColumnElement[bool]:
+    """Every word of `q` must appear, case-insensitively, in at least one of `columns`."""
+    words = q.split() or [q]
+
+    return and_(
+        *(or_(*(column.ilike(f"%{escape_like(word)}%", escape=LIKE_ESCAPE) for column in columns)) for word in words)
+    )
+
+
+def search_rank(q: str, *columns: Any) -> ColumnElement[float]:
+    return func.greatest(*(func.similarity(func.coalesce(column, ""), q) for column in columns))
+
+
+def apply_search(
+    query: SelectOfScalar, q: Optional[str], columns: Tuple[Any, ...], sort: SearchSort = SearchSort.RECENT
+) -> Tuple[SelectOfScalar, Optional[ColumnElement[float]]]:
+    """Filter `query` by `q`, also returning the relevance rank to order by when one was asked for."""
+    if not q:
+        return query, None
+
+    query = query.where(search_filter(q, *columns))
+    rank = search_rank(q, *columns) if sort == SearchSort.RELEVANCE else None
+
+    return query, rank
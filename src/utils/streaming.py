@@ -0,0 +1,145 @@
+import codecs
+import csv
+import io
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Sequence, Tuple
+from uuid import UUID
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import QueryableAttribute
+
+from src.config import Config
+from src.db.main import ReadSessionMaker
+from src.features.config import SelectOfScalar
+from src.misc.schemas import DataFormat
+from src.utils.exceptions import BadRequest
+
+# (line number the record starts on, parsed record or the error parsing it)
+Record = Tuple[int, Any]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[str]:
+    """Decode a byte stream into lines as it arrives, keeping only the unfinished line in memory."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """Parse a CSV byte stream with a header row into one dict per record.
+
+    Lines are buffered only while a quoted field is still open, so records
+    with embedded newlines are parsed whole without reading the entire file.
+    """
+    header: List[str] = []
+    record, line_no, start = "", 0, 1
+
+    async for line in iter_lines(chunks):
+        line_no += 1
+        record += line
+        # Quotes inside a field are doubled, so an odd count means the field continues on the next line.
+        if record.count('"') % 2:
+            continue
+
+        row = next(csv.reader(io.StringIO(record)), [])
+        record, record_start, start = "", start, line_no + 1
+        if not any(field.strip() for field in row):
+            continue
+
+        if not header:
+            header = [name.strip() for name in row]
+            continue
+
+        values: Dict[str, Any] = dict(zip(header, row))
+        yield record_start, values
+
+    if record:
+        raise BadRequest(f"Unterminated quoted field starting on line {start}")
+
+
+async def iter_ndjson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    line_no = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+
+        try:
+            yield line_no, json.loads(line)
+        except json.JSONDecodeError as e:
+            # Handed on so a malformed line is reported for that line rather than aborting the stream.
+            yield line_no, e
+
+
+def iter_records(chunks: AsyncIterator[bytes], data_format: DataFormat) -> AsyncIterator[Record]:
+    if data_format == DataFormat.CSV:
+        return iter_csv_records(chunks)
+
+    return iter_ndjson_records(chunks)
+
+
+EXPORT_MEDIA_TYPES = {DataFormat.CSV: "text/csv", DataFormat.NDJSON: "application/x-ndjson"}
+
+
+def export_value(value: Any) -> Any:
+    """JSON-safe form of a column value; decimals stay strings so amounts export exactly."""
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    return value
+
+
+def encode_rows(rows: Sequence[Sequence[Any]], fields: List[str], data_format: DataFormat) -> bytes:
+    if data_format == DataFormat.NDJSON:
+        return "".join(
+            json.dumps(dict(zip(fields, map(export_value, row))), separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([["" if value is None else export_value(value) for value in row] for row in rows])
+    return buffer.getvalue().encode()
+
+
+async def stream_export(
+    query: SelectOfScalar, columns: Sequence[QueryableAttribute], data_format: DataFormat
+) -> AsyncIterator[bytes]:
+    """Encode the rows of `query` restricted to `columns`, a server-side cursor batch at a time.
+
+    Runs on its own read session since the request's session is released
+    before a streaming body is sent.
+    """
+    fields = [column.key for column in columns]
+    query = query.with_only_columns(*columns, maintain_column_froms=True)
+
+    if data_format == DataFormat.CSV:
+        yield encode_rows([fields], fields, data_format)
+
+    async with ReadSessionMaker() as session:
+        result = await session.stream(query.execution_options(yield_per=Config.EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield encode_rows(rows, fields, data_format)
+
+
+def export_response(
+    query: SelectOfScalar, columns: Sequence[QueryableAttribute], data_format: DataFormat, name: str
+) -> StreamingResponse:
+    filename = f"{name}-{datetime.now(timezone.utc):%Y%m%d%H%M%S}.{data_format.value}"
+
+    return StreamingResponse(
+        stream_export(query, columns, data_format),
+        media_type=EXPORT_MEDIA_TYPES[data_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )